@@ -0,0 +1,106 @@
+"""
+Circuit breaker for calls to Supabase.
+
+While Supabase is down or badly degraded, letting every request wait for its
+own timeout only piles up handlers and threads. The breaker counts
+consecutive failed calls, where a call that takes longer than
+``slow_call_seconds`` counts as failed too. After ``failure_threshold`` of
+them it opens, and calls are rejected with ``CircuitOpenError`` straight
+away.
+
+After ``reset_timeout`` seconds it lets a single trial call through (half
+open). A successful trial closes it again; a failed one reopens it for another
+``reset_timeout``.
+
+``is_failure`` decides which exceptions say something about Supabase's
+health. A unique violation or a bad filter is the caller's problem and
+doesn't count.
+
+The breaker is used from the event loop thread only and does no locking.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Supabase while the breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Supabase circuit breaker is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, slow_call_seconds: float = 2.0,
+                 reset_timeout: float = 10.0, is_failure: Callable[[BaseException], bool] = lambda exc: True):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self.last_failure: Optional[str] = None
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` unless a call may go ahead now."""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN:
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.reset_timeout - waited)
+            self.state = HALF_OPEN
+        if self._trial_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(self.reset_timeout)
+        self._trial_in_flight = True
+
+    def record(self, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Report the outcome of a call admitted by ``before_call``."""
+        if error is not None and self.is_failure(error):
+            reason = f"{type(error).__name__}: {error}"
+        elif seconds >= self.slow_call_seconds:
+            reason = f"slow call ({seconds:.2f}s)"
+        else:
+            reason = None
+
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            if reason is None:
+                self.state = CLOSED
+                self.consecutive_failures = 0
+            else:
+                self._open(reason)
+            return
+        if reason is None:
+            self.consecutive_failures = 0
+            return
+        self.consecutive_failures += 1
+        self.last_failure = reason
+        if self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open(reason)
+
+    def _open(self, reason: str) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self.last_failure = reason
+        self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "last_failure": self.last_failure,
+        }
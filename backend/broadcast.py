@@ -0,0 +1,84 @@
+"""
+In-process fan-out of announcement change events to streaming clients.
+
+Each subscriber owns a small bounded ``asyncio.Queue``. ``publish`` encodes the
+event once and does a non-blocking put per subscriber; a subscriber whose queue
+is full is disconnected instead of buffering without limit. Idle subscribers
+cost one queue and one suspended coroutine, so a worker can hold thousands.
+
+All methods must be called from the event loop thread.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+
+class BroadcasterFull(Exception):
+    """Raised by ``subscribe`` when ``max_subscribers`` is reached."""
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class Broadcaster:
+    def __init__(self, queue_size: int = 64, max_subscribers: int = 10000):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.dropped = 0
+        self._sequence = 0
+        self._subscribers: Set[Subscriber] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        if len(self._subscribers) >= self.max_subscribers:
+            raise BroadcasterFull("Too many subscribers")
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Send one Server-Sent Events frame to every subscriber."""
+        self._sequence += 1
+        self.published += 1
+        payload = json.dumps(data, separators=(',', ':'), default=str)
+        frame = f"id: {self._sequence}\nevent: {event_type}\ndata: {payload}\n\n".encode('utf-8')
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        subscriber.dropped = True
+        self.dropped += 1
+        self._end(subscriber)
+
+    def _end(self, subscriber: Subscriber) -> None:
+        # Discard the backlog so the end-of-stream marker fits
+        self._subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        for subscriber in list(self._subscribers):
+            self._end(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
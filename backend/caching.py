@@ -0,0 +1,244 @@
+"""
+Small in-process caches shared by the request handlers.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    A cache constructed with ``enabled=False`` (or ``ttl <= 0``) never stores
+    anything, which makes every lookup a miss without changing call sites.
+
+    ``pop`` bumps a generation for the key. Callers that load a value and
+    then ``set`` it pass the ``generation(key)`` read before loading, so a
+    load that raced an eviction is dropped. With ``shared`` counters
+    (``coherency.SharedCounters``) the generations are per key slot and
+    visible to every worker: an entry stored under an older generation is
+    treated as a miss on read.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0, enabled: bool = True,
+                 shared: Optional[Any] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled and ttl > 0 and maxsize > 0
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pops = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, key: Hashable) -> int:
+        if self.shared is not None:
+            return self.shared.value(self.shared.slot(key))
+        return self._pops
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, generation = entry
+            if expires_at <= time.monotonic() or (
+                    self.shared is not None and generation != self.generation(key)):
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            current = self.generation(key)
+            if generation is not None and generation != current:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value, current)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._pops += 1
+            if self.shared is not None:
+                self.shared.bump(self.shared.slot(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class FeedCache:
+    """Serialized responses for a shared, read-mostly resource.
+
+    Entries are tagged with the generation they were computed in; ``invalidate``
+    bumps the generation and drops everything. ``put`` ignores bodies computed
+    against an older generation, so a read racing a write can't repopulate the
+    cache with pre-write data.
+
+    With a ``shared`` counter every worker's ``invalidate`` is seen by every
+    other worker on its next access, which then drops its entries too.
+
+    Separately, the newest body stored for each key is kept as a last
+    known-good copy that invalidation doesn't drop. ``last_good`` returns it
+    for serving stale when the upstream can't be reached.
+    """
+
+    def __init__(self, maxsize: int = 256, enabled: bool = True, shared: Optional[Any] = None):
+        self.maxsize = maxsize
+        self.enabled = enabled and maxsize > 0
+        self.shared = shared
+        self._generation = 0
+        self._shared_seen = shared.value() if shared is not None else 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.not_modified = 0
+        self.stale_served = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # key -> (body, etag, generation, stored at)
+        self._last_good: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sync(self) -> None:
+        # Called with the lock held: adopt invalidations made by other workers
+        if self.shared is None:
+            return
+        current = self.shared.value()
+        if current != self._shared_seen:
+            self._shared_seen = current
+            self._generation += 1
+            self._entries.clear()
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            self._sync()
+            return self._generation
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        """Return ``(body, etag)`` for ``key`` or ``None``."""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, generation: int) -> str:
+        """Store ``body`` computed during ``generation`` and return its ETag."""
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self.maxsize <= 0:
+            return etag
+        with self._lock:
+            self._sync()
+            previous = self._last_good.get(key)
+            # A slow read finishing late must not replace a newer copy
+            if previous is None or previous[2] <= generation:
+                self._last_good[key] = (body, etag, generation, time.monotonic())
+                self._last_good.move_to_end(key)
+                while len(self._last_good) > self.maxsize:
+                    self._last_good.popitem(last=False)
+            if not self.enabled or generation != self._generation:
+                return etag
+            self._entries[key] = (body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return etag
+
+    def last_good(self, key: Hashable) -> Optional[tuple]:
+        """Return ``(body, etag, age_seconds)`` of the newest body stored for ``key``."""
+        with self._lock:
+            entry = self._last_good.get(key)
+            if entry is None:
+                return None
+            self.stale_served += 1
+            body, etag, _, stored_at = entry
+            return body, etag, time.monotonic() - stored_at
+
+    def invalidate(self) -> None:
+        with self._lock:
+            if self.shared is not None:
+                self._shared_seen = self.shared.bump()
+            self._generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "stale_served": self.stale_served,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def etag_variant(etag: str, encoding: str) -> str:
+    """The ETag of ``etag``'s body sent with ``Content-Encoding: encoding``.
+
+    A strong validator names one exact representation, so the gzip and br
+    bodies each get their own: ``"<hash>"`` -> ``"<hash>-br"``.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _etag_base(etag: str) -> str:
+    # '"<hash>-br"' -> '"<hash>"'; the hash itself is hex and has no '-'
+    return etag.split('-', 1)[0] + '"' if '-' in etag else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``.
+
+    Any ``etag_variant`` of the same body matches: a client revalidating the
+    br copy has the current content whichever encoding it is sent next.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if _etag_base(candidate) == _etag_base(etag):
+            return True
+    return False
@@ -0,0 +1,111 @@
+"""
+Micro-batching of concurrent inserts.
+
+``WriteCoalescer.submit`` parks each row with a future. The pending rows are
+flushed as one bulk insert once ``max_batch`` of them have gathered or
+``max_delay`` seconds after the first one arrived, whichever comes first,
+and each caller gets back its own inserted row (matched on ``key``).
+
+A bulk insert is all-or-nothing, so one bad row would fail everyone in its
+batch. When a batch fails with an error that ``split_on(exc)`` says is about
+the data rather than the database, its rows are retried one at a time. Each
+caller then gets its own row or its own error. Errors such as timeouts or
+an open circuit breaker are handed to every caller in the batch unchanged.
+
+All methods must be called from the event loop thread.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Row = Dict[str, Any]
+
+
+class WriteCoalescer:
+    def __init__(self, insert_many: Callable[[List[Row]], Awaitable[List[Row]]],
+                 insert_one: Callable[[Row], Awaitable[Optional[Row]]],
+                 max_batch: int = 50, max_delay: float = 0.005, key: str = 'id',
+                 split_on: Callable[[BaseException], bool] = lambda exc: True):
+        self.insert_many = insert_many
+        self.insert_one = insert_one
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.key = key
+        self.split_on = split_on
+        self.batches = 0
+        self.rows = 0
+        self.split_batches = 0
+        self._pending: List[Tuple[Row, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: set = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, row: Row) -> Optional[Row]:
+        """Insert ``row`` as part of the next batch and return the stored row."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _flush(self, batch: List[Tuple[Row, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.rows += len(batch)
+        try:
+            created = await self.insert_many([row for row, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and self.split_on(e):
+                self.split_batches += 1
+                await asyncio.gather(*(self._insert_alone(row, future) for row, future in batch))
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        by_key = {row.get(self.key): row for row in created}
+        for row, future in batch:
+            if not future.done():
+                future.set_result(by_key.get(row[self.key]))
+
+    async def _insert_alone(self, row: Row, future: asyncio.Future) -> None:
+        try:
+            result = await self.insert_one(row)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def close(self) -> None:
+        """Flush whatever is pending and wait for batches in flight."""
+        self._start_flush()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000,
+            "batches": self.batches,
+            "rows": self.rows,
+            "split_batches": self.split_batches,
+            "pending": len(self._pending),
+            "average_batch": self.rows / self.batches if self.batches else 0.0,
+        }
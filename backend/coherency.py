@@ -0,0 +1,179 @@
+"""
+Keeping in-process state consistent across uvicorn workers on one host.
+
+Each worker has its own feed cache, user cache, search index and stream
+subscribers. When ``WORKER_SYNC_DIR`` is set, the workers share that
+directory and stay consistent through two mechanisms:
+
+``SharedCounters``
+    An mmap'd file of 64-bit generation counters. A write bumps the counter
+    before its response is sent, and every cache read compares the counter
+    it stored against the current value. Because the check is a memory read
+    on the read path, a read that starts after a write has returned can never
+    be served from a pre-write entry, on any worker.
+
+``WorkerBus``
+    A Unix datagram socket per worker in the same directory. Writers send
+    the change (e.g. the announcement row) to every other worker, whose
+    event loop applies it to its search index and fans it out to its stream
+    subscribers, typically well under a millisecond later. The bus is
+    best-effort; the caches never depend on it.
+
+Rate limit buckets live in a shared table too (``ratelimit.SharedTokenBucketLimiter``).
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import socket
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Unix datagrams must fit the socket send buffer; larger changes are sent by id
+MAX_DATAGRAM = 60 * 1024
+RECEIVE_BUFFER = 4 * 1024 * 1024
+
+_COUNTER = struct.Struct('<Q')
+
+
+def stable_hash(key: Any) -> int:
+    """64-bit hash that is identical in every process (``hash()`` is salted per process)."""
+    digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def map_file(path: Path, size: int) -> Tuple[int, mmap.mmap]:
+    """Open (creating and zero-filling if needed) a shared file of ``size`` bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    if os.fstat(fd).st_size < size:
+        os.ftruncate(fd, size)
+    return fd, mmap.mmap(fd, size)
+
+
+class FileLock:
+    """Exclusive lock across processes (flock) and across threads of this one."""
+
+    def __init__(self, fd: int):
+        self._fd = fd
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+class SharedCounters:
+    """``size`` monotonically increasing counters shared by every process mapping ``path``."""
+
+    def __init__(self, path: Path, size: int = 1):
+        self.path = path
+        self.size = size
+        self._fd, self._map = map_file(path, size * _COUNTER.size)
+        self._lock = FileLock(self._fd)
+
+    def slot(self, key: Any) -> int:
+        return stable_hash(key) % self.size
+
+    def value(self, index: int = 0) -> int:
+        # Aligned 8-byte reads don't tear; writers serialise on the file lock
+        return _COUNTER.unpack_from(self._map, index * _COUNTER.size)[0]
+
+    def bump(self, index: int = 0) -> int:
+        with self._lock:
+            value = self.value(index) + 1
+            _COUNTER.pack_into(self._map, index * _COUNTER.size, value)
+        return value
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class WorkerBus:
+    """Best-effort broadcast of small JSON messages to the other workers."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f'worker-{os.getpid()}.sock'
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if self.path.exists():
+            self.path.unlink()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+        self._sock.bind(str(self.path))
+        self._sock.setblocking(False)
+
+    def subscribe(self, kind: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._handlers[kind] = handler
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        loop.add_reader(self._sock.fileno(), self._drain)
+
+    def publish(self, kind: str, payload: Dict[str, Any]) -> bool:
+        """Send to every other live worker; ``False`` if the message is too large to send."""
+        data = json.dumps({"kind": kind, "payload": payload}, separators=(',', ':'), default=str).encode('utf-8')
+        if len(data) > MAX_DATAGRAM:
+            return False
+        for peer in self.directory.glob('worker-*.sock'):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(data, str(peer))
+                self.sent += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # A worker that exited without cleaning up
+                try:
+                    peer.unlink()
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                self.dropped += 1
+                logger.warning(f"Worker bus: {peer.name} is not keeping up, dropped a {kind} message")
+        return True
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                data = self._sock.recv(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            self.received += 1
+            try:
+                message = json.loads(data)
+                handler = self._handlers.get(message["kind"])
+                if handler is not None:
+                    handler(message["payload"])
+            except Exception as e:
+                logger.error(f"Worker bus message error: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self.sent, "received": self.received, "dropped": self.dropped}
+
+    def close(self) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,257 @@
+"""
+gzip / brotli response compression.
+
+``CompressionMiddleware`` compresses any response whose type is textual
+(JSON, NDJSON, CSV, text) and whose body is at least ``minimum_size`` bytes,
+using the best encoding the client accepts. brotli is preferred when the
+``brotli`` package is installed. Streaming responses are compressed chunk by
+chunk, with a flush after every chunk so exports keep streaming. Server-sent
+events and responses that already carry a ``Content-Encoding`` are passed
+through untouched.
+
+The feed handler does not go through the middleware's per-request path.
+Its body is identical for every client until the next write, so
+``VariantCache`` compresses each content version (keyed by ETag) once per
+encoding and reuses the result.
+
+Bodies above ``OFFLOAD_SIZE`` are compressed on a worker thread; zlib and
+brotli release the GIL, so a large export or ``?all=true`` feed doesn't
+stall the event loop.
+"""
+
+import asyncio
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Most preferred first, for clients that accept several with equal weight
+ENCODINGS: Tuple[str, ...] = ('br', 'gzip') if brotli is not None else ('gzip',)
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+UNCOMPRESSIBLE_TYPES = ('text/event-stream',)
+OFFLOAD_SIZE = 256 * 1024
+
+
+def negotiate(accept_encoding: Optional[str], encodings: Sequence[str] = ENCODINGS) -> Optional[str]:
+    """Pick an encoding from an ``Accept-Encoding`` header, or ``None`` for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+
+
+class Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, gzip_level: int = 6, brotli_quality: int = 4):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self.encoding == 'br':
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes = b'') -> bytes:
+        if self.encoding == 'br':
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    return Compressor(encoding, gzip_level, brotli_quality).finish(body)
+
+
+async def compress_async(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if len(body) < OFFLOAD_SIZE:
+        return compress(body, encoding, gzip_level, brotli_quality)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, compress, body, encoding, gzip_level, brotli_quality)
+
+
+class VariantCache:
+    """Compressed bodies keyed by ``(etag, encoding)``; an ETag names one content version."""
+
+    def __init__(self, maxsize: int = 512, gzip_level: int = 6, brotli_quality: int = 4):
+        self.maxsize = maxsize
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, etag: str, encoding: str, body: bytes) -> bytes:
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+        compressed = await compress_async(body, encoding, self.gzip_level, self.brotli_quality)
+        with self._lock:
+            self._entries[key] = compressed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compressed_responses": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+        }
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 stats: Optional[CompressionStats] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats or CompressionStats()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Dict[str, Any]] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = _Headers(start["headers"])
+                if (headers.get(b"content-encoding") is not None
+                        or not is_compressible(headers.get(b"content-type", b"").decode("latin-1"))
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers.set(b"content-encoding", encoding.encode("latin-1"))
+                headers.add_vary(b"Accept-Encoding")
+                self.stats.compressed += 1
+                if not more_body:
+                    compressed = await compress_async(body, encoding, self.gzip_level, self.brotli_quality)
+                    self._count(len(body), len(compressed))
+                    headers.set(b"content-length", str(len(compressed)).encode("latin-1"))
+                    start["headers"] = headers.raw
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                headers.remove(b"content-length")
+                start["headers"] = headers.raw
+                await send(start)
+                compressor = Compressor(encoding, self.gzip_level, self.brotli_quality)
+
+            out = compressor.compress(body, flush=True) if more_body else compressor.finish(body)
+            self._count(len(body), len(out))
+            await send({"type": "http.response.body", "body": out, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _count(self, raw: int, compressed: int) -> None:
+        self.stats.bytes_in += raw
+        self.stats.bytes_out += compressed
+
+
+class _Headers:
+    """Minimal editor for ASGI raw header lists (lower-case names)."""
+
+    def __init__(self, raw: List[Tuple[bytes, bytes]]):
+        self.raw = list(raw)
+
+    def get(self, name: bytes, default=None):
+        for key, value in self.raw:
+            if key.lower() == name:
+                return value
+        return default
+
+    def remove(self, name: bytes) -> None:
+        self.raw = [(key, value) for key, value in self.raw if key.lower() != name]
+
+    def set(self, name: bytes, value: bytes) -> None:
+        self.remove(name)
+        self.raw.append((name, value))
+
+    def add_vary(self, value: bytes) -> None:
+        vary = self.get(b"vary")
+        if vary is None:
+            self.set(b"vary", value)
+        elif value.lower() not in vary.lower():
+            self.set(b"vary", vary + b", " + value)
@@ -0,0 +1,61 @@
+"""
+Streaming encoders for the admin export endpoints.
+
+Each encoder consumes the page iterator from ``repository.iter_pages`` and
+yields one chunk per upstream page, so memory is bounded by the page size
+rather than the table size. Rows are written as they come back from
+PostgREST; nothing is re-validated through the response models.
+
+CSV cells that a spreadsheet would evaluate as a formula (those starting with
+``=``, ``+``, ``-``, ``@``, tab or carriage return) are prefixed with ``'``.
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+ANNOUNCEMENT_COLUMNS = ('id', 'title', 'content', 'author_id', 'author_email', 'created_at', 'updated_at')
+USER_COLUMNS = ('id', 'email', 'role', 'created_at')
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+async def ndjson_chunks(pages: AsyncIterator[List[Dict[str, Any]]],
+                        columns: Sequence[str]) -> AsyncIterator[bytes]:
+    async for rows in pages:
+        lines = [json.dumps({column: row.get(column) for column in columns},
+                            ensure_ascii=False, separators=(',', ':'), default=str)
+                 for row in rows]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def csv_chunks(pages: AsyncIterator[List[Dict[str, Any]]],
+                     columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    # The header goes out before the first upstream page is back
+    yield buffer.getvalue().encode('utf-8')
+    async for rows in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows({column: _csv_cell(row.get(column)) for column in columns} for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+
+
+ENCODERS = {
+    'ndjson': ndjson_chunks,
+    'csv': csv_chunks,
+}
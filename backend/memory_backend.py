@@ -0,0 +1,266 @@
+"""
+In-memory stand-in for the Supabase client.
+
+Implements the subset of the PostgREST query builder that the repositories use
+(``select``/``insert``/``update``/``delete`` with comparison, ``like`` and
+``in_`` filters, ``or_`` logic trees, ``order``, ``limit`` and ``count``) over
+plain lists of dicts. ``latency`` adds a blocking sleep to every ``execute()`` to mimic a
+network round trip when benchmarking. ``max_rows`` caps every select like
+PostgREST's ``db-max-rows`` setting (1000 on Supabase by default).
+
+Inserts enforce the schema's unique columns (``UNIQUE_COLUMNS``) and raise
+``InMemoryAPIError`` with Postgres' ``23505`` code, like postgrest's
+``APIError``, so duplicate handling can be exercised without a database.
+"""
+
+import copy
+import operator
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    'eq': operator.eq,
+    'neq': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+}
+
+
+def _compare(op: str, column: str, value: Any) -> Callable[[Dict[str, Any]], bool]:
+    fn = _OPS[op]
+
+    def predicate(row: Dict[str, Any]) -> bool:
+        current = row.get(column)
+        if current is None:
+            return False
+        return fn(current, value)
+    return predicate
+
+
+def _like(column: str, pattern: str) -> Callable[[Dict[str, Any]], bool]:
+    # % and PostgREST's * match any run, _ one character, backslash escapes
+    parts, escaped = [], False
+    for ch in pattern:
+        if escaped or ch not in '\\%*_':
+            parts.append(re.escape(ch))
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        else:
+            parts.append('.' if ch == '_' else '.*')
+    compiled = re.compile(''.join(parts), re.DOTALL)
+
+    def predicate(row: Dict[str, Any]) -> bool:
+        current = row.get(column)
+        return current is not None and compiled.fullmatch(current) is not None
+    return predicate
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(expr):
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ',':
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _parse_logic(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    """Parse one PostgREST logic-tree term such as ``and(a.eq.1,b.lt."x")``."""
+    for combinator, reducer in (('and(', all), ('or(', any)):
+        if expr.startswith(combinator) and expr.endswith(')'):
+            terms = [_parse_logic(t) for t in _split_top_level(expr[len(combinator):-1])]
+            return lambda row: reducer(t(row) for t in terms)
+    column, op, value = expr.split('.', 2)
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    return _compare(op, column, value)
+
+
+# Mirrors the PRIMARY KEY / UNIQUE constraints in migrations/0001_initial_schema.sql
+UNIQUE_COLUMNS: Dict[str, tuple] = {
+    'users': ('id', 'email'),
+    'announcements': ('id',),
+}
+
+
+class InMemoryAPIError(Exception):
+    """Same shape as ``postgrest.exceptions.APIError``: ``code``, ``message``, ``details``."""
+
+    def __init__(self, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details
+
+
+class InMemoryResult:
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class InMemoryClient:
+    def __init__(self, latency: float = 0.0, max_rows: Optional[int] = None):
+        self.latency = latency
+        self.max_rows = max_rows
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> "InMemoryQuery":
+        return InMemoryQuery(self, name)
+
+
+class InMemoryQuery:
+    def __init__(self, client: InMemoryClient, table: str):
+        self._client = client
+        self._table = table
+        self._operation = 'select'
+        self._columns: Optional[List[str]] = None
+        self._payload: Any = None
+        self._filters: List[Any] = []
+        self._order: List[Any] = []
+        self._limit: Optional[int] = None
+        self._count: Optional[str] = None
+        self._head = False
+
+    # Operations
+    def select(self, columns: str = '*', count: Optional[str] = None, head: Optional[bool] = None):
+        self._operation = 'select'
+        self._count = count
+        self._head = bool(head)
+        if columns.strip() != '*':
+            self._columns = [c.strip() for c in columns.split(',')]
+        return self
+
+    def insert(self, rows):
+        self._operation = 'insert'
+        self._payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values: Dict[str, Any]):
+        self._operation = 'update'
+        self._payload = values
+        return self
+
+    def delete(self):
+        self._operation = 'delete'
+        return self
+
+    # Filters and modifiers
+    def eq(self, column: str, value: Any):
+        self._filters.append(_compare('eq', column, value))
+        return self
+
+    def neq(self, column: str, value: Any):
+        self._filters.append(_compare('neq', column, value))
+        return self
+
+    def lt(self, column: str, value: Any):
+        self._filters.append(_compare('lt', column, value))
+        return self
+
+    def lte(self, column: str, value: Any):
+        self._filters.append(_compare('lte', column, value))
+        return self
+
+    def gt(self, column: str, value: Any):
+        self._filters.append(_compare('gt', column, value))
+        return self
+
+    def gte(self, column: str, value: Any):
+        self._filters.append(_compare('gte', column, value))
+        return self
+
+    def like(self, column: str, pattern: str):
+        self._filters.append(_like(column, pattern))
+        return self
+
+    def in_(self, column: str, values):
+        allowed = set(values)
+        self._filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def or_(self, filters: str):
+        terms = [_parse_logic(t) for t in _split_top_level(filters)]
+        self._filters.append(lambda row: any(t(row) for t in terms))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int):
+        self._limit = size
+        return self
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        return all(f(row) for f in self._filters)
+
+    def _project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self._columns is None:
+            return dict(row)
+        return {c: row.get(c) for c in self._columns}
+
+    def _check_unique(self, rows: List[Dict[str, Any]]) -> None:
+        for column in UNIQUE_COLUMNS.get(self._table, ()):
+            seen = {row.get(column) for row in rows}
+            for row in self._payload:
+                value = row.get(column)
+                if value is None:
+                    continue
+                if value in seen:
+                    raise InMemoryAPIError(
+                        '23505',
+                        f'duplicate key value violates unique constraint "{self._table}_{column}_key"',
+                        f'Key ({column})=({value}) already exists.',
+                    )
+                seen.add(value)
+
+    def execute(self) -> InMemoryResult:
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        with self._client._lock:
+            self._client.calls += 1
+            rows = self._client.tables[self._table]
+            if self._operation == 'insert':
+                self._check_unique(rows)
+                inserted = [copy.deepcopy(r) for r in self._payload]
+                rows.extend(inserted)
+                return InMemoryResult([dict(r) for r in inserted])
+            if self._operation == 'update':
+                updated = []
+                for row in rows:
+                    if self._matches(row):
+                        row.update(self._payload)
+                        updated.append(dict(row))
+                return InMemoryResult(updated)
+            if self._operation == 'delete':
+                deleted = [dict(r) for r in rows if self._matches(r)]
+                rows[:] = [r for r in rows if not self._matches(r)]
+                return InMemoryResult(deleted)
+
+            selected = [r for r in rows if self._matches(r)]
+            # Every count method is exact here
+            count = len(selected) if self._count else None
+            if self._head:
+                return InMemoryResult([], count)
+            for column, desc in reversed(self._order):
+                selected.sort(key=lambda r: r.get(column) or '', reverse=desc)
+            for limit in (self._limit, self._client.max_rows):
+                if limit is not None:
+                    selected = selected[:limit]
+            return InMemoryResult([self._project(r) for r in selected], count)
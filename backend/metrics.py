@@ -0,0 +1,233 @@
+"""
+Minimal Prometheus-style metrics for the API.
+
+Counters, gauges and histograms are plain dicts keyed by label-value tuples,
+rendered in the Prometheus text exposition format (0.0.4) by
+``MetricsRegistry.render``. They are meant to be updated from the event loop
+thread only, which is what keeps them lock-free and cheap enough to leave on.
+
+``MetricsMiddleware`` is a pure ASGI middleware that labels requests with the
+matched route template (``/api/announcements/{announcement_id}``), never the
+raw path, so label cardinality stays bounded.
+"""
+
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, labels: Tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, labels: Tuple, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, labels: Tuple) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bounds = self.buckets + (float('inf'),)
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Gauge or counter whose samples are read from ``fn`` at scrape time."""
+
+    def __init__(self, name, documentation, kind: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[Tuple, float]]):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._fn = fn
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in self._fn().items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[Tuple, float]]) -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, kind, labelnames, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class HttpMetrics:
+    """The request-level series recorded by ``MetricsMiddleware``."""
+
+    def __init__(self, registry: MetricsRegistry, prefix: str = 'teamhub'):
+        self.requests = registry.counter(
+            f'{prefix}_http_requests_total', 'HTTP requests by route template and status',
+            ('method', 'route', 'status'))
+        self.duration = registry.histogram(
+            f'{prefix}_http_request_duration_seconds', 'Time from request start to response headers',
+            ('method', 'route'))
+        self.in_flight = registry.gauge(
+            f'{prefix}_http_requests_in_flight', 'Requests currently being handled',
+            ('method', 'route'))
+
+
+class MetricsMiddleware:
+    """Record latency, in-flight and status counts per route template.
+
+    Latency runs until the response headers are sent, so long-lived streams
+    (the SSE endpoint) count their setup time rather than their lifetime.
+    """
+
+    def __init__(self, app, metrics: HttpMetrics, routes: List[Any]):
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+        self._patterns: List[Tuple[Any, Optional[set], str]] = []
+        self._pattern_count = -1
+
+    def route_template(self, scope) -> str:
+        # Only the compiled path regex and method set are consulted; Route.matches
+        # also converts path params and builds a child scope, which costs several
+        # times more. Routes may be added after startup, hence the length check.
+        if self._pattern_count != len(self.routes):
+            self._patterns = [(route.path_regex, getattr(route, 'methods', None), route.path)
+                              for route in self.routes if hasattr(route, 'path_regex')]
+            self._pattern_count = len(self.routes)
+        path = scope['path']
+        method = scope['method']
+        partial: Optional[str] = None
+        for regex, methods, template in self._patterns:
+            if regex.match(path):
+                if methods is None or method in methods:
+                    return template
+                if partial is None:
+                    partial = template
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        labels = (scope['method'], self.route_template(scope))
+        metrics = self.metrics
+        metrics.in_flight.inc(labels)
+        started = time.perf_counter()
+        response_started: List[float] = []
+        status = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+                response_started.append(time.perf_counter())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finished = response_started[0] if response_started else time.perf_counter()
+            metrics.in_flight.dec(labels)
+            metrics.duration.observe(labels, finished - started)
+            metrics.requests.inc(labels + (str(status[0]),))
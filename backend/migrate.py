@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations.
+
+Migrations are the numbered SQL files in ``migrations/``
+(``0001_initial_schema.sql``, ``0002_...``), applied in version order. Each
+one runs in a single transaction together with the ``schema_migrations`` row
+that records it, so a migration that fails leaves nothing behind and is
+attempted again on the next run. On Postgres the run holds an advisory lock,
+so two deploys starting at once don't race, and PostgREST is told to reload
+its schema cache afterwards.
+
+The ``.sql`` files are written for Postgres. A migration that doesn't run on
+SQLite has a ``NNNN_name.sqlite.sql`` twin, which lets the schema, its indexes
+and ``explain_hot_queries`` be exercised against a throwaway SQLite database.
+
+    DATABASE_URL=postgresql://... python backend/migrate.py
+    python backend/migrate.py --database-url sqlite:///teamhub.db --status
+    python backend/migrate.py --explain
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# pg_advisory_lock key shared by every runner: "teamhub" in ASCII
+_LOCK_KEY = int.from_bytes(b'teamhub', 'big')
+
+# The queries PostgREST generates for the hot paths, the index each should
+# use, and whether that index also provides the ORDER BY. Placeholders are
+# ``?`` and are rewritten per driver.
+HOT_QUERIES: Dict[str, Dict[str, Any]] = {
+    "feed_first_page": {
+        "sql": "SELECT * FROM announcements ORDER BY created_at DESC, id DESC LIMIT 21",
+        "params": (),
+        "index": "announcements_created_at_id_idx",
+        "ordered": True,
+    },
+    "feed_next_page": {
+        "sql": "SELECT * FROM announcements WHERE created_at < ? OR (created_at = ? AND id < ?) "
+               "ORDER BY created_at DESC, id DESC LIMIT 21",
+        "params": ('2024-01-01T00:00:00+00:00', '2024-01-01T00:00:00+00:00',
+                   '00000000-0000-0000-0000-000000000000'),
+        "index": "announcements_created_at_id_idx",
+        "ordered": True,
+    },
+    "announcements_by_author": {
+        "sql": "SELECT id, created_at FROM announcements WHERE author_id = ?",
+        "params": ('00000000-0000-0000-0000-000000000000',),
+        "index": "announcements_author_id_idx",
+        "ordered": False,
+    },
+    "users_first_page": {
+        "sql": "SELECT id, email, role, created_at FROM users ORDER BY created_at DESC, id DESC LIMIT 51",
+        "params": (),
+        "index": "users_created_at_id_idx",
+        "ordered": True,
+    },
+    "users_by_role": {
+        "sql": "SELECT id, email, role, created_at FROM users WHERE role = ? "
+               "ORDER BY created_at DESC, id DESC LIMIT 51",
+        "params": ('admin',),
+        "index": "users_role_created_at_id_idx",
+        "ordered": True,
+    },
+    "users_by_email_prefix": {
+        "sql": "SELECT id, email, role, created_at FROM users WHERE email LIKE ?",
+        "params": ('admin%',),
+        "index": "users_email_pattern_idx",
+        "ordered": False,
+        "dialects": ('postgres',),
+    },
+}
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version: int, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def sql(self, dialect: str) -> str:
+        if dialect == 'sqlite':
+            twin = self.path.with_suffix('.sqlite.sql')
+            if twin.exists():
+                return twin.read_text()
+        return self.path.read_text()
+
+    def __repr__(self) -> str:
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in sorted(directory.glob('*.sql')):
+        match = _FILENAME.match(path.name)
+        if match is not None:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+class SQLiteDatabase:
+    dialect = 'sqlite'
+
+    def __init__(self, path: str):
+        # Autocommit; transactions are opened explicitly per migration
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def apply(self, migration: Migration) -> None:
+        # executescript can't take parameters; version and name come from a
+        # file name matched against ``_FILENAME``
+        try:
+            self.conn.executescript(
+                f"BEGIN;\n{migration.sql(self.dialect)}\n;\n"
+                f"INSERT INTO schema_migrations (version, name) VALUES ({migration.version}, '{migration.name}');\n"
+                "COMMIT;")
+        except Exception:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+
+    def explain(self, sql: str, params: Sequence[Any]) -> str:
+        return '\n'.join(row[-1] for row in self.query(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    def lock(self) -> None:
+        pass
+
+    def unlock(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class PostgresDatabase:
+    dialect = 'postgres'
+
+    def __init__(self, url: str):
+        try:
+            import psycopg
+        except ImportError:
+            raise MigrationError("Postgres migrations need psycopg: pip install 'psycopg[binary]'")
+        self.conn = psycopg.connect(url, autocommit=True)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        cursor = self.conn.execute(sql.replace('?', '%s'), params)
+        return cursor.fetchall() if cursor.description else []
+
+    def apply(self, migration: Migration) -> None:
+        with self.conn.transaction():
+            # No parameters, so psycopg sends the file as one multi-statement query
+            self.conn.execute(migration.sql(self.dialect))
+            self.conn.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                              (migration.version, migration.name))
+
+    def explain(self, sql: str, params: Sequence[Any]) -> str:
+        # Small or empty tables are cheaper to scan and sort than to read
+        # through an index, which says nothing about production. Penalising
+        # scans and sorts asks whether an index can serve the query, in order.
+        with self.conn.transaction():
+            for setting in ('enable_seqscan', 'enable_bitmapscan', 'enable_sort'):
+                self.conn.execute(f"SET LOCAL {setting} = off")
+            rows = self.query(f"EXPLAIN {sql}", params)
+        return '\n'.join(row[0] for row in rows)
+
+    def lock(self) -> None:
+        self.conn.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+
+    def unlock(self) -> None:
+        self.conn.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def connect(url: str):
+    """``postgresql://...`` or ``sqlite:///path`` (``sqlite://`` for in-memory)."""
+    if url.startswith(('postgres://', 'postgresql://')):
+        return PostgresDatabase(url)
+    if url.startswith('sqlite://'):
+        return SQLiteDatabase(url[len('sqlite:///'):] or ':memory:')
+    raise MigrationError(f"Unsupported database URL: {url.split(':', 1)[0]}")
+
+
+def _ensure_history(db) -> None:
+    db.query("CREATE TABLE IF NOT EXISTS schema_migrations ("
+             "version INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+             "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+
+
+def applied_versions(db) -> List[int]:
+    _ensure_history(db)
+    return [row[0] for row in db.query("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def pending(db, migrations: Optional[List[Migration]] = None) -> List[Migration]:
+    done = set(applied_versions(db))
+    return [m for m in (migrations if migrations is not None else discover()) if m.version not in done]
+
+
+def migrate(db, target: Optional[int] = None, migrations: Optional[List[Migration]] = None) -> List[Migration]:
+    """Apply pending migrations up to ``target`` (all by default); return those applied."""
+    db.lock()
+    try:
+        todo = [m for m in pending(db, migrations) if target is None or m.version <= target]
+        for migration in todo:
+            try:
+                db.apply(migration)
+            except Exception as e:
+                raise MigrationError(f"{migration.version:04d}_{migration.name} failed: {e}") from e
+        if todo and db.dialect == 'postgres':
+            db.query("NOTIFY pgrst, 'reload schema'")
+        return todo
+    finally:
+        db.unlock()
+
+
+def explain_hot_queries(db) -> Dict[str, Dict[str, Any]]:
+    """Plan every ``HOT_QUERIES`` entry that runs on ``db``'s dialect.
+
+    ``uses_index`` is whether the plan goes through the expected index and
+    ``sorts`` whether it still sorts rows to satisfy the ORDER BY.
+    """
+    report = {}
+    for name, hot in HOT_QUERIES.items():
+        if db.dialect not in hot.get('dialects', ('postgres', 'sqlite')):
+            continue
+        plan = db.explain(hot['sql'], hot['params'])
+        if db.dialect == 'sqlite':
+            sorts = 'USE TEMP B-TREE FOR ORDER BY' in plan
+        else:
+            sorts = re.search(r'(^|->\s*)(Incremental )?Sort\b', plan, re.MULTILINE) is not None
+        report[name] = {
+            "index": hot['index'],
+            "uses_index": re.search(rf"\b{hot['index']}\b", plan) is not None,
+            "ordered": hot['ordered'],
+            "sorts": sorts,
+            "plan": plan,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get('DATABASE_URL'),
+                        help="postgresql://... or sqlite:///path (default: $DATABASE_URL)")
+    parser.add_argument("--target", type=int, help="apply migrations up to this version only")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations and exit")
+    parser.add_argument("--explain", action="store_true",
+                        help="after migrating, check that the hot queries use their indexes")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    try:
+        db = connect(args.database_url)
+    except MigrationError as e:
+        print(f"Migration error: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.status:
+            done = set(applied_versions(db))
+            for migration in discover():
+                state = "applied" if migration.version in done else "pending"
+                print(f"{migration.version:04d}_{migration.name}: {state}")
+            return 0
+
+        for migration in migrate(db, args.target):
+            print(f"Applied {migration.version:04d}_{migration.name}")
+
+        if args.explain:
+            failed = False
+            for name, result in explain_hot_queries(db).items():
+                ok = result["uses_index"] and not (result["ordered"] and result["sorts"])
+                failed = failed or not ok
+                print(f"{'ok' if ok else 'FAIL'} {name}: {result['index']}")
+                if not ok:
+                    print('    ' + result["plan"].replace('\n', '\n    '))
+            return 1 if failed else 0
+        return 0
+    except MigrationError as e:
+        print(f"Migration error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+-- Tables as originally created by hand from create_tables.py. Everything is
+-- idempotent so databases set up that way can be brought under the runner.
+
+CREATE TABLE IF NOT EXISTS users (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    role TEXT CHECK (role IN ('admin', 'user')) DEFAULT 'user',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE users ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their own data" ON users;
+CREATE POLICY "Users can view their own data" ON users
+    FOR SELECT USING (true);
+
+DROP POLICY IF EXISTS "Users can insert their own data" ON users;
+CREATE POLICY "Users can insert their own data" ON users
+    FOR INSERT WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Users can update their own data" ON users;
+CREATE POLICY "Users can update their own data" ON users
+    FOR UPDATE USING (true);
+
+CREATE TABLE IF NOT EXISTS announcements (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    author_email TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE announcements ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Anyone can view announcements" ON announcements;
+CREATE POLICY "Anyone can view announcements" ON announcements
+    FOR SELECT USING (true);
+
+DROP POLICY IF EXISTS "Authenticated users can create announcements" ON announcements;
+CREATE POLICY "Authenticated users can create announcements" ON announcements
+    FOR INSERT WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Authors and admins can update announcements" ON announcements;
+CREATE POLICY "Authors and admins can update announcements" ON announcements
+    FOR UPDATE USING (true);
+
+DROP POLICY IF EXISTS "Authors and admins can delete announcements" ON announcements;
+CREATE POLICY "Authors and admins can delete announcements" ON announcements
+    FOR DELETE USING (true);
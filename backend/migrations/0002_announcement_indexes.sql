@@ -0,0 +1,9 @@
+-- The feed orders by created_at desc, id desc and pages with a keyset filter
+-- on (created_at, id). One composite index serves both that and the plain
+-- created_at desc order of the unpaginated list.
+CREATE INDEX IF NOT EXISTS announcements_created_at_id_idx
+    ON announcements (created_at DESC, id DESC);
+
+-- Ownership-filtered writes, per-author lookups and ON DELETE CASCADE from users
+CREATE INDEX IF NOT EXISTS announcements_author_id_idx
+    ON announcements (author_id);
@@ -0,0 +1,11 @@
+-- Admin user directory: keyset pages in (created_at desc, id desc) order,
+-- optionally filtered by role or by email prefix (LIKE 'prefix%')
+CREATE INDEX IF NOT EXISTS users_created_at_id_idx
+    ON users (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS users_role_created_at_id_idx
+    ON users (role, created_at DESC, id DESC);
+
+-- text_pattern_ops lets a prefix LIKE use the index under a non-C collation
+CREATE INDEX IF NOT EXISTS users_email_pattern_idx
+    ON users (email text_pattern_ops);
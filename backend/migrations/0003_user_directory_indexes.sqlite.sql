@@ -0,0 +1,8 @@
+-- SQLite stand-in for 0003. SQLite has no operator classes; prefix LIKE is
+-- only index-assisted there with case_sensitive_like, so the email index is
+-- left to Postgres.
+CREATE INDEX IF NOT EXISTS users_created_at_id_idx
+    ON users (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS users_role_created_at_id_idx
+    ON users (role, created_at DESC, id DESC);
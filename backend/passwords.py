@@ -0,0 +1,78 @@
+"""
+Bounded worker pool for bcrypt.
+
+Hashing and verifying cost tens to hundreds of milliseconds of CPU each, so
+they run on a dedicated thread or process pool rather than the event loop.
+The pool admits at most ``workers + max_queue`` outstanding jobs; beyond that
+``PasswordPoolBusy`` is raised immediately so callers can shed load instead of
+queueing behind a login storm.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the pool is saturated or a job exceeds its timeout."""
+
+
+def _hash(password: str) -> str:
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _check(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_queue: int, timeout: float, kind: str = 'thread'):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown password pool kind: {kind}")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.kind = kind
+        self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        if kind == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolBusy("Password pool saturated")
+            self._pending += 1
+        # The slot is released when the job really finishes, not when the caller
+        # gives up, so timed-out work still counts against capacity.
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordPoolBusy("Password job timed out")
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_check, password, hashed)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
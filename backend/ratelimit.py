@@ -0,0 +1,186 @@
+"""
+In-process token-bucket rate limiting for the auth endpoints.
+
+Each ``TokenBucketLimiter`` holds one bucket per key (a client IP or a target
+email). Buckets refill continuously at ``rate`` tokens per second up to
+``capacity``; a request that finds less than one token is rejected with the
+number of seconds until one is available.
+
+A bucket that has been idle long enough to refill completely is
+indistinguishable from a fresh one, so it is dropped. Buckets are kept in
+least-recently-used order, which lets each call sweep a few idle ones off
+the cold end, and ``max_keys`` caps the total even under a flood of new
+keys.
+
+``SharedTokenBucketLimiter`` has the same interface but keeps its buckets in
+a fixed-size table in a shared file, so every worker on the host draws from
+the same budget.
+"""
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Tuple
+
+from coherency import FileLock, map_file, stable_hash
+
+# Idle buckets inspected per call; keeps eviction amortised O(1)
+SWEEP_BATCH = 4
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """``"10/60"`` -> 10 requests per 60 seconds -> ``(capacity, rate)``.
+
+    The capacity is also the burst size.
+    """
+    try:
+        count, _, period = spec.partition('/')
+        capacity = int(count)
+        seconds = float(period or 1)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected '<requests>/<seconds>'")
+    if capacity <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected '<requests>/<seconds>'")
+    return capacity, capacity / seconds
+
+
+class TokenBucketLimiter:
+    def __init__(self, capacity: int, rate: float, max_keys: int = 100000):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        # Seconds for an empty bucket to refill, after which it can be dropped
+        self.idle_after = capacity / rate
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: Hashable) -> Tuple[bool, float]:
+        """Take one token for ``key``; returns ``(allowed, retry_after_seconds)``."""
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.capacity), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                tokens = bucket[0] + (now - bucket[1]) * self.rate
+                bucket[0] = min(float(self.capacity), tokens)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return True, 0.0
+            self.rejected += 1
+            return False, (1 - bucket[0]) / self.rate
+
+    def _sweep(self, now: float) -> None:
+        for _ in range(SWEEP_BATCH):
+            if not self._buckets:
+                return
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < self.idle_after:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "rate_per_second": self.rate,
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
+
+
+# (key hash, tokens, last refill) per slot; a zero hash marks an empty slot
+_SLOT = struct.Struct('<Qdd')
+# Slots probed per key before evicting the least recently used one
+PROBE_WINDOW = 4
+
+
+class SharedTokenBucketLimiter:
+    """Token buckets in a table mmap'd from ``path``, shared across processes.
+
+    A key hashes to a window of ``PROBE_WINDOW`` slots. It reuses its own slot,
+    else takes an empty or idle (fully refilled) one, else evicts the least
+    recently used bucket in the window. Memory is fixed at ``slots`` buckets.
+    ``time.monotonic`` is system-wide on Linux, so refill times agree between
+    workers.
+    """
+
+    def __init__(self, path: Path, capacity: int, rate: float, slots: int = 100000):
+        self.capacity = capacity
+        self.rate = rate
+        self.slots = slots
+        self.idle_after = capacity / rate
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+        self._fd, self._map = map_file(path, slots * _SLOT.size)
+        self._lock = FileLock(self._fd)
+
+    def hit(self, key: Hashable) -> Tuple[bool, float]:
+        """Take one token for ``key``; returns ``(allowed, retry_after_seconds)``."""
+        key_hash = stable_hash(key) | 1
+        base = key_hash % self.slots
+        now = time.monotonic()
+        with self._lock:
+            target = free = victim = None
+            victim_last = float('inf')
+            tokens = float(self.capacity)
+            for probe in range(PROBE_WINDOW):
+                index = (base + probe) % self.slots
+                slot_hash, slot_tokens, last = _SLOT.unpack_from(self._map, index * _SLOT.size)
+                if slot_hash == key_hash:
+                    target = index
+                    tokens = min(float(self.capacity), slot_tokens + max(0.0, now - last) * self.rate)
+                    break
+                if slot_hash == 0 or now - last >= self.idle_after:
+                    if free is None:
+                        free = index
+                elif last < victim_last:
+                    victim, victim_last = index, last
+            if target is None:
+                if free is None:
+                    free = victim
+                    self.evictions += 1
+                target = free
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            _SLOT.pack_into(self._map, target * _SLOT.size, key_hash, tokens, now)
+        if allowed:
+            self.allowed += 1
+            return True, 0.0
+        self.rejected += 1
+        return False, (1 - tokens) / self.rate
+
+    def __len__(self) -> int:
+        """Buckets that are not yet idle. Scans the table; meant for scrapes."""
+        now = time.monotonic()
+        return sum(1 for slot_hash, _, last in _SLOT.iter_unpack(self._map)
+                   if slot_hash and now - last < self.idle_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "rate_per_second": self.rate,
+            "keys": len(self),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
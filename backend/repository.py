@@ -0,0 +1,402 @@
+"""
+Async data-access layer for Team Hub.
+
+supabase-py's query builders are synchronous, so calling ``.execute()`` from an
+``async def`` handler blocks the event loop for a full PostgREST round trip.
+Every query here goes through ``Database.execute``, which runs it on a bounded
+thread pool and awaits the result.
+
+The repositories only need a client exposing ``table(name)`` with the
+PostgREST builder API, so the Supabase client can be swapped for
+``memory_backend.InMemoryClient`` in benchmarks.
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from breaker import CircuitBreaker
+
+DEFAULT_MAX_WORKERS = 16
+
+# Postgres SQLSTATE for unique_violation, surfaced as ``APIError.code`` by postgrest
+UNIQUE_VIOLATION = '23505'
+
+# ``in.(...)`` filters travel in the URL, so long id lists are split to keep
+# request lines well under common proxy limits. Inserts go in the body.
+IN_FILTER_CHUNK = 150
+INSERT_CHUNK = 1000
+
+# Everything a user lookup needs except ``password_hash``, which never leaves
+# the database unless a caller names it
+USER_COLUMNS = 'id, email, role, created_at'
+
+
+class DuplicateKeyError(Exception):
+    """An insert hit a unique constraint."""
+
+
+class BulkWriteError(Exception):
+    """Some chunks of a chunked write failed after others had been written.
+
+    Each chunk is its own statement, so nothing rolls the written ones back.
+    ``rows`` holds what the successful chunks returned, ``failed`` the input
+    items of the chunks that raised and ``errors`` their exceptions.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], failed: List[Any], errors: List[BaseException]):
+        super().__init__(f"{len(errors)} chunk(s) failed: {errors[0]}")
+        self.rows = rows
+        self.failed = failed
+        self.errors = errors
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def write_chunks(write: Callable[[List[Any]], Awaitable[List[Dict[str, Any]]]],
+                       items: List[Any], size: int) -> List[Dict[str, Any]]:
+    """Run ``write`` concurrently on ``items`` in chunks of ``size`` and return
+    the rows it wrote.
+
+    If every chunk fails, nothing was written and the first error is raised
+    as is. If only some fail, ``BulkWriteError`` reports the rows that were
+    written and the items that weren't.
+    """
+    chunks = chunked(items, size)
+    results = await asyncio.gather(*(write(chunk) for chunk in chunks), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    rows = [row for result in results if not isinstance(result, BaseException) for row in result]
+    if errors:
+        failed = [item for chunk, result in zip(chunks, results) if isinstance(result, BaseException) for item in chunk]
+        raise BulkWriteError(rows, failed, errors)
+    return rows
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """Opaque keyset cursor for the row that ended a page."""
+    raw = json.dumps([created_at, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` on malformed input.
+
+    Both values end up quoted inside a PostgREST ``or`` filter, so they must
+    be a timestamp and a UUID: anything else could carry a ``"`` and add
+    filter terms of its own, or fail the cast in Postgres."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        datetime.fromisoformat(created_at)
+        row_id = str(uuid.UUID(row_id))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
+def like_prefix(prefix: str) -> str:
+    """``LIKE`` pattern matching strings that start with ``prefix`` literally.
+    PostgREST treats ``*`` as a wildcard too, so callers must not pass one."""
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped + '%'
+
+
+def keyset_filter(created_at: str, row_id: str) -> str:
+    """PostgREST ``or`` filter selecting rows strictly after the cursor in
+    ``created_at desc, id desc`` order."""
+    return f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{row_id}")'
+
+
+async def _keyset_page(db: 'Database', table: str, columns: str, limit: int,
+                       after: Optional[Tuple[str, str]],
+                       where: Optional[Callable[[Any], Any]] = None) -> List[Dict[str, Any]]:
+    query = db.table(table).select(columns)
+    if where is not None:
+        query = where(query)
+    if after is not None:
+        query = query.or_(keyset_filter(*after))
+    query = query.order('created_at', desc=True).order('id', desc=True).limit(limit)
+    result = await db.execute(table, 'select', query)
+    return result.data
+
+
+async def iter_pages(fetch_page: Callable[..., Awaitable[List[Dict[str, Any]]]],
+                     page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield every row of a keyset-ordered table one page at a time.
+
+    ``fetch_page(limit, after)`` is a repository ``list_page``. The next page is
+    requested while the caller is still consuming the current one, so a slow
+    consumer (e.g. a client download) overlaps with the upstream round trip.
+
+    Paging stops at the first empty page, not the first short one: PostgREST
+    silently caps a page at its max-rows setting, so a ``page_size`` above
+    that cap comes back short long before the end of the table.
+    """
+    pending = asyncio.ensure_future(fetch_page(page_size, None))
+    try:
+        while True:
+            rows = await pending
+            pending = None
+            if rows:
+                last = rows[-1]
+                pending = asyncio.ensure_future(fetch_page(page_size, (last['created_at'], last['id'])))
+            if rows:
+                yield rows
+            if pending is None:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+# observer(table, operation, seconds, failed)
+QueryObserver = Callable[[str, str, float, bool], None]
+
+
+class RetryPolicy:
+    """Which failed calls ``Database.execute`` repeats, and how long it waits.
+
+    Only ``operations`` are retried: a select can be repeated safely, whereas a
+    repeated insert may duplicate rows and a repeated delete reports nothing
+    deleted. ``transient(exc)`` decides whether an error is worth another try.
+    Delays use full jitter: uniform in ``[0, min(max_delay, base_delay * 2**n)]``.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.05, max_delay: float = 1.0,
+                 transient: Callable[[BaseException], bool] = lambda exc: False,
+                 operations: Tuple[str, ...] = ('select',)):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.transient = transient
+        self.operations = operations
+
+    def should_retry(self, operation: str, exc: BaseException, attempt: int) -> bool:
+        return attempt + 1 < self.attempts and operation in self.operations and self.transient(exc)
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class Database:
+    """Runs blocking query builders on a bounded thread pool.
+
+    ``timeout`` bounds each attempt (pool wait included) so a hung upstream
+    call can't hold a handler forever; the HTTP client's own timeouts end the
+    worker thread. Failed attempts are retried according to ``retry``. With a
+    ``breaker``, every attempt is admitted and reported through it, and
+    ``breaker.CircuitOpenError`` is raised without calling Supabase while it
+    is open.
+    """
+
+    def __init__(self, client: Any, max_workers: int = DEFAULT_MAX_WORKERS,
+                 observer: Optional[QueryObserver] = None, retry: RetryPolicy = NO_RETRY,
+                 timeout: Optional[float] = None, breaker: Optional[CircuitBreaker] = None):
+        self.client = client
+        self.max_workers = max_workers
+        self.observer = observer
+        self.retry = retry
+        self.timeout = timeout
+        self.breaker = breaker
+        self.in_flight = 0
+        self.retries = 0
+        self.timeouts = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="supabase")
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    async def execute(self, table: str, operation: str, query: Any):
+        """Execute ``query`` off the event loop.
+
+        ``table`` and ``operation`` label the call (e.g. ``users``/``select``)
+        for the ``observer``, which sees every call's latency and outcome.
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.before_call()
+            started = time.perf_counter()
+            failed = True
+            error = None
+            self.in_flight += 1
+            try:
+                call = loop.run_in_executor(self._executor, query.execute)
+                result = await (asyncio.wait_for(call, self.timeout) if self.timeout else call)
+                failed = False
+                return result
+            except Exception as e:
+                error = e
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                if not self.retry.should_retry(operation, e, attempt):
+                    raise
+            finally:
+                self.in_flight -= 1
+                elapsed = time.perf_counter() - started
+                if self.breaker is not None:
+                    self.breaker.record(elapsed, error)
+                if self.observer is not None:
+                    self.observer(table, operation, elapsed, failed)
+            self.retries += 1
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class UserRepository:
+    def __init__(self, db: Database):
+        self._db = db
+
+    async def get_by_id(self, user_id: str, columns: str = USER_COLUMNS) -> Optional[Dict[str, Any]]:
+        query = self._db.table('users').select(columns).eq('id', user_id)
+        result = await self._db.execute('users', 'select', query)
+        return result.data[0] if result.data else None
+
+    async def get_by_email(self, email: str, columns: str = USER_COLUMNS) -> Optional[Dict[str, Any]]:
+        """Look a user up by email. ``password_hash`` is only returned when
+        asked for in ``columns``; signin is the one caller that needs it."""
+        query = self._db.table('users').select(columns).eq('email', email)
+        result = await self._db.execute('users', 'select', query)
+        return result.data[0] if result.data else None
+
+    async def create(self, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Insert a user; raises ``DuplicateKeyError`` if the email is taken."""
+        query = self._db.table('users').insert(user_data)
+        try:
+            result = await self._db.execute('users', 'insert', query)
+        except Exception as e:
+            if getattr(e, 'code', None) == UNIQUE_VIOLATION:
+                raise DuplicateKeyError(str(e)) from e
+            raise
+        return result.data[0] if result.data else None
+
+    async def list_all(self, role: Optional[str] = None, email_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = _user_filters(self._db.table('users').select(USER_COLUMNS), role, email_prefix)
+        query = query.order('created_at', desc=True)
+        result = await self._db.execute('users', 'select', query)
+        return result.data
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None,
+                        columns: str = USER_COLUMNS, role: Optional[str] = None,
+                        email_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Keyset page of users, same ordering as ``AnnouncementRepository.list_page``,
+        optionally only those with ``role`` and/or an email starting with ``email_prefix``."""
+        return await _keyset_page(self._db, 'users', columns, limit, after,
+                                  lambda query: _user_filters(query, role, email_prefix))
+
+    async def count(self, role: Optional[str] = None, email_prefix: Optional[str] = None,
+                    method: str = 'exact') -> int:
+        """Number of users matching the ``list_page`` filters. ``method`` is a
+        PostgREST count: ``exact``, or ``planned``/``estimated`` to use the
+        planner's row estimate instead of counting a large result."""
+        query = self._db.table('users').select('id', count=method, head=True)
+        result = await self._db.execute('users', 'select', _user_filters(query, role, email_prefix))
+        return result.count or 0
+
+    async def update(self, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        query = self._db.table('users').update(update_data).eq('id', user_id)
+        result = await self._db.execute('users', 'update', query)
+        return result.data[0] if result.data else None
+
+    async def update_many(self, user_ids: List[str], update_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply the same ``update_data`` to every user in ``user_ids``; see
+        ``write_chunks`` for partial failures."""
+        async def run(chunk):
+            query = self._db.table('users').update(update_data).in_('id', chunk)
+            return (await self._db.execute('users', 'update', query)).data
+        return await write_chunks(run, user_ids, IN_FILTER_CHUNK)
+
+    async def ping(self) -> None:
+        """Cheapest possible round trip, used by the health check."""
+        query = self._db.table('users').select('id').limit(1)
+        await self._db.execute('users', 'select', query)
+
+
+def _user_filters(query: Any, role: Optional[str], email_prefix: Optional[str]) -> Any:
+    if role is not None:
+        query = query.eq('role', role)
+    if email_prefix:
+        query = query.like('email', like_prefix(email_prefix))
+    return query
+
+
+class AnnouncementRepository:
+    def __init__(self, db: Database):
+        self._db = db
+
+    async def get(self, announcement_id: str, columns: str = '*') -> Optional[Dict[str, Any]]:
+        query = self._db.table('announcements').select(columns).eq('id', announcement_id)
+        result = await self._db.execute('announcements', 'select', query)
+        return result.data[0] if result.data else None
+
+    async def list_all(self, columns: str = '*') -> List[Dict[str, Any]]:
+        query = self._db.table('announcements').select(columns).order('created_at', desc=True)
+        result = await self._db.execute('announcements', 'select', query)
+        return result.data
+
+    async def list_page(self, limit: int, after: Optional[Tuple[str, str]] = None,
+                        columns: str = '*') -> List[Dict[str, Any]]:
+        """Up to ``limit`` rows in ``created_at desc, id desc`` order, starting
+        after the ``(created_at, id)`` keyset position ``after``."""
+        return await _keyset_page(self._db, 'announcements', columns, limit, after)
+
+    async def create(self, announcement_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        query = self._db.table('announcements').insert(announcement_data)
+        result = await self._db.execute('announcements', 'insert', query)
+        return result.data[0] if result.data else None
+
+    async def get_many(self, announcement_ids: List[str], columns: str = '*') -> List[Dict[str, Any]]:
+        async def run(chunk):
+            query = self._db.table('announcements').select(columns).in_('id', chunk)
+            return (await self._db.execute('announcements', 'select', query)).data
+        results = await asyncio.gather(*(run(c) for c in chunked(announcement_ids, IN_FILTER_CHUNK)))
+        return [row for rows in results for row in rows]
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert ``rows``; see ``write_chunks`` for partial failures."""
+        async def run(chunk):
+            query = self._db.table('announcements').insert(chunk)
+            return (await self._db.execute('announcements', 'insert', query)).data
+        return await write_chunks(run, rows, INSERT_CHUNK)
+
+    async def update(self, announcement_id: str, update_data: Dict[str, Any],
+                     author_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Update one announcement; with ``author_id`` only if that user owns it."""
+        query = self._db.table('announcements').update(update_data).eq('id', announcement_id)
+        if author_id is not None:
+            query = query.eq('author_id', author_id)
+        result = await self._db.execute('announcements', 'update', query)
+        return result.data[0] if result.data else None
+
+    async def delete(self, announcement_id: str, author_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Delete one announcement; with ``author_id`` only if that user owns it."""
+        query = self._db.table('announcements').delete().eq('id', announcement_id)
+        if author_id is not None:
+            query = query.eq('author_id', author_id)
+        result = await self._db.execute('announcements', 'delete', query)
+        return result.data
+
+    async def delete_many(self, announcement_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete ``announcement_ids``; see ``write_chunks`` for partial failures."""
+        async def run(chunk):
+            query = self._db.table('announcements').delete().in_('id', chunk)
+            return (await self._db.execute('announcements', 'delete', query)).data
+        return await write_chunks(run, announcement_ids, IN_FILTER_CHUNK)
@@ -0,0 +1,185 @@
+"""
+In-process inverted index over announcement titles and content.
+
+The index is built from the full table (``rebuild``) and then kept current by the
+write handlers (``add`` replaces any previous version of a document,
+``remove`` drops it), so queries never touch the database.
+
+Ranking is BM25 with terms ANDed. Each posting stores the document's
+term-frequency component quantised to an integer impact (1-255), normalised
+against the average document length when the document was indexed. Small
+ints are shared objects, which keeps postings compact.
+
+Queries walk impact-ordered posting lists and stop as soon as no unseen
+document can beat the current top ``limit`` (threshold algorithm), so common
+terms cost roughly O(limit) rather than O(document frequency). The ordered
+list for a term is built on first use and then patched in place by writes.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from typing import Any, Dict, Iterable, List
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+IMPACT_LEVELS = 255
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our so
+that the their there this to was we were will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def _term_frequencies(document: Dict[str, Any]) -> Dict[str, int]:
+    frequencies: Dict[str, int] = {}
+    for term in tokenize(document.get('title') or ''):
+        frequencies[term] = frequencies.get(term, 0) + TITLE_WEIGHT
+    for term in tokenize(document.get('content') or ''):
+        frequencies[term] = frequencies.get(term, 0) + 1
+    return frequencies
+
+
+class SearchIndex:
+    def __init__(self):
+        # term -> {doc number: impact}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # term -> doc numbers by descending impact, built lazily
+        self._ranked: Dict[str, List[int]] = {}
+        self._doc_numbers: Dict[str, int] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._next_number = 0
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def rebuild(self, documents: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._ranked.clear()
+            self._doc_numbers.clear()
+            self._docs.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0
+            for document in documents:
+                self._add(document)
+            self.built = True
+
+    def add(self, document: Dict[str, Any]) -> None:
+        """Index ``document`` (an announcement row), replacing any older version."""
+        with self._lock:
+            self._remove(document['id'])
+            self._add(document)
+
+    def remove(self, document_id: str) -> None:
+        with self._lock:
+            self._remove(document_id)
+
+    def _add(self, document: Dict[str, Any]) -> None:
+        frequencies = _term_frequencies(document)
+        length = sum(frequencies.values())
+
+        number = self._next_number
+        self._next_number += 1
+        self._doc_numbers[document['id']] = number
+        self._docs[number] = document
+        self._doc_lengths[number] = length
+        self._total_length += length
+
+        average = self._total_length / len(self._docs)
+        norm = K1 * (1 - B + B * length / average) if average else K1
+        for term, tf in frequencies.items():
+            weight = tf / (tf + norm)  # BM25 tf component divided by (K1 + 1)
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+            postings[number] = max(1, round(weight * IMPACT_LEVELS))
+            ranked = self._ranked.get(term)
+            if ranked is not None:
+                bisect.insort_right(ranked, number, key=lambda n: -postings[n])
+
+    def _remove(self, document_id: str) -> None:
+        number = self._doc_numbers.pop(document_id, None)
+        if number is None:
+            return
+        document = self._docs.pop(number)
+        self._total_length -= self._doc_lengths.pop(number)
+        for term in _term_frequencies(document):
+            postings = self._postings[term]
+            ranked = self._ranked.get(term)
+            if ranked is not None:
+                # Jump to the run of equal impacts, then find the doc within it
+                start = bisect.bisect_left(ranked, -postings[number], key=lambda n: -postings[n])
+                del ranked[ranked.index(number, start)]
+            del postings[number]
+            if not postings:
+                del self._postings[term]
+                self._ranked.pop(term, None)
+
+    def _ranked_list(self, term: str) -> List[int]:
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            postings = self._postings[term]
+            ranked = self._ranked[term] = sorted(postings, key=postings.__getitem__, reverse=True)
+        return ranked
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Best ``limit`` documents containing every query term, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            if any(term not in self._postings for term in terms):
+                return []
+            if len(terms) == 1:
+                return [self._docs[number] for number in self._ranked_list(terms[0])[:limit]]
+
+            n = len(self._docs)
+            scored_terms = []
+            for term in terms:
+                postings = self._postings[term]
+                df = len(postings)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                scored_terms.append((postings, idf, self._ranked_list(term)))
+            # Drive from the rarest term; the others are probed by dict lookup
+            scored_terms.sort(key=lambda entry: len(entry[0]))
+            (driver, driver_idf, driver_ranked), others = scored_terms[0], scored_terms[1:]
+            others_ceiling = sum(postings[ranked[0]] * idf for postings, idf, ranked in others)
+
+            heap: List[tuple] = []
+            for number in driver_ranked:
+                impact = driver[number] * driver_idf
+                if len(heap) == limit and heap[0][0] >= impact + others_ceiling:
+                    break
+                score = impact
+                for postings, idf, _ in others:
+                    other = postings.get(number)
+                    if other is None:
+                        break
+                    score += other * idf
+                else:
+                    entry = (score, -number)
+                    if len(heap) < limit:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+            return [self._docs[-negated] for _, negated in sorted(heap, reverse=True)]
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self._docs), "terms": len(self._postings)}
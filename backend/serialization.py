@@ -0,0 +1,44 @@
+"""
+Fast JSON encoding for list responses built from trusted upstream rows.
+
+Rows coming back from PostgREST already have the right types, so validating
+them into response models only to dump them again is wasted work on large
+lists. ``dump_rows`` projects each row onto the model's fields and encodes it
+directly, with orjson when it is installed and the stdlib encoder otherwise.
+
+The JSON shape is the model's: same keys, same order. Timestamps are passed
+through as PostgREST formats them (ISO 8601 with offset) instead of being
+re-rendered by pydantic.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def model_fields(model: Type[BaseModel]) -> tuple:
+    return tuple(model.model_fields)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def project(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    return [{field: row.get(field) for field in fields} for row in rows]
+
+
+def dump_rows(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> bytes:
+    return dumps(project(rows, fields))
+
+
+def dump_page(rows: Iterable[Dict[str, Any]], fields: Sequence[str], next_cursor: Optional[str]) -> bytes:
+    return dumps({"items": project(rows, fields), "next_cursor": next_cursor})
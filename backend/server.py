@@ -1,27 +1,320 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+import asyncio
+import math
+import time
 import os
+import sys
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional, Tuple, Union
 import uuid
 from datetime import datetime
-from supabase import create_client, Client
 from jose import JWTError, jwt
-import bcrypt
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# Supabase configuration
-supabase_url = os.environ['SUPABASE_URL']
-supabase_key = os.environ['SUPABASE_ANON_KEY']
 jwt_secret = os.environ['JWT_SECRET']
 
-supabase: Client = create_client(supabase_url, supabase_key)
+# Sibling modules are imported by name whether the app is started as
+# `server:app` from backend/ or as `backend.server:app` from the repo root.
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from repository import (Database, UserRepository, AnnouncementRepository, BulkWriteError, DuplicateKeyError,
+                        RetryPolicy, chunked, encode_cursor, decode_cursor, iter_pages)
+from upstream import LazyClient, build_http_client, create_rest_client, is_outage, is_transient, pool_stats
+from breaker import CircuitBreaker, CircuitOpenError
+from coalescing import WriteCoalescer
+from compression import CompressionMiddleware, CompressionStats, VariantCache, negotiate
+from passwords import PasswordPool, PasswordPoolBusy
+from caching import TTLCache, FeedCache, etag_matches, etag_variant
+from broadcast import Broadcaster, BroadcasterFull
+from search_index import SearchIndex
+from stats import AnnouncementStats
+from ratelimit import TokenBucketLimiter, SharedTokenBucketLimiter, parse_rate
+from coherency import SharedCounters, WorkerBus
+from metrics import MetricsRegistry, HttpMetrics, MetricsMiddleware
+from export import ANNOUNCEMENT_COLUMNS, USER_COLUMNS, MEDIA_TYPES, ENCODERS
+import serialization
+
+# Prometheus-style metrics, served on GET /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+metrics = MetricsRegistry()
+http_metrics = HttpMetrics(metrics)
+upstream_duration = metrics.histogram(
+    'teamhub_upstream_duration_seconds', 'Supabase call latency including thread pool wait',
+    ('table', 'operation'))
+upstream_errors = metrics.counter(
+    'teamhub_upstream_errors_total', 'Supabase calls that raised', ('table', 'operation'))
+
+def observe_upstream(table: str, operation: str, seconds: float, failed: bool) -> None:
+    labels = (table, operation)
+    upstream_duration.observe(labels, seconds)
+    if failed:
+        upstream_errors.inc(labels)
+
+# One shared, pooled HTTP client for every Supabase call. The pool defaults
+# to the thread pool size so each worker thread can keep a warm connection.
+SUPABASE_MAX_WORKERS = int(os.environ.get('SUPABASE_MAX_WORKERS', '16'))
+SUPABASE_POOL_SIZE = int(os.environ.get('SUPABASE_POOL_SIZE', str(SUPABASE_MAX_WORKERS)))
+# Built together with the Supabase client on first use
+http_client = None
+
+def connect_supabase():
+    """Build the Supabase REST client; runs once, on first use or at startup warm-up."""
+    global http_client
+    http_client = build_http_client(
+        pool_size=SUPABASE_POOL_SIZE,
+        keepalive=SUPABASE_POOL_SIZE,
+        keepalive_expiry=float(os.environ.get('SUPABASE_KEEPALIVE_EXPIRY', '30')),
+        http2=os.environ.get('SUPABASE_HTTP2', 'true').lower() != 'false',
+        connect_timeout=float(os.environ.get('SUPABASE_CONNECT_TIMEOUT', '3')),
+        read_timeout=float(os.environ.get('SUPABASE_READ_TIMEOUT', '10')),
+    )
+    return create_rest_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_ANON_KEY'], http_client)
+
+supabase = LazyClient(connect_supabase)
+
+# Selects that fail with a transport error or a gateway/unavailable response
+# are retried with jittered backoff; writes are never retried
+retry_policy = RetryPolicy(
+    attempts=int(os.environ.get('SUPABASE_RETRY_ATTEMPTS', '3')),
+    base_delay=float(os.environ.get('SUPABASE_RETRY_BASE_DELAY', '0.05')),
+    max_delay=float(os.environ.get('SUPABASE_RETRY_MAX_DELAY', '1.0')),
+    transient=is_transient,
+)
+# Upper bound per attempt, including the wait for a free thread
+SUPABASE_CALL_TIMEOUT = float(os.environ.get('SUPABASE_CALL_TIMEOUT', '15'))
+
+# Stop calling Supabase for a while after repeated failures or slow calls
+BREAKER_ENABLED = os.environ.get('BREAKER_ENABLED', 'true').lower() != 'false'
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_SLOW_CALL_SECONDS = float(os.environ.get('BREAKER_SLOW_CALL_SECONDS', '2'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('BREAKER_RESET_TIMEOUT', '10'))
+
+# Optionally gather concurrent announcement creates into bulk inserts, flushed
+# after WRITE_COALESCING_MAX_DELAY_MS or once WRITE_COALESCING_MAX_BATCH rows wait
+WRITE_COALESCING_ENABLED = os.environ.get('WRITE_COALESCING_ENABLED', 'false').lower() == 'true'
+WRITE_COALESCING_MAX_DELAY_MS = float(os.environ.get('WRITE_COALESCING_MAX_DELAY_MS', '5'))
+WRITE_COALESCING_MAX_BATCH = int(os.environ.get('WRITE_COALESCING_MAX_BATCH', '50'))
+
+# Data-access layer: all Supabase calls run on a bounded thread pool
+db: Database
+user_repo: UserRepository
+announcement_repo: AnnouncementRepository
+announcement_writer: Optional[WriteCoalescer] = None
+
+def init_repositories(client, max_workers: Optional[int] = None) -> None:
+    """(Re)bind the repositories to `client`, e.g. an InMemoryClient for benchmarks."""
+    global db, user_repo, announcement_repo, announcement_writer
+    if 'db' in globals():
+        db.close()
+    if max_workers is None:
+        max_workers = SUPABASE_MAX_WORKERS
+    breaker = CircuitBreaker(
+        failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+        reset_timeout=BREAKER_RESET_TIMEOUT,
+        is_failure=is_outage,
+    ) if BREAKER_ENABLED else None
+    db = Database(client, max_workers=max_workers, observer=observe_upstream if METRICS_ENABLED else None,
+                  retry=retry_policy, timeout=SUPABASE_CALL_TIMEOUT or None, breaker=breaker)
+    user_repo = UserRepository(db)
+    announcement_repo = AnnouncementRepository(db)
+    announcement_writer = WriteCoalescer(
+        announcement_repo.create_many,
+        announcement_repo.create,
+        max_batch=WRITE_COALESCING_MAX_BATCH,
+        max_delay=WRITE_COALESCING_MAX_DELAY_MS / 1000,
+        # A bad row fails its whole batch; outages fail every caller anyway
+        split_on=lambda exc: not (is_outage(exc) or isinstance(exc, CircuitOpenError)),
+    ) if WRITE_COALESCING_ENABLED else None
+
+init_repositories(supabase)
+
+# bcrypt runs on its own bounded pool so a login burst cannot stall the event loop
+_password_workers = int(os.environ.get('PASSWORD_POOL_WORKERS', str(os.cpu_count() or 1)))
+password_pool = PasswordPool(
+    workers=_password_workers,
+    max_queue=int(os.environ.get('PASSWORD_POOL_MAX_QUEUE', str(_password_workers * 4))),
+    timeout=float(os.environ.get('PASSWORD_POOL_TIMEOUT', '5')),
+    kind=os.environ.get('PASSWORD_POOL_KIND', 'thread'),
+)
+
+# With several uvicorn workers, set WORKER_SYNC_DIR to a directory they share
+# (ideally tmpfs, e.g. /dev/shm/teamhub). Cache generations, rate limit buckets
+# and announcement changes are then shared between the workers; see coherency.py.
+WORKER_SYNC_DIR = Path(os.environ['WORKER_SYNC_DIR']) if os.environ.get('WORKER_SYNC_DIR') else None
+# Created at startup in each worker process
+worker_bus: Optional[WorkerBus] = None
+
+# Emails known to be registered. A repeat signup for one is answered from here
+# without hashing a password or touching the database.
+known_emails = TTLCache(
+    maxsize=int(os.environ.get('USER_CACHE_SIZE', '10000')),
+    ttl=300,
+    enabled=os.environ.get('USER_CACHE_ENABLED', 'true').lower() != 'false',
+)
+
+# Authenticated-principal cache: user records keyed by id, evicted on role change
+user_cache = TTLCache(
+    maxsize=int(os.environ.get('USER_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('USER_CACHE_TTL', '30')),
+    enabled=os.environ.get('USER_CACHE_ENABLED', 'true').lower() != 'false',
+    shared=SharedCounters(WORKER_SYNC_DIR / 'user-generations', 4096) if WORKER_SYNC_DIR else None,
+)
+
+# gzip/brotli for responses of COMPRESSION_MIN_SIZE bytes or more; see compression.py
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() != 'false'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+compression_stats = CompressionStats()
+# Compressed feed bodies per (ETag, encoding)
+feed_variants = VariantCache(
+    maxsize=2 * int(os.environ.get('FEED_CACHE_SIZE', '256')),
+    gzip_level=COMPRESSION_GZIP_LEVEL,
+    brotli_quality=COMPRESSION_BROTLI_QUALITY,
+)
+
+# Serialized announcement feed pages, invalidated by every announcement write
+feed_cache = FeedCache(
+    maxsize=int(os.environ.get('FEED_CACHE_SIZE', '256')),
+    enabled=os.environ.get('FEED_CACHE_ENABLED', 'true').lower() != 'false',
+    shared=SharedCounters(WORKER_SYNC_DIR / 'feed-generation') if WORKER_SYNC_DIR else None,
+)
+
+# Push channel for announcement changes (GET /api/announcements/stream)
+broadcaster = Broadcaster(
+    queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', '64')),
+    max_subscribers=int(os.environ.get('STREAM_MAX_SUBSCRIBERS', '10000')),
+)
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get('STREAM_HEARTBEAT_SECONDS', '15'))
+
+# Rows fetched per upstream request by the admin export endpoints
+EXPORT_PAGE_SIZE = int(os.environ.get('EXPORT_PAGE_SIZE', '1000'))
+
+# Full-text index over announcements, built at startup and updated by the write handlers
+search_index = SearchIndex()
+# Rows per upstream request while building it; PostgREST caps a response at
+# its max-rows setting (1000 on Supabase), so one unbounded select would come back truncated
+SEARCH_INDEX_PAGE_SIZE = 1000
+# (indexed, removed) changes seen while the index is being built, else None
+search_index_backlog: Optional[list] = None
+# Rebuilt from a paged scan every SEARCH_INDEX_REBUILD_INTERVAL seconds, catching
+# changes it missed (a dropped worker bus datagram, a failed fetch); 0 = only
+# until the first build succeeds
+SEARCH_INDEX_REBUILD_INTERVAL = float(os.environ.get('SEARCH_INDEX_REBUILD_INTERVAL', '300'))
+search_index_task: Optional[asyncio.Future] = None
+# Like stats rebuilds, only one build at a time can be recording the backlog
+search_index_lock = asyncio.Lock()
+# Background startup work (Supabase connection, search index); search waits on it
+warm_up_task: Optional[asyncio.Future] = None
+
+# /api/health reports the last result of a periodic background ping, so
+# health checks never add load to a struggling database
+HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL', '10'))
+health_probe = {"database": "unknown", "checked_at": None, "latency_ms": None, "error": None}
+health_probe_task: Optional[asyncio.Future] = None
+
+# Per-author / per-day announcement counts, kept current by the write path and
+# recounted from a paged scan every STATS_RECONCILE_INTERVAL seconds (0 = only at startup)
+announcement_stats = AnnouncementStats()
+STATS_RECONCILE_INTERVAL = float(os.environ.get('STATS_RECONCILE_INTERVAL', '300'))
+STATS_COLUMNS = 'id, author_id, author_email, created_at'
+STATS_PAGE_SIZE = 1000
+# The first count, started alongside the warm-up; only the stats endpoint waits on it
+stats_build_task: Optional[asyncio.Future] = None
+stats_reconcile_task: Optional[asyncio.Future] = None
+# A rebuild replays the changes made during its scan, and only one can be recording them
+stats_rebuild_lock = asyncio.Lock()
+
+# Token buckets for the auth endpoints, per client IP and per target email.
+# Rates are "<requests>/<seconds>"; the request count is also the burst size.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() != 'false'
+# Behind a proxy (Render) every peer address is the proxy; take the client from X-Forwarded-For
+RATE_LIMIT_TRUST_FORWARDED = os.environ.get('RATE_LIMIT_TRUST_FORWARDED', 'false').lower() == 'true'
+_rate_limit_defaults = {
+    ('signin', 'ip'): '20/60',
+    ('signin', 'email'): '5/60',
+    ('signup', 'ip'): '5/60',
+    ('signup', 'email'): '3/60',
+}
+_rate_limit_max_keys = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+
+def _rate_limiter(route: str, kind: str, default: str):
+    capacity, rate = parse_rate(os.environ.get(f'RATE_LIMIT_{route.upper()}_{kind.upper()}', default))
+    if WORKER_SYNC_DIR:
+        return SharedTokenBucketLimiter(WORKER_SYNC_DIR / f'ratelimit-{route}-{kind}', capacity, rate,
+                                        slots=_rate_limit_max_keys)
+    return TokenBucketLimiter(capacity, rate, max_keys=_rate_limit_max_keys)
+
+rate_limiters = {
+    (route, kind): _rate_limiter(route, kind, default)
+    for (route, kind), default in _rate_limit_defaults.items()
+}
+
+# Scrape-time views of the in-process components
+metrics.callback('teamhub_cache_hits_total', 'Cache hits', 'counter', ('cache',),
+                 lambda: {('feed',): feed_cache.hits, ('user',): user_cache.hits})
+metrics.callback('teamhub_cache_misses_total', 'Cache misses', 'counter', ('cache',),
+                 lambda: {('feed',): feed_cache.misses, ('user',): user_cache.misses})
+metrics.callback('teamhub_cache_entries', 'Entries currently cached', 'gauge', ('cache',),
+                 lambda: {('feed',): feed_cache.stats()['size'], ('user',): len(user_cache)})
+metrics.callback('teamhub_feed_cache_invalidations_total', 'Feed cache invalidations', 'counter', (),
+                 lambda: {(): feed_cache.invalidations})
+metrics.callback('teamhub_feed_not_modified_total', 'Feed requests answered with 304', 'counter', (),
+                 lambda: {(): feed_cache.not_modified})
+metrics.callback('teamhub_password_pool_pending', 'bcrypt jobs queued or running', 'gauge', (),
+                 lambda: {(): password_pool.pending})
+metrics.callback('teamhub_password_pool_rejected_total', 'bcrypt jobs rejected or timed out', 'counter', (),
+                 lambda: {(): password_pool.rejected})
+metrics.callback('teamhub_stream_subscribers', 'Open announcement streams', 'gauge', (),
+                 lambda: {(): broadcaster.subscriber_count})
+metrics.callback('teamhub_stream_dropped_total', 'Streams dropped for falling behind', 'counter', (),
+                 lambda: {(): broadcaster.dropped})
+metrics.callback('teamhub_search_index_documents', 'Announcements in the search index', 'gauge', (),
+                 lambda: {(): len(search_index)})
+metrics.callback('teamhub_rate_limit_decisions_total', 'Auth rate limiter decisions', 'counter',
+                 ('route', 'key', 'decision'),
+                 lambda: {key + (decision,): getattr(limiter, decision)
+                          for key, limiter in rate_limiters.items() for decision in ('allowed', 'rejected')})
+metrics.callback('teamhub_upstream_in_flight', 'Supabase calls queued for or running on the thread pool', 'gauge', (),
+                 lambda: {(): db.in_flight})
+metrics.callback('teamhub_upstream_retries_total', 'Supabase selects retried after a transient failure', 'counter', (),
+                 lambda: {(): db.retries})
+metrics.callback('teamhub_upstream_timeouts_total', 'Supabase call attempts that hit SUPABASE_CALL_TIMEOUT', 'counter', (),
+                 lambda: {(): db.timeouts})
+metrics.callback('teamhub_upstream_pool_connections', 'HTTP connections to Supabase', 'gauge', ('state',),
+                 lambda: {(state,): pool_stats(http_client)[state] for state in ('active', 'idle')})
+metrics.callback('teamhub_upstream_breaker_open', 'Whether the Supabase circuit breaker is open (1), half open (0.5) or closed (0)',
+                 'gauge', (), lambda: {(): {'open': 1, 'half_open': 0.5}.get(db.breaker.state, 0) if db.breaker else 0})
+metrics.callback('teamhub_upstream_breaker_rejected_total', 'Supabase calls rejected by the open circuit breaker', 'counter', (),
+                 lambda: {(): db.breaker.rejected if db.breaker else 0})
+metrics.callback('teamhub_feed_stale_served_total', 'Feed responses served stale because Supabase failed', 'counter', (),
+                 lambda: {(): feed_cache.stale_served})
+metrics.callback('teamhub_coalesced_insert_batches_total', 'Bulk inserts sent by the announcement write coalescer', 'counter', (),
+                 lambda: {(): announcement_writer.batches if announcement_writer else 0})
+metrics.callback('teamhub_coalesced_insert_rows_total', 'Announcements inserted through the write coalescer', 'counter', (),
+                 lambda: {(): announcement_writer.rows if announcement_writer else 0})
+metrics.callback('teamhub_compression_bytes_total', 'Response bytes before and after compression by the middleware', 'counter',
+                 ('stage',), lambda: {('in',): compression_stats.bytes_in, ('out',): compression_stats.bytes_out})
+metrics.callback('teamhub_feed_variant_lookups_total', 'Precompressed feed body lookups', 'counter', ('result',),
+                 lambda: {('hit',): feed_variants.hits, ('miss',): feed_variants.misses})
+metrics.callback('teamhub_announcement_stats_corrections_total',
+                 'Announcements the stats reconciliation found miscounted', 'counter', (),
+                 lambda: {(): announcement_stats.corrections})
+metrics.callback('teamhub_worker_bus_messages_total', 'Cross-worker change messages', 'counter', ('direction',),
+                 lambda: {(direction,): count for direction, count in worker_bus.stats().items()}
+                 if worker_bus else {})
+metrics.callback('teamhub_rate_limit_buckets', 'Live rate limiter buckets', 'gauge', ('route', 'key'),
+                 lambda: {key: len(limiter) for key, limiter in rate_limiters.items()})
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -65,16 +358,83 @@ class AnnouncementResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class AnnouncementPage(BaseModel):
+    items: List[AnnouncementResponse]
+    next_cursor: Optional[str] = None
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+    # Only filled in when asked for with `?count=`
+    total: Optional[int] = None
+
+announcement_page_adapter = TypeAdapter(AnnouncementPage)
+announcement_list_adapter = TypeAdapter(List[AnnouncementResponse])
+
+# Opt-in: encode list responses straight from the upstream rows instead of
+# validating them into the models above first. The documented schema is unchanged.
+FAST_SERIALIZATION = os.environ.get('FAST_SERIALIZATION', 'false').lower() == 'true'
+ANNOUNCEMENT_FIELDS = serialization.model_fields(AnnouncementResponse)
+USER_FIELDS = serialization.model_fields(UserResponse)
+ANNOUNCEMENT_SELECT = ', '.join(ANNOUNCEMENT_FIELDS)
+
+# `?preview=true` cuts `content` to this many characters for list views
+PREVIEW_LENGTH = int(os.environ.get('PREVIEW_LENGTH', '280'))
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validate a `fields=` list against the announcement schema; requested order, no duplicates"""
+    if fields is None:
+        return None
+    requested = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = set(requested).difference(ANNOUNCEMENT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+def preview_rows(rows: List[dict]) -> List[dict]:
+    """Copies of ``rows`` with `content` cut to PREVIEW_LENGTH and a `truncated` flag"""
+    previews = []
+    for row in rows:
+        content = row.get('content')
+        truncated = content is not None and len(content) > PREVIEW_LENGTH
+        previews.append({**row, 'content': content[:PREVIEW_LENGTH] if truncated else content, 'truncated': truncated})
+    return previews
+
 class RoleUpdate(BaseModel):
     role: str = Field(pattern="^(admin|user)$")
 
+# Bulk operations: the whole batch is validated before anything is written. Writes
+# go out in chunks that commit independently; if some fail, the rest stand and
+# each item's status says which happened.
+MAX_BULK_ITEMS = int(os.environ.get('MAX_BULK_ITEMS', '5000'))
+
+class BulkAnnouncementCreate(BaseModel):
+    items: List[AnnouncementCreate] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkAnnouncementDelete(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkRoleUpdateItem(BaseModel):
+    user_id: str
+    role: str = Field(pattern="^(admin|user)$")
+
+class BulkRoleUpdate(BaseModel):
+    updates: List[BulkRoleUpdateItem] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
 # Helper functions
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+async def hash_password(password: str) -> str:
+    try:
+        return await password_pool.hash(password)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    try:
+        return await password_pool.verify(password, hashed)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 
 def create_jwt_token(user_data: dict) -> str:
     return jwt.encode(user_data, jwt_secret, algorithm="HS256")
@@ -90,38 +450,210 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     token = credentials.credentials
     user_data = verify_jwt_token(token)
     
+    user = user_cache.get(user_data['id'])
+    if user is not None:
+        return user
+    
+    # Read before loading so a role change made meanwhile discards this load
+    generation = user_cache.generation(user_data['id'])
     # Fetch user from database to get latest info
-    result = supabase.table('users').select('*').eq('id', user_data['id']).execute()
-    if not result.data:
+    user = await user_repo.get_by_id(user_data['id'])
+    if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
-    return result.data[0]
+    user_cache.set(user['id'], user, generation)
+    return user
 
 async def get_admin_user(current_user: dict = Depends(get_current_user)):
     if current_user['role'] != 'admin':
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get('x-forwarded-for')
+        if forwarded:
+            # The last hop is the one our proxy appended; earlier ones are client-supplied
+            return forwarded.rsplit(',', 1)[-1].strip()
+    return request.client.host if request.client else 'unknown'
+
+def enforce_rate_limit(route: str, request: Request, email: str) -> None:
+    """Raise 429 if this client IP or target email is over its budget for ``route``"""
+    if not RATE_LIMIT_ENABLED:
+        return
+    ip = client_ip(request)
+    for kind, key in (('ip', ip), ('email', email.strip().lower())):
+        allowed, retry_after = rate_limiters[(route, kind)].hit(key)
+        if not allowed:
+            logger.warning(f"Rate limited {route} by {kind} for client {ip}, retry in {retry_after:.1f}s")
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
 # Initialize database tables
 async def init_db():
     """Initialize database tables if they don't exist"""
     try:
         # Create users table
-        supabase.table('users').select('id').limit(1).execute()
+        await user_repo.ping()
     except Exception as e:
         logger.info("Database tables might need to be created manually in Supabase dashboard")
 
+async def build_search_index():
+    """Load every announcement into the in-process search index"""
+    global search_index_backlog
+    async with search_index_lock:
+        search_index_backlog = []
+        try:
+            rows = []
+            fetch_page = lambda limit, after: announcement_repo.list_page(limit, after, ANNOUNCEMENT_SELECT)
+            async for page in iter_pages(fetch_page, SEARCH_INDEX_PAGE_SIZE):
+                rows.extend(page)
+            search_index.rebuild(rows)
+            # Changes made while the table was being read may be missing from it
+            for indexed, removed in search_index_backlog:
+                _index_announcements(indexed, removed)
+            logger.info(f"Search index built with {len(search_index)} announcements")
+        except Exception as e:
+            # The index keeps its previous contents until a build succeeds
+            logger.error(f"Search index build error: {str(e)}")
+        finally:
+            search_index_backlog = None
+
+async def run_search_index_rebuilds():
+    """Retry a failed startup build, then rebuild every SEARCH_INDEX_REBUILD_INTERVAL seconds"""
+    if warm_up_task is not None:
+        await asyncio.shield(warm_up_task)
+    while SEARCH_INDEX_REBUILD_INTERVAL > 0 or not search_index.built:
+        # Until a build succeeds, retry as often as the health probe runs
+        await asyncio.sleep(SEARCH_INDEX_REBUILD_INTERVAL if search_index.built else HEALTH_PROBE_INTERVAL)
+        await build_search_index()
+
+async def connect_upstream():
+    """Build the Supabase client off the event loop (it imports httpx and postgrest)"""
+    if isinstance(db.client, LazyClient):
+        await asyncio.get_running_loop().run_in_executor(None, db.client.connect)
+
+async def warm_up():
+    """Connect to Supabase and build the search index without holding up startup"""
+    await connect_upstream()
+    await init_db()
+    await build_search_index()
+
+async def build_announcement_stats():
+    """First count of the announcement stats, run beside the search index build"""
+    await connect_upstream()
+    await reconcile_announcement_stats()
+
+async def run_health_probe():
+    """Ping Supabase every HEALTH_PROBE_INTERVAL seconds and record the outcome"""
+    await connect_upstream()
+    while True:
+        started = time.perf_counter()
+        try:
+            await user_repo.ping()
+            health_probe.update(database="connected", error=None)
+        except Exception as e:
+            health_probe.update(database="disconnected", error=str(e))
+        health_probe.update(checked_at=datetime.utcnow().isoformat() + 'Z',
+                            latency_ms=round((time.perf_counter() - started) * 1000, 1))
+        await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+
+async def reconcile_announcement_stats():
+    """Recount announcements from a paged scan and replace the incremental counts"""
+    async with stats_rebuild_lock:
+        announcement_stats.begin_rebuild()
+        rows = []
+        try:
+            fetch_page = lambda limit, after: announcement_repo.list_page(limit, after, STATS_COLUMNS)
+            async for page in iter_pages(fetch_page, STATS_PAGE_SIZE):
+                rows.extend(page)
+        except Exception as e:
+            announcement_stats.abort_rebuild()
+            logger.error(f"Announcement stats reconciliation error: {str(e)}")
+            return
+        corrections = announcement_stats.finish_rebuild(rows)
+    if corrections:
+        logger.warning(f"Announcement stats reconciliation corrected {corrections} announcements")
+
+async def run_stats_reconciliation():
+    """Reconcile the announcement stats every STATS_RECONCILE_INTERVAL seconds"""
+    if stats_build_task is not None:
+        await asyncio.shield(stats_build_task)
+    while True:
+        # Until a first count succeeds, retry as often as the health probe runs
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL if announcement_stats.built else HEALTH_PROBE_INTERVAL)
+        await reconcile_announcement_stats()
+
+# Announcement writes: invalidate the feed cache (every worker sees the shared
+# generation), update this worker's search index and streams, then tell the
+# other workers over the bus so they update theirs.
+def announcement_changed(event: str, data: dict, indexed: List[dict] = (), removed: List[str] = ()) -> None:
+    feed_cache.invalidate()
+    _apply_announcement_change(event, data, indexed, removed)
+    if worker_bus is not None:
+        _share_announcement_change(event, data, indexed, removed)
+
+def _apply_announcement_change(event: Optional[str], data: Optional[dict], indexed, removed) -> None:
+    _index_announcements(indexed, removed)
+    # Updates arrive in `indexed` too; the stats only count ids they haven't seen
+    announcement_stats.apply(indexed, removed)
+    if search_index_backlog is not None:
+        search_index_backlog.append((indexed, removed))
+    if event is not None:
+        broadcaster.publish(event, data)
+
+def _index_announcements(indexed, removed) -> None:
+    for row in indexed:
+        search_index.add(row)
+    for announcement_id in removed:
+        search_index.remove(announcement_id)
+
+def _share_announcement_change(event: str, data: dict, indexed, removed) -> None:
+    if event in ("created", "updated"):
+        # The event data is the row itself
+        if not worker_bus.publish("announcements", {"event": event, "indexed": [data]}):
+            # Too large for one datagram; the other workers read it back
+            worker_bus.publish("announcements", {"event": event, "fetch": [data['id']]})
+        return
+    for chunk in chunked([row['id'] for row in indexed], 1000):
+        worker_bus.publish("announcements", {"fetch": chunk})
+    for chunk in chunked(list(removed), 1000):
+        worker_bus.publish("announcements", {"removed": chunk})
+    worker_bus.publish("announcements", {"event": event, "data": data})
+
+def _on_worker_announcements(message: dict) -> None:
+    """Apply a change made by another worker (runs on this worker's event loop)"""
+    if "fetch" in message:
+        asyncio.ensure_future(_fetch_worker_change(message))
+        return
+    indexed = message.get("indexed", [])
+    event = message.get("event")
+    data = message.get("data", indexed[0] if indexed else None)
+    _apply_announcement_change(event, data, indexed, message.get("removed", []))
+
+async def _fetch_worker_change(message: dict) -> None:
+    try:
+        rows = await announcement_repo.get_many(message["fetch"])
+    except Exception as e:
+        logger.error(f"Worker change fetch error: {str(e)}")
+        return
+    event = message.get("event")
+    _apply_announcement_change(event, rows[0] if event and rows else None, rows, [])
+
 # Authentication endpoints
 @api_router.post("/auth/signup", response_model=dict)
-async def signup(user: UserCreate):
+async def signup(user: UserCreate, request: Request):
     try:
-        # Check if user already exists
-        result = supabase.table('users').select('*').eq('email', user.email).execute()
-        if result.data:
+        enforce_rate_limit('signup', request, user.email)
+        
+        if known_emails.get(user.email):
             raise HTTPException(status_code=400, detail="User already exists")
         
-        # Hash password and create user
-        hashed_password = hash_password(user.password)
+        # Hash password and create user; the unique email constraint catches duplicates
+        hashed_password = await hash_password(user.password)
         user_data = {
             'id': str(uuid.uuid4()),
             'email': user.email,
@@ -131,9 +663,14 @@ async def signup(user: UserCreate):
             'updated_at': datetime.utcnow().isoformat()
         }
         
-        result = supabase.table('users').insert(user_data).execute()
-        if not result.data:
+        try:
+            created = await user_repo.create(user_data)
+        except DuplicateKeyError:
+            known_emails.set(user.email, True)
+            raise HTTPException(status_code=400, detail="User already exists")
+        if not created:
             raise HTTPException(status_code=500, detail="Failed to create user")
+        known_emails.set(user.email, True)
         
         # Create JWT token
         token_data = {
@@ -155,22 +692,25 @@ async def signup(user: UserCreate):
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Signup error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.post("/auth/signin", response_model=dict)
-async def signin(user: UserLogin):
+async def signin(user: UserLogin, request: Request):
     try:
+        enforce_rate_limit('signin', request, user.email)
+        
         # Find user by email
-        result = supabase.table('users').select('*').eq('email', user.email).execute()
-        if not result.data:
+        user_record = await user_repo.get_by_email(user.email, 'id, email, role, password_hash')
+        if not user_record:
             raise HTTPException(status_code=401, detail="Invalid credentials")
-        
-        user_record = result.data[0]
+        known_emails.set(user_record['email'], True)
         
         # Verify password
-        if not verify_password(user.password, user_record['password_hash']):
+        if not await verify_password(user.password, user_record['password_hash']):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
         # Create JWT token
@@ -193,6 +733,8 @@ async def signin(user: UserLogin):
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Signin error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -209,15 +751,183 @@ async def get_user_info(current_user: dict = Depends(get_current_user)):
     }
 
 # Announcement endpoints
-@api_router.get("/announcements", response_model=List[AnnouncementResponse])
-async def get_announcements():
+@api_router.get("/announcements", response_model=Union[AnnouncementPage, List[AnnouncementResponse]])
+async def get_announcements(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    unpaginated: bool = Query(False, alias="all", description="Return the full unpaginated list (legacy shape)"),
+    fields: Optional[str] = Query(None, description="Comma-separated announcement fields to return"),
+    preview: bool = Query(False, description=f"Cut content to {PREVIEW_LENGTH} characters and add a truncated flag"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     try:
-        result = supabase.table('announcements').select('*').order('created_at', desc=True).execute()
-        return result.data
+        selected = parse_fields(fields)
+        cache_key = (('all',) if unpaginated else (limit, cursor)) + (selected, preview)
+        cached = feed_cache.get(cache_key)
+        stale_age = None
+        if cached is None:
+            generation = feed_cache.generation
+            try:
+                body = await _load_announcements_feed(limit, cursor, unpaginated, selected, preview)
+                etag = feed_cache.put(cache_key, body, generation)
+            except HTTPException:
+                raise
+            except Exception as e:
+                # Supabase is failing or the breaker is open: serve the last good copy, marked stale
+                fallback = feed_cache.last_good(cache_key)
+                if fallback is None:
+                    raise
+                logger.warning(f"Serving stale announcements: {str(e)}")
+                body, etag, stale_age = fallback
+        else:
+            body, etag = cached
+        
+        encoding = None
+        if COMPRESSION_ENABLED and len(body) >= COMPRESSION_MIN_SIZE:
+            encoding = negotiate(accept_encoding)
+        # Each content-coding is its own representation with its own strong ETag
+        headers = {"ETag": etag_variant(etag, encoding) if encoding else etag, "Cache-Control": "no-cache"}
+        if stale_age is not None:
+            headers["Warning"] = '110 - "Response is Stale"'
+            headers["Age"] = str(int(stale_age))
+        if COMPRESSION_ENABLED:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(if_none_match, etag):
+            feed_cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            # Compressed once per content version (ETag), not per request
+            body = await feed_variants.get(etag, encoding, body)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable",
+                            headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         logger.error(f"Get announcements error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch announcements")
 
+@api_router.get("/announcements/search", response_model=List[AnnouncementResponse])
+async def search_announcements(q: str = Query(..., min_length=1, max_length=200), limit: int = Query(20, ge=1, le=100)):
+    if warm_up_task is not None and not warm_up_task.done():
+        await asyncio.shield(warm_up_task)
+    return search_index.search(q, limit)
+
+@api_router.get("/announcements/stream")
+async def stream_announcements():
+    """Server-Sent Events: `created` and `updated` carry the announcement and
+    `deleted` its id; the bulk endpoints send one `bulk` event instead, with data
+    `{"action": "created" | "deleted", "count": n}`, after which clients refetch."""
+    try:
+        subscriber = broadcaster.subscribe()
+    except BroadcasterFull:
+        raise HTTPException(status_code=503, detail="Too many open streams", headers={"Retry-After": "5"})
+    
+    return StreamingResponse(
+        _announcement_events(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _announcement_events(subscriber):
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscriber.queue.get(), STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if frame is None:
+                # Dropped for falling behind, or shutting down
+                break
+            yield frame
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+@api_router.get("/announcements/stats", response_model=dict)
+async def get_announcement_stats(
+    days: int = Query(30, ge=1, le=366, description="Days of per-day counts, ending today (UTC)"),
+    authors: int = Query(20, ge=1, le=1000, description="Most prolific authors to list"),
+    current_user: dict = Depends(get_current_user),
+):
+    """Announcement counts in total, per author and per day, from in-memory counters"""
+    if stats_build_task is not None and not stats_build_task.done():
+        await asyncio.shield(stats_build_task)
+    if not announcement_stats.built:
+        raise HTTPException(status_code=503, detail="Announcement statistics are not available yet",
+                            headers={"Retry-After": str(math.ceil(HEALTH_PROBE_INTERVAL))})
+    return announcement_stats.summary(days, authors)
+
+@api_router.get("/announcements/{announcement_id}", response_model=AnnouncementResponse)
+async def get_announcement(
+    announcement_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated announcement fields to return"),
+):
+    """One announcement with its full content, e.g. after a `?preview=true` list"""
+    try:
+        selected = parse_fields(fields)
+        row = await announcement_repo.get(announcement_id, ', '.join(selected or ANNOUNCEMENT_FIELDS))
+        if not row:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        if selected is not None:
+            return Response(content=serialization.dumps(serialization.project([row], selected)[0]),
+                            media_type="application/json")
+        return row
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable",
+                            headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except Exception as e:
+        logger.error(f"Get announcement error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch announcement")
+
+async def _load_announcements_feed(limit: int, cursor: Optional[str], unpaginated: bool,
+                                   fields: Optional[Tuple[str, ...]] = None, preview: bool = False) -> bytes:
+    # Sparse and preview responses don't match the response models, so they
+    # are always encoded straight from the rows
+    projected = fields is not None or preview
+    fields = fields or ANNOUNCEMENT_FIELDS
+    if preview and 'content' in fields:
+        output = fields + ('truncated',)
+    else:
+        output = fields
+        preview = False
+    
+    if unpaginated:
+        rows = await announcement_repo.list_all(', '.join(fields))
+        if preview:
+            rows = preview_rows(rows)
+        if FAST_SERIALIZATION or projected:
+            return serialization.dump_rows(rows, output)
+        return announcement_list_adapter.dump_json(announcement_list_adapter.validate_python(rows))
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    # Fetch one extra row to learn whether another page exists; the cursor
+    # needs created_at and id whether or not they were asked for
+    columns = ', '.join(name for name in ANNOUNCEMENT_FIELDS if name in fields or name in ('id', 'created_at'))
+    rows = await announcement_repo.list_page(limit + 1, after, columns)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    if preview:
+        rows = preview_rows(rows)
+    if FAST_SERIALIZATION or projected:
+        return serialization.dump_page(rows, output, next_cursor)
+    page = announcement_page_adapter.validate_python({"items": rows, "next_cursor": next_cursor})
+    return announcement_page_adapter.dump_json(page)
+
 @api_router.post("/announcements", response_model=AnnouncementResponse)
 async def create_announcement(announcement: AnnouncementCreate, current_user: dict = Depends(get_current_user)):
     try:
@@ -231,47 +941,56 @@ async def create_announcement(announcement: AnnouncementCreate, current_user: di
             'updated_at': datetime.utcnow().isoformat()
         }
         
-        result = supabase.table('announcements').insert(announcement_data).execute()
-        if not result.data:
+        if announcement_writer is not None:
+            created = await announcement_writer.submit(announcement_data)
+        else:
+            created = await announcement_repo.create(announcement_data)
+        if not created:
             raise HTTPException(status_code=500, detail="Failed to create announcement")
         
-        return result.data[0]
+        announcement_changed("created", created, indexed=[created])
+        return created
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Create announcement error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _owner_filter(current_user: dict) -> Optional[str]:
+    """Author id that writes must match, or None for admins."""
+    return None if current_user['role'] == 'admin' else current_user['id']
+
+async def _raise_missing_or_forbidden(announcement_id: str):
+    """Explain a conditional write that matched nothing: 404 or 403."""
+    if await announcement_repo.get(announcement_id, 'id'):
+        raise HTTPException(status_code=403, detail="Permission denied")
+    raise HTTPException(status_code=404, detail="Announcement not found")
+
 @api_router.put("/announcements/{announcement_id}", response_model=AnnouncementResponse)
 async def update_announcement(announcement_id: str, announcement: AnnouncementUpdate, current_user: dict = Depends(get_current_user)):
     try:
-        # Get existing announcement
-        result = supabase.table('announcements').select('*').eq('id', announcement_id).execute()
-        if not result.data:
-            raise HTTPException(status_code=404, detail="Announcement not found")
-        
-        existing = result.data[0]
-        
-        # Check permissions (owner or admin)
-        if existing['author_id'] != current_user['id'] and current_user['role'] != 'admin':
-            raise HTTPException(status_code=403, detail="Permission denied")
-        
-        # Update announcement
         update_data = {
             'title': announcement.title,
             'content': announcement.content,
             'updated_at': datetime.utcnow().isoformat()
         }
         
-        result = supabase.table('announcements').update(update_data).eq('id', announcement_id).execute()
-        if not result.data:
-            raise HTTPException(status_code=500, detail="Failed to update announcement")
+        # Ownership is part of the write filter (owner or admin), so the common
+        # case is a single round trip
+        updated = await announcement_repo.update(announcement_id, update_data, author_id=_owner_filter(current_user))
+        if not updated:
+            await _raise_missing_or_forbidden(announcement_id)
         
-        return result.data[0]
+        announcement_changed("updated", updated, indexed=[updated])
+        return updated
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Update announcement error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -279,34 +998,155 @@ async def update_announcement(announcement_id: str, announcement: AnnouncementUp
 @api_router.delete("/announcements/{announcement_id}")
 async def delete_announcement(announcement_id: str, current_user: dict = Depends(get_current_user)):
     try:
-        # Get existing announcement
-        result = supabase.table('announcements').select('*').eq('id', announcement_id).execute()
-        if not result.data:
-            raise HTTPException(status_code=404, detail="Announcement not found")
-        
-        existing = result.data[0]
-        
-        # Check permissions (owner or admin)
-        if existing['author_id'] != current_user['id'] and current_user['role'] != 'admin':
-            raise HTTPException(status_code=403, detail="Permission denied")
+        deleted = await announcement_repo.delete(announcement_id, author_id=_owner_filter(current_user))
+        if not deleted:
+            await _raise_missing_or_forbidden(announcement_id)
         
-        # Delete announcement
-        result = supabase.table('announcements').delete().eq('id', announcement_id).execute()
+        announcement_changed("deleted", {"id": announcement_id}, removed=[announcement_id])
         
         return {"success": True, "message": "Announcement deleted successfully"}
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Delete announcement error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@api_router.post("/announcements/bulk", response_model=dict)
+async def bulk_create_announcements(batch: BulkAnnouncementCreate, current_user: dict = Depends(get_current_user)):
+    try:
+        now = datetime.utcnow().isoformat()
+        rows = [
+            {
+                'id': str(uuid.uuid4()),
+                'title': item.title,
+                'content': item.content,
+                'author_id': current_user['id'],
+                'author_email': current_user['email'],
+                'created_at': now,
+                'updated_at': now
+            }
+            for item in batch.items
+        ]
+        
+        try:
+            written = await announcement_repo.create_many(rows)
+        except BulkWriteError as e:
+            logger.error(f"Bulk create announcements partly failed: {str(e)}")
+            written = e.rows
+        created = {row['id']: row for row in written}
+        if created:
+            announcement_changed("bulk", {"action": "created", "count": len(created)}, indexed=list(created.values()))
+        
+        results = [
+            {"index": i, "id": row['id'], "status": "created" if row['id'] in created else "failed"}
+            for i, row in enumerate(rows)
+        ]
+        return {"success": len(created) == len(rows), "created": len(created), "results": results}
+        
+    except HTTPException:
+        raise
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk create announcements error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.post("/announcements/bulk-delete", response_model=dict)
+async def bulk_delete_announcements(batch: BulkAnnouncementDelete, current_user: dict = Depends(get_current_user)):
+    try:
+        ids = list(dict.fromkeys(batch.ids))
+        existing = {row['id']: row for row in await announcement_repo.get_many(ids, 'id, author_id')}
+        
+        # Check permissions (owner or admin) for the whole batch in memory
+        is_admin = current_user['role'] == 'admin'
+        statuses = {}
+        allowed = []
+        for announcement_id in ids:
+            row = existing.get(announcement_id)
+            if row is None:
+                statuses[announcement_id] = "not_found"
+            elif not is_admin and row['author_id'] != current_user['id']:
+                statuses[announcement_id] = "forbidden"
+            else:
+                allowed.append(announcement_id)
+        
+        failed = set()
+        try:
+            deleted_rows = await announcement_repo.delete_many(allowed) if allowed else []
+        except BulkWriteError as e:
+            logger.error(f"Bulk delete announcements partly failed: {str(e)}")
+            deleted_rows, failed = e.rows, set(e.failed)
+        deleted = {row['id'] for row in deleted_rows}
+        for announcement_id in allowed:
+            if announcement_id in deleted:
+                statuses[announcement_id] = "deleted"
+            else:
+                statuses[announcement_id] = "failed" if announcement_id in failed else "not_found"
+        if deleted:
+            announcement_changed("bulk", {"action": "deleted", "count": len(deleted)}, removed=list(deleted))
+        
+        results = [{"id": announcement_id, "status": statuses[announcement_id]} for announcement_id in ids]
+        return {"success": len(deleted) == len(ids), "deleted": len(deleted), "results": results}
+        
+    except HTTPException:
+        raise
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk delete announcements error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 # Admin endpoints
-@api_router.get("/admin/users", response_model=List[UserResponse])
-async def get_all_users(current_user: dict = Depends(get_admin_user)):
+@api_router.get("/admin/users", response_model=Union[UserPage, List[UserResponse]])
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    role: Optional[str] = Query(None, pattern="^(admin|user)$"),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=254, pattern=r"^[^*]+$"),
+    count: Optional[str] = Query(None, pattern="^(exact|planned|estimated)$",
+                                 description="Include the number of matching users as `total`"),
+    unpaginated: bool = Query(False, alias="all", description="Return the full unpaginated list (legacy shape)"),
+    current_user: dict = Depends(get_admin_user),
+):
     try:
-        result = supabase.table('users').select('id, email, role, created_at').order('created_at', desc=True).execute()
-        return result.data
+        if unpaginated:
+            users = await user_repo.list_all(role, email_prefix)
+            if FAST_SERIALIZATION:
+                # Returning a Response bypasses response_model validation
+                return Response(content=serialization.dump_rows(users, USER_FIELDS), media_type="application/json")
+            return users
+        
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        # Fetch one extra row to learn whether another page exists
+        page = user_repo.list_page(limit + 1, after, role=role, email_prefix=email_prefix)
+        if count:
+            users, total = await asyncio.gather(page, user_repo.count(role, email_prefix, count))
+        else:
+            users, total = await page, None
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1]['created_at'], users[-1]['id'])
+        if FAST_SERIALIZATION:
+            return Response(content=serialization.dumps({
+                "items": serialization.project(users, USER_FIELDS),
+                "next_cursor": next_cursor,
+                "total": total,
+            }), media_type="application/json")
+        return {"items": users, "next_cursor": next_cursor, "total": total}
+    except HTTPException:
+        raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Get users error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch users")
@@ -315,8 +1155,7 @@ async def get_all_users(current_user: dict = Depends(get_admin_user)):
 async def update_user_role(user_id: str, role_update: RoleUpdate, current_user: dict = Depends(get_admin_user)):
     try:
         # Check if user exists
-        result = supabase.table('users').select('*').eq('id', user_id).execute()
-        if not result.data:
+        if not await user_repo.get_by_id(user_id, 'id'):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Update role
@@ -325,26 +1164,129 @@ async def update_user_role(user_id: str, role_update: RoleUpdate, current_user:
             'updated_at': datetime.utcnow().isoformat()
         }
         
-        result = supabase.table('users').update(update_data).eq('id', user_id).execute()
-        if not result.data:
+        try:
+            updated = await user_repo.update(user_id, update_data)
+        finally:
+            # A call that failed may still have committed
+            user_cache.pop(user_id)
+        if not updated:
             raise HTTPException(status_code=500, detail="Failed to update user role")
         
         return {
             "success": True,
             "message": "User role updated successfully",
             "user": {
-                "id": result.data[0]['id'],
-                "email": result.data[0]['email'],
-                "role": result.data[0]['role']
+                "id": updated['id'],
+                "email": updated['email'],
+                "role": updated['role']
             }
         }
         
     except HTTPException:
         raise
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Update user role error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@api_router.put("/admin/users/roles", response_model=dict)
+async def bulk_update_user_roles(batch: BulkRoleUpdate, current_user: dict = Depends(get_admin_user)):
+    try:
+        # Last entry wins for repeated user ids; one upstream update per target role
+        targets = {item.user_id: item.role for item in batch.updates}
+        by_role = {}
+        for user_id, role in targets.items():
+            by_role.setdefault(role, []).append(user_id)
+        
+        # Evict before writing as well: chunks commit one by one, and a user must
+        # not keep a cached role that has already changed in the database
+        for user_id in targets:
+            user_cache.pop(user_id)
+        now = datetime.utcnow().isoformat()
+        updated = {}
+        failed = set()
+        errors = []
+        try:
+            for role, user_ids in by_role.items():
+                try:
+                    rows = await user_repo.update_many(user_ids, {'role': role, 'updated_at': now})
+                except BulkWriteError as e:
+                    rows = e.rows
+                    failed.update(e.failed)
+                    errors.append(e)
+                except Exception as e:
+                    rows = []
+                    failed.update(user_ids)
+                    errors.append(e)
+                for row in rows:
+                    updated[row['id']] = row
+        finally:
+            for user_id in targets:
+                user_cache.pop(user_id)
+        if errors:
+            # Nothing was written: fail the request as a whole
+            if not updated:
+                raise errors[0]
+            logger.error(f"Bulk update user roles partly failed: {str(errors[0])}")
+        
+        results = []
+        for user_id in targets:
+            row = updated.get(user_id)
+            if row is None:
+                results.append({"user_id": user_id, "status": "failed" if user_id in failed else "not_found"})
+            else:
+                results.append({"user_id": user_id, "status": "updated", "email": row['email'], "role": row['role']})
+        return {"success": len(updated) == len(targets), "updated": len(updated), "results": results}
+        
+    except HTTPException:
+        raise
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk update user roles error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.get("/admin/cache-stats", response_model=dict)
+async def get_cache_stats(current_user: dict = Depends(get_admin_user)):
+    return {
+        "feed": feed_cache.stats(),
+        "users": user_cache.stats(),
+        "upstream": {**pool_stats(http_client), "in_flight": db.in_flight,
+                     "retries": db.retries, "timeouts": db.timeouts,
+                     "breaker": db.breaker.stats() if db.breaker is not None else None},
+        "write_coalescing": announcement_writer.stats() if announcement_writer is not None else None,
+        "announcement_stats": announcement_stats.stats(),
+        "compression": {**compression_stats.stats(), "feed_variants": feed_variants.stats()},
+    }
+
+def _export_response(name: str, fetch_page, columns, export_format: str) -> StreamingResponse:
+    async def body():
+        try:
+            pages = iter_pages(lambda limit, after: fetch_page(limit, after, ', '.join(columns)), EXPORT_PAGE_SIZE)
+            async for chunk in ENCODERS[export_format](pages, columns):
+                yield chunk
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated file
+            logger.error(f"Export {name} error: {str(e)}")
+            raise
+    
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.{export_format}"
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[export_format], headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+    })
+
+@api_router.get("/admin/export/announcements")
+async def export_announcements(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                               current_user: dict = Depends(get_admin_user)):
+    return _export_response("announcements", announcement_repo.list_page, ANNOUNCEMENT_COLUMNS, export_format)
+
+@api_router.get("/admin/export/users")
+async def export_users(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                       current_user: dict = Depends(get_admin_user)):
+    return _export_response("users", user_repo.list_page, USER_COLUMNS, export_format)
+
 # Health check endpoint
 @api_router.get("/")
 async def root():
@@ -352,16 +1294,41 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
-    try:
-        # Test database connection
-        supabase.table('users').select('id').limit(1).execute()
-        return {"status": "healthy", "database": "connected"}
-    except Exception as e:
-        return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+    """Last background probe and circuit breaker state; does not call Supabase"""
+    breaker_state = db.breaker.state if db.breaker is not None else "disabled"
+    if health_probe["database"] == "unknown":
+        status_text = "starting"
+    elif health_probe["database"] == "disconnected" or breaker_state == "open":
+        status_text = "unhealthy"
+    elif breaker_state == "half_open":
+        status_text = "degraded"
+    else:
+        status_text = "healthy"
+    return {"status": status_text, **health_probe, "breaker": breaker_state}
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    # Handlers and dependencies such as get_current_user let it through to here
+    return JSONResponse(status_code=503, content={"detail": "Service temporarily unavailable"},
+                        headers={"Retry-After": str(math.ceil(exc.retry_after))})
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Added before the metrics middleware so request timings include compression
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_level=COMPRESSION_GZIP_LEVEL,
+                       brotli_quality=COMPRESSION_BROTLI_QUALITY, stats=compression_stats)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=http_metrics, routes=app.router.routes)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -379,10 +1346,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def start_worker_bus() -> None:
+    global worker_bus
+    if WORKER_SYNC_DIR and worker_bus is None:
+        worker_bus = WorkerBus(WORKER_SYNC_DIR)
+        worker_bus.subscribe("announcements", _on_worker_announcements)
+        worker_bus.start(asyncio.get_running_loop())
+        logger.info(f"Worker bus listening on {worker_bus.path}")
+
 @app.on_event("startup")
 async def startup_event():
+    global warm_up_task, search_index_task, health_probe_task, stats_build_task, stats_reconcile_task
     logger.info("Team Hub API starting up...")
-    await init_db()
+    start_worker_bus()
+    # Serve requests straight away; search waits for the index and the stats
+    # endpoint for the first count if they must, and neither for the other
+    warm_up_task = asyncio.ensure_future(warm_up())
+    search_index_task = asyncio.ensure_future(run_search_index_rebuilds())
+    stats_build_task = asyncio.ensure_future(build_announcement_stats())
+    health_probe_task = asyncio.ensure_future(run_health_probe())
+    if STATS_RECONCILE_INTERVAL > 0:
+        stats_reconcile_task = asyncio.ensure_future(run_stats_reconciliation())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global worker_bus
+    if worker_bus is not None:
+        worker_bus.close()
+        worker_bus = None
+    if health_probe_task is not None:
+        health_probe_task.cancel()
+    for task in (search_index_task, stats_build_task, stats_reconcile_task):
+        if task is not None:
+            task.cancel()
+    broadcaster.close()
+    password_pool.shutdown()
+    if announcement_writer is not None:
+        await announcement_writer.close()
+    db.close()
+    if http_client is not None:
+        http_client.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,127 @@
+"""
+Announcement counts per author, per day and in total, kept in memory.
+
+The write path reports every change (``apply``), so reading the counts never
+touches the database. Besides the three counters, each announcement's
+``(author_id, day)`` is remembered by id. That makes ``apply`` idempotent: an
+update or a change delivered twice (locally and again over the worker bus)
+is not counted again, and a delete knows what to decrement from the id alone.
+
+Anything that does slip past (a lost bus datagram, a row written by another
+tool) is corrected by a rebuild (``begin_rebuild``/``finish_rebuild``), which
+the server runs periodically from a paged scan. Changes applied while the
+scan is running are replayed on top of its result, so the scan can't undo
+them. The caller runs one rebuild at a time.
+
+Days are UTC calendar days taken from ``created_at``.
+
+All methods must be called from the event loop thread.
+"""
+
+import heapq
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Row = Dict[str, Any]
+
+
+class AnnouncementStats:
+    def __init__(self):
+        self.built = False
+        self.rebuilds = 0
+        self.corrections = 0
+        self.rebuilt_at: Optional[str] = None
+        self._posts: Dict[str, Tuple[str, str]] = {}
+        self._by_author: Counter = Counter()
+        self._by_day: Counter = Counter()
+        self._emails: Dict[str, str] = {}
+        self._backlog: Optional[List[Tuple[List[Row], List[str]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def apply(self, added: Iterable[Row] = (), removed: Iterable[str] = ()) -> None:
+        """Count new announcements in ``added`` and uncount the ids in ``removed``."""
+        added, removed = list(added), list(removed)
+        if self._backlog is not None:
+            self._backlog.append((added, removed))
+        for row in added:
+            self._add(row)
+        for announcement_id in removed:
+            self._remove(announcement_id)
+
+    def _add(self, row: Row) -> None:
+        if row['id'] in self._posts:
+            return
+        author, day = row.get('author_id') or '', str(row.get('created_at') or '')[:10]
+        self._posts[row['id']] = (author, day)
+        self._by_author[author] += 1
+        self._by_day[day] += 1
+        if row.get('author_email'):
+            self._emails[author] = row['author_email']
+
+    def _remove(self, announcement_id: str) -> None:
+        entry = self._posts.pop(announcement_id, None)
+        if entry is None:
+            return
+        author, day = entry
+        for counter, key in ((self._by_author, author), (self._by_day, day)):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+
+    def begin_rebuild(self) -> None:
+        """Start recording changes so ``finish_rebuild`` can replay them.
+        Rebuilds must not overlap: a second ``begin_rebuild`` would discard
+        the changes recorded for the first."""
+        self._backlog = []
+
+    def finish_rebuild(self, rows: Iterable[Row]) -> int:
+        """Replace the counts with ones computed from ``rows`` (every announcement,
+        as read since ``begin_rebuild``) and return how many announcements the
+        old counts had wrong."""
+        fresh = AnnouncementStats()
+        fresh.apply(rows)
+        for added, removed in self._backlog or ():
+            fresh.apply(added, removed)
+        self._backlog = None
+
+        corrections = len(self._posts.keys() ^ fresh._posts.keys()) if self.built else 0
+        self._posts, self._by_author, self._by_day = fresh._posts, fresh._by_author, fresh._by_day
+        self._emails = fresh._emails
+        self.built = True
+        self.rebuilds += 1
+        self.corrections += corrections
+        self.rebuilt_at = datetime.now(timezone.utc).isoformat()
+        return corrections
+
+    def abort_rebuild(self) -> None:
+        self._backlog = None
+
+    def summary(self, days: int = 30, authors: int = 20, today: Optional[date] = None) -> Dict[str, Any]:
+        """Total, the ``authors`` most prolific authors and one entry per day
+        for the last ``days`` days, newest first and including empty days."""
+        today = today or datetime.now(timezone.utc).date()
+        top = heapq.nlargest(authors, self._by_author.items(), key=lambda item: (item[1], item[0]))
+        recent = [(today - timedelta(days=offset)).isoformat() for offset in range(days)]
+        return {
+            "total": len(self._posts),
+            "authors": len(self._by_author),
+            "by_author": [{"author_id": author, "author_email": self._emails.get(author), "count": count}
+                          for author, count in top],
+            "by_day": [{"day": day, "count": self._by_day.get(day, 0)} for day in recent],
+            "reconciled_at": self.rebuilt_at,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.built,
+            "announcements": len(self._posts),
+            "authors": len(self._by_author),
+            "days": len(self._by_day),
+            "rebuilds": self.rebuilds,
+            "corrections": self.corrections,
+            "rebuilding": self._backlog is not None,
+            "rebuilt_at": self.rebuilt_at,
+        }
@@ -0,0 +1,120 @@
+"""
+HTTP transport for the Supabase client.
+
+The API only uses Supabase's REST (PostgREST) interface, so
+``create_rest_client`` builds postgrest's client directly rather than the full
+supabase-py client, which would also import the auth, storage, realtime and
+functions clients. It is handed one shared ``httpx.Client`` with an explicit
+connection pool, keep-alive, HTTP/2 when the ``h2`` package is installed, and
+per-phase timeouts. The pool is sized to match ``Database``'s thread pool, so
+each worker thread can hold a warm connection.
+
+httpx and postgrest are imported on first use, and ``LazyClient`` defers
+building the client until the first query, so importing the server stays
+cheap on a cold start.
+
+``is_transient`` classifies failures for ``repository.RetryPolicy``:
+transport errors, and gateway or PostgREST "database unavailable" responses.
+"""
+
+import asyncio
+import importlib.util
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+if TYPE_CHECKING:
+    import httpx
+    from postgrest import SyncPostgrestClient
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# HTTP statuses from gateways (non-JSON bodies surface as APIError.code == status)
+# and PostgREST codes for "could not connect to / lost the database"
+TRANSIENT_CODES = frozenset({
+    '408', '502', '503', '504', '520', '521', '522', '523', '524',
+    'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003',
+})
+
+
+def build_http_client(pool_size: int = 16, keepalive: int = 16, keepalive_expiry: float = 30.0,
+                      http2: bool = True, connect_timeout: float = 3.0, read_timeout: float = 10.0,
+                      pool_timeout: float = 5.0) -> "httpx.Client":
+    import httpx
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=pool_timeout),
+        http2=http2 and HTTP2_AVAILABLE,
+        follow_redirects=True,
+    )
+
+
+def create_rest_client(url: str, key: str, http_client: "httpx.Client") -> "SyncPostgrestClient":
+    """A PostgREST client for the project at ``url``, authenticated with the anon ``key``."""
+    from postgrest import SyncPostgrestClient
+    return SyncPostgrestClient(
+        f"{url.rstrip('/')}/rest/v1",
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+        },
+        http_client=http_client,
+    )
+
+
+class LazyClient:
+    """Stands in for the REST client and builds it with ``factory`` on first use."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None
+
+    def connect(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def table(self, name: str):
+        return self.connect().table(name)
+
+
+def is_transient(exc: BaseException) -> bool:
+    import httpx
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    return str(getattr(exc, 'code', None)) in TRANSIENT_CODES
+
+
+def is_outage(exc: BaseException) -> bool:
+    """Failures that say Supabase itself is unwell, for the circuit breaker."""
+    return isinstance(exc, asyncio.TimeoutError) or is_transient(exc)
+
+
+def pool_stats(http_client: "httpx.Client") -> Dict[str, Any]:
+    """Open and idle connections in ``http_client``'s pool.
+
+    httpx has no public pool API; this reads httpcore's ``ConnectionPool``
+    and reports zeros if the transport is something else (or not built yet).
+    """
+    pool = getattr(getattr(http_client, '_transport', None), '_pool', None)
+    connections = list(getattr(pool, 'connections', []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "max_connections": getattr(pool, '_max_connections', None),
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "http2": bool(getattr(pool, '_http2', False)),
+    }
@@ -277,8 +277,9 @@ def test_announcements_crud():
     response = make_request('GET', '/announcements', expected_status=200)
     if response:
         data = response.json()
-        if isinstance(data, list):
-            print_result(True, f"Get announcements successful - Found {len(data)} announcements")
+        # Paginated by default: {"items": [...], "next_cursor": ...}
+        if isinstance(data, dict) and isinstance(data.get("items"), list) and "next_cursor" in data:
+            print_result(True, f"Get announcements successful - Found {len(data['items'])} announcements on the first page")
         else:
             print_result(False, "Get announcements returned invalid format", data)
     else:
@@ -347,8 +348,9 @@ def test_admin_endpoints():
     
     if response:
         data = response.json()
-        if isinstance(data, list) and len(data) >= 2:  # Should have at least admin and regular user
-            print_result(True, f"Get all users successful - Found {len(data)} users")
+        items = data.get("items") if isinstance(data, dict) else None
+        if isinstance(items, list) and len(items) >= 2:  # Should have at least admin and regular user
+            print_result(True, f"Get all users successful - Found {len(items)} users on the first page")
         else:
             print_result(False, "Get all users failed or insufficient data", data)
     else:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Per-request inserts vs WRITE_COALESCING for POST /api/announcements.
+
+``--concurrency`` clients post ``--requests`` announcements in total through
+the ASGI app. The in-memory Supabase stand-in sleeps ``--db-latency``
+seconds per call, standing in for the PostgREST round trip. The run is
+repeated with the write coalescer off and on, and each run reports
+throughput, p50/p95/p99 latency and the number of insert calls that reached
+the database.
+
+    python benchmarks/coalescing_bench.py --requests 2000 --concurrency 100 --db-latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+from memory_backend import InMemoryClient  # noqa: E402
+
+AUTHOR_ID = '00000000-0000-0000-0000-000000000000'
+
+
+async def post_all(headers: dict, requests: int, concurrency: int) -> dict:
+    latencies, failures = [], 0
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal failures
+            for i in remaining:
+                started = time.perf_counter()
+                response = await client.post("/api/announcements", headers=headers,
+                                             json={"title": f"Incident update {i}", "content": "Status: investigating"})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "failures": failures,
+    }
+
+
+def run(coalescing: bool, args) -> dict:
+    client = InMemoryClient(latency=args.db_latency)
+    client.tables['users'].append({
+        'id': AUTHOR_ID, 'email': 'bot@bench.local', 'password_hash': 'x', 'role': 'admin',
+        'created_at': '2024-01-01T00:00:00+00:00', 'updated_at': '2024-01-01T00:00:00+00:00',
+    })
+    server.WRITE_COALESCING_ENABLED = coalescing
+    server.WRITE_COALESCING_MAX_DELAY_MS = args.max_delay_ms
+    server.WRITE_COALESCING_MAX_BATCH = args.max_batch
+    server.init_repositories(client, max_workers=args.max_workers)
+    inserts = []
+    server.db.observer = lambda table, operation, seconds, failed: inserts.append(1) if operation == 'insert' else None
+
+    token = server.create_jwt_token({'id': AUTHOR_ID, 'email': 'bot@bench.local', 'role': 'admin'})
+    result = asyncio.run(post_all({"Authorization": f"Bearer {token}"}, args.requests, args.concurrency))
+    result["insert_calls"] = len(inserts)
+    result["rows_stored"] = len(client.tables['announcements'])
+    if server.announcement_writer is not None:
+        result["average_batch"] = round(server.announcement_writer.stats()["average_batch"], 1)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--db-latency", type=float, default=0.02, help="seconds per Supabase call")
+    parser.add_argument("--max-workers", type=int, default=16, help="Supabase thread pool size")
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "db_latency_ms": args.db_latency * 1000,
+        "max_delay_ms": args.max_delay_ms,
+        "max_batch": args.max_batch,
+        "per_request_insert": run(False, args),
+        "coalesced": run(True, args),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cold start report: import time of ``backend/server.py`` and first-request latency.
+
+Import time is the cumulative ``server`` entry of ``python -X importtime``
+(best of ``--repeat`` fresh interpreters), with the heaviest top-level imports
+listed. First-request latency starts a uvicorn process against a local
+PostgREST stand-in and measures time until the process answers ``GET /api/``
+and then ``GET /api/announcements`` (the first request that needs Supabase).
+
+The run fails if a module the API should not load at import time shows up
+(``--forbid``), or if a ``--max-*`` budget is exceeded:
+
+    python benchmarks/cold_start.py --max-import-ms 800 --max-first-request-ms 3000
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+# Heavy packages the API must not pull in when ``server`` is imported
+FORBIDDEN = ("supabase", "supabase_auth", "realtime", "storage3", "postgrest", "httpx",
+             "pandas", "numpy", "boto3", "pymongo", "motor")
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+class EmptyTables(BaseHTTPRequestHandler):
+    """Answers every PostgREST read with an empty result."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Range", "*/0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+def environment(**extra) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR), **extra)
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_ANON_KEY", "cold-start")
+    env.setdefault("JWT_SECRET", "cold-start")
+    return env
+
+
+def import_profile(code: str = "import sys, server; print('\\n'.join(sorted(sys.modules)))") -> dict:
+    """One fresh interpreter: ``server`` import time, top-level imports and loaded modules."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR,
+                            env=environment(), capture_output=True, text=True, check=True)
+    top_level, total_us = {}, None
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if name == "server":
+            total_us = int(cumulative)
+        elif len(indent) == 3:
+            top_level[name] = int(cumulative)
+    return {"total_us": total_us, "top_level": top_level, "modules": set(result.stdout.split())}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_request(upstream_url: str, timeout: float = 60.0) -> dict:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=environment(SUPABASE_URL=upstream_url, WORKER_SYNC_DIR=""),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            while True:
+                try:
+                    if client.get("/api/").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.005)
+            ready = time.perf_counter()
+            client.get("/api/announcements").raise_for_status()
+            done = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {
+        "ready_ms": round((ready - started) * 1000, 1),
+        "first_feed_request_ms": round((done - ready) * 1000, 1),
+        "first_feed_from_spawn_ms": round((done - started) * 1000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="best of N for import time and first request")
+    parser.add_argument("--top", type=int, default=10, help="top-level imports to list")
+    parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN))
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail above this import time")
+    parser.add_argument("--max-first-request-ms", type=float, default=None,
+                        help="fail above this spawn-to-first-feed time")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.repeat)]
+    best = min(profiles, key=lambda profile: profile["total_us"])
+    loaded = sorted(name for name in args.forbid if name in best["modules"])
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), EmptyTables)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    try:
+        runs = [first_request(f"http://127.0.0.1:{upstream.server_address[1]}") for _ in range(args.repeat)]
+    finally:
+        upstream.shutdown()
+    fastest = min(runs, key=lambda run: run["first_feed_from_spawn_ms"])
+
+    # Leave out what the interpreter imports before running any code (site, .pth files)
+    startup = import_profile("pass")["top_level"]
+    heaviest = sorted(((name, us) for name, us in best["top_level"].items() if name not in startup),
+                      key=lambda item: item[1], reverse=True)[:args.top]
+    print(json.dumps({
+        "import_ms": round(best["total_us"] / 1000, 1),
+        "heaviest_imports_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+        "forbidden_imported": loaded,
+        **fastest,
+    }, indent=2))
+
+    failed = False
+    if loaded:
+        print(f"FAIL: importing server loads {', '.join(loaded)}")
+        failed = True
+    if args.max_import_ms is not None and best["total_us"] / 1000 > args.max_import_ms:
+        print(f"FAIL: import time {best['total_us'] / 1000:.1f}ms > {args.max_import_ms}ms")
+        failed = True
+    if args.max_first_request_ms is not None and fastest["first_feed_from_spawn_ms"] > args.max_first_request_ms:
+        print(f"FAIL: first request after {fastest['first_feed_from_spawn_ms']}ms > {args.max_first_request_ms}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
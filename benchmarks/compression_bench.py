@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Bytes on the wire and CPU per request, with and without response compression.
+
+Calls the ASGI app directly, so byte counts are exactly what the app sends
+before any proxy gets involved. Each endpoint is requested ``--repeat`` times
+per ``Accept-Encoding`` value and the process CPU time is averaged.
+
+- the feed (first page, 100-row page, ``?all=true``) in three variants:
+  identity, compressed per request (variant cache disabled), and served from
+  the precompressed variant cache
+- the admin user list, which the middleware compresses per request
+
+    python benchmarks/compression_bench.py --rows 2000 --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import compression  # noqa: E402
+import server  # noqa: E402
+from memory_backend import InMemoryClient  # noqa: E402
+
+ADMIN_ID = '00000000-0000-0000-0000-000000000000'
+ENDPOINTS = [
+    ("feed_page_20", "/api/announcements", "limit=20"),
+    ("feed_page_100", "/api/announcements", "limit=100"),
+    ("feed_all", "/api/announcements", "all=true"),
+    ("admin_users", "/api/admin/users", "all=true"),
+]
+
+
+def seed(rows: int) -> InMemoryClient:
+    client = InMemoryClient()
+    users = client.tables['users']
+    for i in range(rows):
+        users.append({
+            'id': ADMIN_ID if i == 0 else f'00000000-0000-0000-0000-{i:012d}',
+            'email': f'user{i}@bench.local', 'password_hash': 'x',
+            'role': 'admin' if i == 0 else 'user',
+            'created_at': f'2024-01-01T00:00:00.{i:06d}+00:00',
+            'updated_at': f'2024-01-01T00:00:00.{i:06d}+00:00',
+        })
+    announcements = client.tables['announcements']
+    for i in range(rows):
+        created = f'2024-02-01T00:00:00.{i:06d}+00:00'
+        announcements.append({
+            'id': f'10000000-0000-0000-0000-{i:012d}',
+            'title': f'Announcement {i}: {"release" if i % 3 else "incident"} update',
+            'content': f'Planning notes #{i} for the team. The rollout of build {i * 7 % 1000} '
+                       f'is {"on track" if i % 2 else "delayed"}; see the runbook for details.',
+            'author_id': ADMIN_ID,
+            'author_email': 'user0@bench.local',
+            'created_at': created,
+            'updated_at': created,
+        })
+    return client
+
+
+async def request(path: str, query: str, headers: list) -> int:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': query.encode(), 'server': ('bench', 80), 'client': ('127.0.0.1', 1),
+        'headers': headers,
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            sent.append(len(message.get('body', b'')))
+
+    await server.app(scope, receive, send)
+    return sum(sent)
+
+
+async def measure(path: str, query: str, headers: list, repeat: int) -> dict:
+    size = await request(path, query, headers)
+    cpu = time.process_time()
+    for _ in range(repeat):
+        await request(path, query, headers)
+    return {"bytes": size, "cpu_ms": round((time.process_time() - cpu) / repeat * 1000, 3)}
+
+
+async def run(args) -> dict:
+    server.init_repositories(seed(args.rows))
+    token = server.create_jwt_token({'id': ADMIN_ID, 'email': 'user0@bench.local', 'role': 'admin'})
+    auth = [(b'host', b'bench'), (b'authorization', f'Bearer {token}'.encode())]
+    results = {}
+    for name, path, query in ENDPOINTS:
+        result = results[name] = {"identity": await measure(path, query, auth, args.repeat)}
+        for encoding in compression.ENCODINGS:
+            headers = auth + [(b'accept-encoding', encoding.encode())]
+            if path == "/api/announcements":
+                server.feed_variants.maxsize = 0
+                result[f"{encoding}_per_request"] = await measure(path, query, headers, args.repeat)
+                server.feed_variants.maxsize = args.variants
+            result[encoding] = await measure(path, query, headers, args.repeat)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--variants", type=int, default=512, help="feed variant cache size")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(json.dumps({
+        "rows": args.rows,
+        "min_size": server.COMPRESSION_MIN_SIZE,
+        "gzip_level": server.COMPRESSION_GZIP_LEVEL,
+        "brotli_quality": server.COMPRESSION_BROTLI_QUALITY,
+        **asyncio.run(run(args)),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
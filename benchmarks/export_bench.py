@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the admin export endpoints against the full-list endpoints.
+
+Seeds the in-memory Supabase stand-in, then calls the ASGI app directly and
+records time to first body byte, total time, bytes sent and peak Python heap
+growth (tracemalloc) while each response is produced and discarded. The
+stand-in scans and sorts the whole table for every keyset page, so export
+``total_ms`` overstates what an indexed Postgres query would cost.
+
+    python benchmarks/export_bench.py --rows 50000 --db-latency 0.005
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+from memory_backend import InMemoryClient  # noqa: E402
+
+ADMIN_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def seed(client: InMemoryClient, rows: int) -> None:
+    client.tables['users'].append({
+        'id': ADMIN_ID, 'email': 'admin@bench.local', 'password_hash': 'x', 'role': 'admin',
+        'created_at': '2024-01-01T00:00:00', 'updated_at': '2024-01-01T00:00:00',
+    })
+    announcements = client.tables['announcements']
+    for i in range(rows):
+        created = f'2024-02-01T00:00:{i // 1000000:02d}.{i % 1000000:06d}'
+        announcements.append({
+            'id': f'10000000-0000-0000-0000-{i:012d}',
+            'title': f'Announcement {i}',
+            'content': 'Quarterly planning notes for the whole team. ' * 8,
+            'author_id': ADMIN_ID,
+            'author_email': 'admin@bench.local',
+            'created_at': created,
+            'updated_at': created,
+        })
+
+
+async def measure(path: str, query: str, token: str) -> dict:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': query.encode(), 'server': ('bench', 80), 'client': ('127.0.0.1', 1),
+        'headers': [(b'host', b'bench'), (b'authorization', f'Bearer {token}'.encode())],
+    }
+    state = {'status': None, 'first_byte': None, 'bytes': 0}
+    requested = []
+
+    async def receive():
+        # StreamingResponse listens for a disconnect; after the request body
+        # the client just stays connected
+        if not requested:
+            requested.append(True)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            state['status'] = message['status']
+        elif message['type'] == 'http.response.body' and message.get('body'):
+            if state['first_byte'] is None:
+                state['first_byte'] = time.perf_counter()
+            state['bytes'] += len(message['body'])
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await server.app(scope, receive, send)
+    finished = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'status': state['status'],
+        'first_byte_ms': round((state['first_byte'] - started) * 1000, 1),
+        'total_ms': round((finished - started) * 1000, 1),
+        'bytes': state['bytes'],
+        'peak_heap_mb': round(peak / 1024 / 1024, 1),
+    }
+
+
+async def run(args) -> dict:
+    client = InMemoryClient(latency=args.db_latency)
+    seed(client, args.rows)
+    server.init_repositories(client)
+    server.feed_cache.enabled = False
+    server.EXPORT_PAGE_SIZE = args.page_size
+    token = server.create_jwt_token({'id': ADMIN_ID, 'email': 'admin@bench.local', 'role': 'admin'})
+    return {
+        'rows': args.rows,
+        'page_size': args.page_size,
+        'list_all': await measure('/api/announcements', 'all=true', token),
+        'export_ndjson': await measure('/api/admin/export/announcements', 'format=ndjson', token),
+        'export_csv': await measure('/api/admin/export/announcements', 'format=csv', token),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--db-latency", type=float, default=0.005, help="simulated seconds per Supabase call")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator and latency report for the Team Hub API.
+
+Drives ``backend/server.py`` with the Supabase client replaced by the
+in-memory stand-in, either in-process through an ASGI transport or against a
+child uvicorn process, and reports RPS and latency percentiles per route.
+
+    python benchmarks/load.py --mix feed=80,login=5,write=15 --concurrency 50 --duration 20
+    python benchmarks/load.py --mode uvicorn --db-latency 0.02 --output after.json --compare before.json
+
+Mix actions:
+    feed    GET  /api/announcements (first page, honouring ETags like a browser)
+    page    GET  /api/announcements?cursor=... (second page)
+    search  GET  /api/announcements/search?q=...
+    login   POST /api/auth/signin
+    me      GET  /api/auth/user
+    write   POST, then PUT or DELETE on an announcement the worker created
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+PASSWORD = "LoadTest123!"
+WORDS = "team release planning budget office deploy incident review hiring security update holiday".split()
+
+
+def load_server(args):
+    """Import the app and bind it to a seeded in-memory client."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    # Every simulated user shares one client address; measure the handlers, not the limiter
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    import server
+    from memory_backend import InMemoryClient
+    from passwords import _hash
+
+    client = InMemoryClient(latency=args.db_latency)
+    rng = random.Random(args.seed)
+    password_hash = _hash(PASSWORD)
+    users = client.tables['users']
+    for i in range(args.users):
+        users.append({
+            'id': f'00000000-0000-0000-0000-{i:012d}',
+            'email': f'user{i}@loadtest.local',
+            'password_hash': password_hash,
+            'role': 'admin' if i == 0 else 'user',
+            'created_at': f'2024-01-01T00:00:00.{i:06d}',
+            'updated_at': f'2024-01-01T00:00:00.{i:06d}',
+        })
+    announcements = client.tables['announcements']
+    for i in range(args.announcements):
+        author = users[i % len(users)]
+        created = f'2024-02-01T00:00:00.{i:06d}'
+        announcements.append({
+            'id': f'10000000-0000-0000-0000-{i:012d}',
+            'title': ' '.join(rng.choices(WORDS, k=5)),
+            'content': ' '.join(rng.choices(WORDS, k=60)),
+            'author_id': author['id'],
+            'author_email': author['email'],
+            'created_at': created,
+            'updated_at': created,
+        })
+    server.init_repositories(client)
+    # Per-request client logging would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return server
+
+
+def serve(args) -> None:
+    import uvicorn
+    server = load_server(args)
+    uvicorn.run(server.app, host="127.0.0.1", port=args.serve, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(ACTIONS)
+    if unknown:
+        raise SystemExit(f"Unknown mix actions: {', '.join(sorted(unknown))}")
+    return mix
+
+
+class Worker:
+    def __init__(self, client, record, rng, token, user_index, users):
+        self.client = client
+        self.record = record
+        self.rng = rng
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.user_index = user_index
+        self.users = users
+        self.etag = None
+        self.cursor = None
+        self.mine = []
+
+    async def request(self, route, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        self.record(route, status, time.perf_counter() - started)
+        return response
+
+    async def feed(self):
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        response = await self.request("GET /api/announcements", "GET", "/api/announcements", headers=headers)
+        if response is not None and response.status_code == 200:
+            self.etag = response.headers.get("etag")
+            self.cursor = response.json().get("next_cursor")
+
+    async def page(self):
+        if not self.cursor:
+            return await self.feed()
+        await self.request("GET /api/announcements?cursor", "GET", "/api/announcements", params={"cursor": self.cursor})
+
+    async def search(self):
+        query = ' '.join(self.rng.sample(WORDS, self.rng.randint(1, 2)))
+        await self.request("GET /api/announcements/search", "GET", "/api/announcements/search", params={"q": query})
+
+    async def login(self):
+        email = f"user{self.rng.randrange(self.users)}@loadtest.local"
+        await self.request("POST /api/auth/signin", "POST", "/api/auth/signin",
+                           json={"email": email, "password": PASSWORD})
+
+    async def me(self):
+        await self.request("GET /api/auth/user", "GET", "/api/auth/user", headers=self.headers)
+
+    async def write(self):
+        if self.mine and self.rng.random() < 0.5:
+            announcement_id = self.mine.pop(self.rng.randrange(len(self.mine)))
+            if self.rng.random() < 0.5:
+                await self.request("PUT /api/announcements/{announcement_id}", "PUT",
+                                   f"/api/announcements/{announcement_id}", headers=self.headers,
+                                   json={"title": "Updated", "content": "load test update"})
+                self.mine.append(announcement_id)
+            else:
+                await self.request("DELETE /api/announcements/{announcement_id}", "DELETE",
+                                   f"/api/announcements/{announcement_id}", headers=self.headers)
+            return
+        response = await self.request("POST /api/announcements", "POST", "/api/announcements",
+                                      headers=self.headers,
+                                      json={"title": "Load test", "content": ' '.join(self.rng.choices(WORDS, k=40))})
+        if response is not None and response.status_code == 200:
+            self.mine.append(response.json()["id"])
+
+
+ACTIONS = {
+    "feed": Worker.feed,
+    "page": Worker.page,
+    "search": Worker.search,
+    "login": Worker.login,
+    "me": Worker.me,
+    "write": Worker.write,
+}
+
+
+async def wait_ready(client, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def drive(args, client) -> dict:
+    await wait_ready(client)
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+
+    # One real sign-in per worker so the run starts with valid tokens
+    tokens = []
+    for i in range(args.concurrency):
+        user_index = i % args.users
+        response = await client.post("/api/auth/signin", json={
+            "email": f"user{user_index}@loadtest.local", "password": PASSWORD})
+        response.raise_for_status()
+        tokens.append((response.json()["token"], user_index))
+
+    samples = {}
+
+    def record(route, status, seconds):
+        samples.setdefault(route, []).append((status, seconds))
+
+    async def run_worker(n, deadline):
+        rng = random.Random(args.seed * 1000 + n)
+        token, user_index = tokens[n]
+        worker = Worker(client, record, rng, token, user_index, args.users)
+        while time.perf_counter() < deadline:
+            await ACTIONS[rng.choices(names, weights)[0]](worker)
+
+    if args.warmup:
+        await asyncio.gather(*(run_worker(n, time.perf_counter() + args.warmup) for n in range(args.concurrency)))
+        samples.clear()
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(run_worker(n, deadline) for n in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    routes = {}
+    total = errors = 0
+    for route, entries in sorted(samples.items()):
+        latencies = sorted(seconds * 1000 for _, seconds in entries)
+        route_errors = sum(1 for status, _ in entries if status == 0 or status >= 500)
+        statuses = {}
+        for status, _ in entries:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        total += len(entries)
+        errors += route_errors
+        routes[route] = {
+            "requests": len(entries),
+            "rps": round(len(entries) / elapsed, 1),
+            "errors": route_errors,
+            "statuses": statuses,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    return {
+        "config": {
+            "mode": args.mode,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "db_latency": args.db_latency,
+            "users": args.users,
+            "announcements": args.announcements,
+        },
+        "totals": {
+            "requests": total,
+            "rps": round(total / elapsed, 1),
+            "errors": errors,
+            "elapsed": round(elapsed, 2),
+        },
+        "routes": routes,
+    }
+
+
+async def run_inprocess(args) -> dict:
+    server = load_server(args)
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await drive(args, client)
+    finally:
+        await server.app.router.shutdown()
+
+
+async def run_uvicorn(args, base_url) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 5, max_keepalive_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        return await drive(args, client)
+
+
+def compare(report, baseline) -> str:
+    lines = [f"{'route':<45} {'rps':>16} {'p50 ms':>18} {'p99 ms':>18}"]
+    for route, now in report["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if before is None:
+            lines.append(f"{route:<45} {now['rps']:>16} {now['p50_ms']:>18} {now['p99_ms']:>18}")
+            continue
+
+        def cell(key):
+            return f"{before[key]}->{now[key]}"
+        lines.append(f"{route:<45} {cell('rps'):>16} {cell('p50_ms'):>18} {cell('p99_ms'):>18}")
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--mix", default="feed=70,page=5,search=5,me=5,login=3,write=12")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the run")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="simulated seconds per Supabase call")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--announcements", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return 0
+
+    if args.mode == "inprocess":
+        report = asyncio.run(run_inprocess(args))
+    else:
+        port = free_port()
+        child_args = [sys.executable, __file__, "--serve", str(port),
+                      "--db-latency", str(args.db_latency), "--users", str(args.users),
+                      "--announcements", str(args.announcements), "--seed", str(args.seed)]
+        child = subprocess.Popen(child_args, env=dict(os.environ))
+        try:
+            report = asyncio.run(run_uvicorn(args, f"http://127.0.0.1:{port}"))
+        finally:
+            child.terminate()
+            child.wait(timeout=10)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    print(text)
+    if args.compare:
+        print(compare(report, json.loads(Path(args.compare).read_text())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
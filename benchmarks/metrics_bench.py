@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the metrics layer (backend/metrics.py).
+
+Measures the per-request cost that MetricsMiddleware adds in front of a no-op
+ASGI app, using the real route table so template matching is included, plus
+the cost of individual metric updates and of rendering /metrics.
+
+    python benchmarks/metrics_bench.py --requests 50000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+from metrics import HttpMetrics, MetricsMiddleware, MetricsRegistry  # noqa: E402
+
+PATHS = [
+    ("GET", "/api/announcements"),
+    ("PUT", "/api/announcements/6f1c2a9e-1111-4c1e-9d1a-1234567890ab"),
+    ("GET", "/api/admin/users"),
+    ("GET", "/not/a/route"),
+]
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def make_scope(method, path):
+    return {"type": "http", "method": method, "path": path, "root_path": "", "headers": [],
+            "query_string": b""}
+
+
+async def time_app(app, requests):
+    scopes = [make_scope(*PATHS[i % len(PATHS)]) for i in range(requests)]
+    started = time.perf_counter()
+    for scope in scopes:
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def time_call(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--max-overhead-us", type=float, default=None, help="fail above this per-request cost")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    wrapped = MetricsMiddleware(noop_app, HttpMetrics(registry), server.app.router.routes)
+
+    bare = asyncio.run(time_app(noop_app, args.requests))
+    instrumented = asyncio.run(time_app(wrapped, args.requests))
+    overhead_us = (instrumented - bare) * 1e6
+
+    histogram = registry.histogram("bench_seconds", "bench", ("a", "b"))
+    counter = registry.counter("bench_total", "bench", ("a",))
+    labels = ("users", "select")
+    observe_ns = time_call(lambda: histogram.observe(labels, 0.012), 200000) * 1e9
+    inc_ns = time_call(lambda: counter.inc(("x",)), 200000) * 1e9
+    match_us = time_call(lambda: wrapped.route_template(make_scope(*PATHS[1])), 20000) * 1e6
+    render_ms = time_call(server.metrics.render, 200) * 1e3
+
+    report = {
+        "routes": len(server.app.router.routes),
+        "middleware_overhead_us_per_request": round(overhead_us, 2),
+        "route_template_match_us": round(match_us, 2),
+        "histogram_observe_ns": round(observe_ns, 1),
+        "counter_inc_ns": round(inc_ns, 1),
+        "render_ms": round(render_ms, 3),
+    }
+    print(json.dumps(report, indent=2))
+    if args.max_overhead_us is not None and overhead_us > args.max_overhead_us:
+        print(f"FAIL: middleware overhead {overhead_us:.1f}us > {args.max_overhead_us}us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the announcement search index (backend/search_index.py).
+
+Builds the index over a synthetic corpus with a Zipf-distributed vocabulary,
+then times queries of one to three terms, incremental updates, and a query
+on the most common term right after each update.
+
+    python benchmarks/search_bench.py --documents 100000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from search_index import SearchIndex  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def make_document(rng: random.Random, words, weights):
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128))),
+        'title': ' '.join(rng.choices(words, weights, k=6)),
+        'content': ' '.join(rng.choices(words, weights, k=60)),
+    }
+
+
+def summarize(timings):
+    return {
+        "p50": round(percentile(timings, 50), 3),
+        "p95": round(percentile(timings, 95), 3),
+        "p99": round(percentile(timings, 99), 3),
+        "max": round(max(timings), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="fail if query p99 exceeds this")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = [f"w{i}" for i in range(args.vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(args.vocabulary)]
+    corpus = [make_document(rng, words, weights) for _ in range(args.documents)]
+
+    index = SearchIndex()
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    index.rebuild(corpus)
+    build_seconds = time.perf_counter() - started
+    index_mb = rss_mb() - rss_before
+
+    results = {}
+    for term_count in (1, 2, 3):
+        timings = []
+        for _ in range(args.queries):
+            query = ' '.join(rng.choices(words, weights, k=term_count))
+            started = time.perf_counter()
+            index.search(query, args.limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[f"{term_count}_term_ms"] = summarize(timings)
+
+    update_timings, after_write_timings = [], []
+    for _ in range(200):
+        document = make_document(rng, words, weights)
+        started = time.perf_counter()
+        index.add(document)
+        update_timings.append((time.perf_counter() - started) * 1000)
+        # Most common word: every write touches its ordered posting list
+        started = time.perf_counter()
+        index.search(words[0], args.limit)
+        after_write_timings.append((time.perf_counter() - started) * 1000)
+
+    report = {
+        "documents": len(index),
+        "terms": index.term_count,
+        "build_seconds": round(build_seconds, 2),
+        "index_rss_mb": round(index_mb, 1),
+        "queries": results,
+        "update_ms": summarize(update_timings),
+        "query_after_write_ms": summarize(after_write_timings),
+    }
+    print(json.dumps(report, indent=2))
+
+    worst = max(r["p99"] for r in results.values())
+    if args.max_p99_ms is not None and worst > args.max_p99_ms:
+        print(f"FAIL: query p99 {worst}ms > {args.max_p99_ms}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
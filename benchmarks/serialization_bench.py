@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Before/after benchmark for FAST_SERIALIZATION (backend/serialization.py).
+
+For each row count, times the list endpoints end to end with the model path
+(validate into AnnouncementResponse/UserResponse, then dump) and with the fast
+path (project and encode the upstream rows directly), plus the encoding step
+on its own. The feed cache is disabled so every request serializes.
+
+    python benchmarks/serialization_bench.py --rows 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import serialization  # noqa: E402
+import server  # noqa: E402
+from memory_backend import InMemoryClient  # noqa: E402
+
+ADMIN_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def seed(rows: int) -> InMemoryClient:
+    client = InMemoryClient()
+    users = client.tables['users']
+    for i in range(rows):
+        users.append({
+            'id': ADMIN_ID if i == 0 else f'00000000-0000-0000-0000-{i:012d}',
+            'email': f'user{i}@bench.local', 'password_hash': 'x',
+            'role': 'admin' if i == 0 else 'user',
+            'created_at': f'2024-01-01T00:00:00.{i:06d}+00:00',
+            'updated_at': f'2024-01-01T00:00:00.{i:06d}+00:00',
+        })
+    announcements = client.tables['announcements']
+    for i in range(rows):
+        created = f'2024-02-01T00:00:00.{i:06d}+00:00'
+        announcements.append({
+            'id': f'10000000-0000-0000-0000-{i:012d}',
+            'title': f'Announcement {i}',
+            'content': 'Quarterly planning notes for the whole team. ' * 4,
+            'author_id': ADMIN_ID,
+            'author_email': 'user0@bench.local',
+            'created_at': created,
+            'updated_at': created,
+        })
+    return client
+
+
+def best_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 2)
+
+
+async def request_ms(client, url, headers, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return round(min(timings) * 1000, 2)
+
+
+async def endpoints(headers, repeat):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return {
+            "announcements_all_ms": await request_ms(client, "/api/announcements?all=true", headers, repeat),
+            "announcements_page_ms": await request_ms(client, "/api/announcements?limit=100", headers, repeat),
+            "admin_users_ms": await request_ms(client, "/api/admin/users?all=true", headers, repeat),
+        }
+
+
+def run(rows: int, repeat: int) -> dict:
+    client = seed(rows)
+    server.init_repositories(client)
+    server.feed_cache.enabled = False
+    token = server.create_jwt_token({'id': ADMIN_ID, 'email': 'user0@bench.local', 'role': 'admin'})
+    headers = {"Authorization": f"Bearer {token}"}
+    announcements = client.tables['announcements']
+    adapter = server.announcement_list_adapter
+
+    result = {"rows": rows, "orjson": serialization.orjson is not None}
+    result["encode_only"] = {
+        "models_ms": best_ms(lambda: adapter.dump_json(adapter.validate_python(announcements)), repeat),
+        "fast_ms": best_ms(lambda: serialization.dump_rows(announcements, server.ANNOUNCEMENT_FIELDS), repeat),
+    }
+    for label, enabled in (("before", False), ("after", True)):
+        server.FAST_SERIALIZATION = enabled
+        result[label] = asyncio.run(endpoints(headers, repeat))
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5, help="best of N per measurement")
+    args = parser.parse_args()
+    print(json.dumps([run(rows, args.repeat) for rows in args.rows], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
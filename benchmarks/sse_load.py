@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Load test for the announcement push channel (GET /api/announcements/stream).
+
+Starts the API in a child uvicorn process backed by the in-memory Supabase
+stand-in, opens many idle SSE connections, then publishes announcements and
+measures fan-out latency, delivery and server memory per connection.
+
+    python benchmarks/sse_load.py --connections 2000 --events 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+
+def serve(port: int) -> None:
+    sys.path.insert(0, str(BACKEND_DIR))
+    import uvicorn
+    import server
+    from memory_backend import InMemoryClient
+
+    server.init_repositories(InMemoryClient())
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def listen(client, ready, received, expected):
+    """Hold one SSE connection and record when each announcement id arrives."""
+    async with client.stream("GET", "/api/announcements/stream") as response:
+        response.raise_for_status()
+        ready.set_result(None)
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: ") and event == "created":
+                announcement_id = json.loads(line[6:])["id"]
+                received.setdefault(announcement_id, []).append(time.perf_counter())
+                expected[0] -= 1
+                if expected[0] <= 0:
+                    return
+
+
+async def run(args, base_url: str, server_pid: int) -> dict:
+    limits = httpx.Limits(max_connections=args.connections + 10, max_keepalive_connections=10)
+    timeout = httpx.Timeout(60.0, read=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        await wait_ready(client)
+        signup = await client.post("/api/auth/signup", json={
+            "email": "loadtest@teamhub.local", "password": "LoadTest123!", "role": "admin"})
+        headers = {"Authorization": f"Bearer {signup.json()['token']}"}
+
+        rss_before = rss_kb(server_pid)
+        received = {}
+        readies, listeners = [], []
+        connect_start = time.perf_counter()
+        for _ in range(args.connections):
+            ready = asyncio.get_running_loop().create_future()
+            expected = [args.events]
+            readies.append(ready)
+            listeners.append(asyncio.create_task(listen(client, ready, received, expected)))
+        await asyncio.gather(*readies)
+        connect_seconds = time.perf_counter() - connect_start
+        await asyncio.sleep(args.settle)
+        rss_connected = rss_kb(server_pid)
+
+        sent = {}
+        for i in range(args.events):
+            started = time.perf_counter()
+            response = await client.post("/api/announcements", headers=headers, json={
+                "title": f"Load test {i}", "content": "fan-out"})
+            sent[response.json()["id"]] = started
+            await asyncio.sleep(args.interval)
+
+        _, pending = await asyncio.wait(listeners, timeout=args.drain_timeout)
+        for task in pending:
+            task.cancel()
+
+        latencies_ms = [
+            (at - sent[announcement_id]) * 1000
+            for announcement_id, arrivals in received.items() if announcement_id in sent
+            for at in arrivals
+        ]
+        delivered = len(latencies_ms)
+        return {
+            "connections": args.connections,
+            "events": args.events,
+            "connect_seconds": round(connect_seconds, 3),
+            "server_rss_kb_before": rss_before,
+            "server_rss_kb_connected": rss_connected,
+            "server_kb_per_connection": round((rss_connected - rss_before) / args.connections, 2),
+            "delivered": delivered,
+            "expected": args.connections * args.events,
+            "delivery_ratio": round(delivered / (args.connections * args.events), 4),
+            "fanout_latency_ms": {
+                "p50": percentile(latencies_ms, 50),
+                "p95": percentile(latencies_ms, 95),
+                "p99": percentile(latencies_ms, 99),
+                "mean": statistics.fmean(latencies_ms) if latencies_ms else None,
+            },
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between published events")
+    parser.add_argument("--settle", type=float, default=1.0, help="idle seconds before measuring memory")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--min-delivery", type=float, default=1.0, help="fail below this delivery ratio")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    # Client and server each hold one socket per connection
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    port = free_port()
+    env = dict(os.environ, STREAM_MAX_SUBSCRIBERS=str(args.connections + 100))
+    child = subprocess.Popen([sys.executable, __file__, "--serve", str(port)], env=env)
+    try:
+        result = asyncio.run(run(args, f"http://127.0.0.1:{port}", child.pid))
+    finally:
+        child.terminate()
+        child.wait(timeout=10)
+
+    print(json.dumps(result, indent=2))
+    if result["delivery_ratio"] < args.min_delivery:
+        print(f"FAIL: delivery ratio {result['delivery_ratio']} < {args.min_delivery}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
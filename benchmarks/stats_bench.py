@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Dashboard counts: GET /api/announcements/stats vs aggregating the full feed.
+
+Before the stats endpoint, a dashboard pulled ``GET /api/announcements?all=true``
+and counted per author and per day itself. For each row count this times
+that (request plus client-side aggregation, feed cache disabled so every
+request reads the table) against the stats endpoint. ``--db-latency`` adds a
+per-call delay to the in-memory Supabase stand-in.
+
+    python benchmarks/stats_bench.py --rows 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+from memory_backend import InMemoryClient  # noqa: E402
+from stats import AnnouncementStats  # noqa: E402
+
+ADMIN_ID = '00000000-0000-0000-0000-000000000000'
+AUTHORS = 200
+
+
+def seed(rows: int, latency: float) -> InMemoryClient:
+    client = InMemoryClient(latency=latency)
+    client.tables['users'].append({
+        'id': ADMIN_ID, 'email': 'user0@bench.local', 'password_hash': 'x', 'role': 'admin',
+        'created_at': '2024-01-01T00:00:00+00:00', 'updated_at': '2024-01-01T00:00:00+00:00',
+    })
+    announcements = client.tables['announcements']
+    for i in range(rows):
+        created = f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00.{i:06d}+00:00'
+        announcements.append({
+            'id': f'10000000-0000-0000-0000-{i:012d}',
+            'title': f'Announcement {i}',
+            'content': 'Quarterly planning notes for the whole team. ' * 4,
+            'author_id': f'00000000-0000-0000-0000-{i % AUTHORS:012d}',
+            'author_email': f'user{i % AUTHORS}@bench.local',
+            'created_at': created,
+            'updated_at': created,
+        })
+    return client
+
+
+async def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 2)
+
+
+async def measure(headers: dict, repeat: int) -> dict:
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def aggregate_feed():
+            response = await client.get("/api/announcements", params={"all": "true"})
+            rows = response.json()
+            by_author = Counter(row['author_id'] for row in rows)
+            by_day = Counter(row['created_at'][:10] for row in rows)
+            return len(rows), by_author, by_day
+
+        async def stats():
+            response = await client.get("/api/announcements/stats", params={"days": 366, "authors": AUTHORS},
+                                        headers=headers)
+            response.raise_for_status()
+
+        feed_bytes = len((await client.get("/api/announcements", params={"all": "true"})).content)
+        stats_bytes = len((await client.get("/api/announcements/stats", params={"days": 366, "authors": AUTHORS},
+                                            headers=headers)).content)
+        return {
+            "feed_aggregate_ms": await best_ms(aggregate_feed, repeat),
+            "feed_bytes": feed_bytes,
+            "stats_ms": await best_ms(stats, repeat),
+            "stats_bytes": stats_bytes,
+        }
+
+
+def run(rows: int, args) -> dict:
+    server.init_repositories(seed(rows, args.db_latency))
+    server.feed_cache.enabled = False
+    server.announcement_stats = AnnouncementStats()
+    token = server.create_jwt_token({'id': ADMIN_ID, 'email': 'user0@bench.local', 'role': 'admin'})
+
+    async def main():
+        await server.reconcile_announcement_stats()
+        return await measure({"Authorization": f"Bearer {token}"}, args.repeat)
+    return {"rows": rows, **asyncio.run(main())}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="best of N per measurement")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="seconds per Supabase call")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    print(json.dumps([run(rows, args) for rows in args.rows], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Default vs tuned Supabase HTTP client (backend/upstream.py).
+
+Starts a local HTTP/1.1 stand-in for PostgREST that answers
+``GET /rest/v1/<table>`` with a JSON page after ``--latency-ms``, fails a
+``--fail-rate`` fraction of requests (half with a 502, half by dropping the
+connection) and counts the TCP connections it accepts. Then drives
+``Database.execute`` selects at ``--concurrency`` through:
+
+- ``default``: postgrest's ``SyncPostgrestClient`` with library defaults (what
+  ``supabase.create_client`` builds), no retries
+- ``tuned``: the shared pooled client and retry policy the server uses
+
+and reports throughput, latency percentiles, connections opened, retries and
+the fraction of calls that succeeded.
+
+    python benchmarks/upstream_bench.py --requests 2000 --concurrency 16 --fail-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from postgrest import SyncPostgrestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from repository import Database, RetryPolicy  # noqa: E402
+from upstream import build_http_client, create_rest_client, is_transient, pool_stats  # noqa: E402
+
+BODY = json.dumps([
+    {'id': f'10000000-0000-0000-0000-{i:012d}', 'title': f'Announcement {i}', 'content': 'x' * 200}
+    for i in range(20)
+]).encode('utf-8')
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, latency: float, fail_rate: float):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        roll = random.random()
+        if roll < self.server.fail_rate / 2:
+            self.close_connection = True
+            return
+        if roll < self.server.fail_rate:
+            body, status, content_type = b"Bad Gateway", 502, "text/plain"
+        else:
+            body, status, content_type = BODY, 200, "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def drive(db: Database, requests: int, concurrency: int) -> dict:
+    latencies, failures = [], 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await db.execute('announcements', 'select', db.table('announcements').select('*').limit(20))
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "success_rate": round(1 - failures / requests, 4),
+        "retries": db.retries,
+    }
+
+
+def run(label: str, server: StandIn, args) -> dict:
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    key = "bench-anon-key"
+    http_client = None
+    if label == "default":
+        client = SyncPostgrestClient(f"{url}/rest/v1", headers={"apikey": key, "Authorization": f"Bearer {key}"})
+        db = Database(client, max_workers=args.concurrency)
+    else:
+        http_client = build_http_client(pool_size=args.concurrency, keepalive=args.concurrency)
+        retry = RetryPolicy(attempts=3, base_delay=0.05, max_delay=1.0, transient=is_transient)
+        db = Database(create_rest_client(url, key, http_client), max_workers=args.concurrency,
+                      retry=retry, timeout=15)
+    before = server.connections
+    try:
+        result = asyncio.run(drive(db, args.requests, args.concurrency))
+    finally:
+        db.close()
+    result["connections_opened"] = server.connections - before
+    if http_client is not None:
+        result["pool"] = pool_stats(http_client)
+        http_client.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="stand-in response delay")
+    parser.add_argument("--fail-rate", type=float, default=0.02, help="fraction of requests answered with 502 or a dropped connection")
+    args = parser.parse_args()
+
+    server = StandIn(args.latency_ms / 1000, args.fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        results = {label: run(label, server, args) for label in ("default", "tuned")}
+    finally:
+        server.shutdown()
+    print(json.dumps({"requests": args.requests, "concurrency": args.concurrency,
+                      "latency_ms": args.latency_ms, "fail_rate": args.fail_rate, **results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,7 @@ import {
   SelectValue,
 } from '../components/ui/select';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
+import { Input } from '../components/ui/input';
 import { Badge } from '../components/ui/badge';
 import { Users, Shield, UserCheck, Save, CheckCircle2 } from 'lucide-react';
 import { adminAPI, handleApiError } from '../services/api';
@@ -23,37 +24,86 @@ import { useToast } from '../hooks/use-toast';
 
 const AdminPage = () => {
   const [users, setUsers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [counts, setCounts] = useState({ total: 0, admin: 0, user: 0 });
+  const [roleFilter, setRoleFilter] = useState('all');
+  const [emailPrefix, setEmailPrefix] = useState('');
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [savingUserId, setSavingUserId] = useState(null);
   const { toast } = useToast();
 
   useEffect(() => {
-    loadUsers();
+    loadCounts();
   }, []);
 
+  useEffect(() => {
+    // Wait for typing to pause before querying
+    const timer = setTimeout(loadUsers, 300);
+    return () => clearTimeout(timer);
+  }, [roleFilter, emailPrefix]);
+
+  const showError = (error) => {
+    const errorMessage = handleApiError(error);
+    toast({
+      title: "Error",
+      description: errorMessage,
+      variant: "destructive",
+    });
+  };
+
+  // Add hasUnsavedChanges property to track changes
+  const withChangeTracking = (items) => items.map(user => ({
+    ...user,
+    hasUnsavedChanges: false,
+    originalRole: user.role
+  }));
+
+  const filters = () => ({
+    role: roleFilter === 'all' ? null : roleFilter,
+    // The API rejects '*', which PostgREST would treat as a wildcard
+    emailPrefix: emailPrefix.trim().replace(/\*/g, ''),
+  });
+
   const loadUsers = async () => {
     try {
       setIsLoading(true);
-      const data = await adminAPI.getAllUsers();
-      // Add hasUnsavedChanges property to track changes
-      const usersWithChangeTracking = data.map(user => ({
-        ...user,
-        hasUnsavedChanges: false,
-        originalRole: user.role
-      }));
-      setUsers(usersWithChangeTracking);
+      const page = await adminAPI.getAllUsers(filters());
+      setUsers(withChangeTracking(page.items));
+      setNextCursor(page.next_cursor);
     } catch (error) {
-      const errorMessage = handleApiError(error);
-      toast({
-        title: "Error",
-        description: errorMessage,
-        variant: "destructive",
-      });
+      showError(error);
     } finally {
       setIsLoading(false);
     }
   };
 
+  const loadMoreUsers = async () => {
+    try {
+      setIsLoadingMore(true);
+      const page = await adminAPI.getAllUsers({ ...filters(), cursor: nextCursor });
+      setUsers((current) => [...current, ...withChangeTracking(page.items)]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      showError(error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  // Totals for the whole directory, not just the loaded pages. `estimated`
+  // is exact for small tables and uses Postgres' row estimate for large ones.
+  const loadCounts = async () => {
+    try {
+      const [all, admins, regular] = await Promise.all(
+        [null, 'admin', 'user'].map((role) => adminAPI.getAllUsers({ limit: 1, role, count: 'estimated' }))
+      );
+      setCounts({ total: all.total, admin: admins.total, user: regular.total });
+    } catch (error) {
+      showError(error);
+    }
+  };
+
   const handleRoleChange = (userId, newRole) => {
     setUsers(users.map(user => {
       if (user.id === userId) {
@@ -88,6 +138,7 @@ const AdminPage = () => {
         title: "Role updated successfully",
         description: response.message || "User role has been changed and saved.",
       });
+      loadCounts();
     } catch (error) {
       const errorMessage = handleApiError(error);
       toast({
@@ -108,9 +159,6 @@ const AdminPage = () => {
     return role === 'admin' ? Shield : UserCheck;
   };
 
-  const adminCount = users.filter(user => user.role === 'admin').length;
-  const userCount = users.filter(user => user.role === 'user').length;
-
   return (
     <div className="space-y-8">
       {/* Header Section */}
@@ -136,7 +184,7 @@ const AdminPage = () => {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-sm font-medium text-slate-600">Total Users</p>
-                  <p className="text-3xl font-bold text-slate-900">{users.length}</p>
+                  <p className="text-3xl font-bold text-slate-900">{counts.total}</p>
                 </div>
                 <div className="w-12 h-12 bg-gradient-to-r from-slate-100 to-slate-200 rounded-lg flex items-center justify-center">
                   <Users className="w-6 h-6 text-slate-600" />
@@ -150,7 +198,7 @@ const AdminPage = () => {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-sm font-medium text-slate-600">Administrators</p>
-                  <p className="text-3xl font-bold text-slate-900">{adminCount}</p>
+                  <p className="text-3xl font-bold text-slate-900">{counts.admin}</p>
                 </div>
                 <div className="w-12 h-12 bg-gradient-to-r from-slate-700 to-slate-600 rounded-lg flex items-center justify-center">
                   <Shield className="w-6 h-6 text-white" />
@@ -164,7 +212,7 @@ const AdminPage = () => {
               <div className="flex items-center justify-between">
                 <div>
                   <p className="text-sm font-medium text-slate-600">Regular Users</p>
-                  <p className="text-3xl font-bold text-slate-900">{userCount}</p>
+                  <p className="text-3xl font-bold text-slate-900">{counts.user}</p>
                 </div>
                 <div className="w-12 h-12 bg-gradient-to-r from-slate-300 to-slate-400 rounded-lg flex items-center justify-center">
                   <UserCheck className="w-6 h-6 text-white" />
@@ -178,10 +226,30 @@ const AdminPage = () => {
       {/* Users Table */}
       <Card className="border-0 shadow-xl bg-white">
         <CardHeader className="pb-6">
-          <CardTitle className="flex items-center space-x-2">
-            <Users className="w-5 h-5" />
-            <span>Team Members</span>
-          </CardTitle>
+          <div className="flex flex-col gap-4 md:flex-row md:items-center md:justify-between">
+            <CardTitle className="flex items-center space-x-2">
+              <Users className="w-5 h-5" />
+              <span>Team Members</span>
+            </CardTitle>
+            <div className="flex items-center space-x-3">
+              <Input
+                placeholder="Filter by email prefix"
+                value={emailPrefix}
+                onChange={(e) => setEmailPrefix(e.target.value)}
+                className="w-56 h-9"
+              />
+              <Select value={roleFilter} onValueChange={setRoleFilter}>
+                <SelectTrigger className="w-32 h-9">
+                  <SelectValue />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="all">All roles</SelectItem>
+                  <SelectItem value="admin">Admins</SelectItem>
+                  <SelectItem value="user">Users</SelectItem>
+                </SelectContent>
+              </Select>
+            </div>
+          </div>
         </CardHeader>
         <CardContent className="p-0">
           {isLoading ? (
@@ -212,7 +280,7 @@ const AdminPage = () => {
                     <TableRow 
                       key={user.id} 
                       className="hover:bg-slate-50/50 transition-colors animate-in fade-in slide-in-from-bottom duration-300"
-                      style={{ animationDelay: `${index * 50}ms` }}
+                      style={{ animationDelay: `${(index % 50) * 50}ms` }}
                     >
                       <TableCell className="font-medium text-slate-900 py-4">
                         <div className="flex items-center space-x-3">
@@ -289,6 +357,17 @@ const AdminPage = () => {
               </TableBody>
             </Table>
           )}
+          {!isLoading && nextCursor && (
+            <div className="flex justify-center p-6">
+              <Button
+                onClick={loadMoreUsers}
+                disabled={isLoadingMore}
+                variant="outline"
+              >
+                {isLoadingMore ? 'Loading...' : 'Load more'}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
 
@@ -301,7 +380,9 @@ const AdminPage = () => {
             No users found
           </h3>
           <p className="text-slate-600">
-            Users will appear here once they sign up for the platform.
+            {roleFilter !== 'all' || emailPrefix.trim()
+              ? 'No users match these filters.'
+              : 'Users will appear here once they sign up for the platform.'}
           </p>
         </div>
       )}
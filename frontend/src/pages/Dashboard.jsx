@@ -8,6 +8,8 @@ import { useToast } from '../hooks/use-toast';
 
 const Dashboard = () => {
   const [announcements, setAnnouncements] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [isDialogOpen, setIsDialogOpen] = useState(false);
   const [editingAnnouncement, setEditingAnnouncement] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
@@ -20,8 +22,9 @@ const Dashboard = () => {
   const loadAnnouncements = async () => {
     try {
       setIsLoading(true);
-      const data = await announcementAPI.getAll();
-      setAnnouncements(data);
+      const page = await announcementAPI.getAll();
+      setAnnouncements(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       const errorMessage = handleApiError(error);
       toast({
@@ -34,6 +37,24 @@ const Dashboard = () => {
     }
   };
 
+  const loadMoreAnnouncements = async () => {
+    try {
+      setIsLoadingMore(true);
+      const page = await announcementAPI.getAll(20, nextCursor);
+      setAnnouncements((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      const errorMessage = handleApiError(error);
+      toast({
+        title: "Error",
+        description: errorMessage,
+        variant: "destructive",
+      });
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleCreateAnnouncement = () => {
     setEditingAnnouncement(null);
     setIsDialogOpen(true);
@@ -144,7 +165,7 @@ const Dashboard = () => {
             <div 
               key={announcement.id} 
               className="animate-in fade-in slide-in-from-bottom duration-500"
-              style={{ animationDelay: `${index * 100}ms` }}
+              style={{ animationDelay: `${(index % 20) * 100}ms` }}
             >
               <AnnouncementCard
                 announcement={announcement}
@@ -156,6 +177,18 @@ const Dashboard = () => {
         </div>
       )}
 
+      {!isLoading && nextCursor && (
+        <div className="flex justify-center">
+          <Button
+            onClick={loadMoreAnnouncements}
+            disabled={isLoadingMore}
+            variant="outline"
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        </div>
+      )}
+
       {/* Create/Edit Dialog */}
       <CreateEditDialog
         isOpen={isDialogOpen}
@@ -66,8 +66,13 @@ export const authAPI = {
 
 // Announcements API
 export const announcementAPI = {
-  getAll: async () => {
-    const response = await apiClient.get('/announcements');
+  getAll: async (limit = 20, cursor = null) => {
+    const params = { limit };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    const response = await apiClient.get('/announcements', { params });
+    // { items, next_cursor }; next_cursor is null on the last page
     return response.data;
   },
 
@@ -95,8 +100,22 @@ export const announcementAPI = {
 
 // Admin API
 export const adminAPI = {
-  getAllUsers: async () => {
-    const response = await apiClient.get('/admin/users');
+  // Returns { items, next_cursor, total }; total is only set when `count` is given
+  getAllUsers: async ({ limit = 50, cursor = null, role = null, emailPrefix = '', count = null } = {}) => {
+    const params = { limit };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    if (role) {
+      params.role = role;
+    }
+    if (emailPrefix) {
+      params.email_prefix = emailPrefix;
+    }
+    if (count) {
+      params.count = count;
+    }
+    const response = await apiClient.get('/admin/users', { params });
     return response.data;
   },
 
@@ -0,0 +1,125 @@
+"""
+Fixtures for the in-process API tests.
+
+``server`` reads its configuration when it is imported, so the test defaults
+are put in the environment first. Every test gets the app bound to a fresh
+``FlakyClient`` (an ``InMemoryClient`` whose calls can be made to fail) with
+empty caches, search index and stats, and talks to it through httpx's ASGI
+transport. Startup hooks don't run, so nothing tries to reach Supabase.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault('JWT_SECRET', 'tests')
+os.environ.setdefault('SUPABASE_URL', 'http://127.0.0.1:9')
+os.environ.setdefault('SUPABASE_ANON_KEY', 'tests')
+
+from memory_backend import InMemoryAPIError, InMemoryClient, InMemoryQuery  # noqa: E402
+
+
+class FlakyClient(InMemoryClient):
+    """``InMemoryClient`` whose chosen calls raise instead of running."""
+
+    def __init__(self):
+        super().__init__()
+        self._failures = {}
+        self._seen = Counter()
+
+    def fail(self, table, operation, calls=None, code='57014'):
+        """Make ``operation`` calls on ``table`` raise ``InMemoryAPIError(code)``.
+        ``calls`` limits that to those call numbers (1-based, counted from now)."""
+        self._seen[(table, operation)] = 0
+        self._failures[(table, operation)] = (set(calls) if calls is not None else None, code)
+
+    def heal(self):
+        self._failures.clear()
+
+    def attempts(self, table, operation):
+        """``operation`` calls on ``table`` so far, failed ones included
+        (counted from the last ``fail`` for it)."""
+        return self._seen[(table, operation)]
+
+    def table(self, name):
+        return FlakyQuery(self, name)
+
+
+class FlakyQuery(InMemoryQuery):
+    def execute(self):
+        key = (self._table, self._operation)
+        with self._client._lock:
+            self._client._seen[key] += 1
+            failure = self._client._failures.get(key)
+            if failure is not None and (failure[0] is None or self._client._seen[key] in failure[0]):
+                raise InMemoryAPIError(failure[1], f'injected failure of {self._table} {self._operation}')
+        return super().execute()
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """The ``server`` module with fresh in-process state."""
+    import server
+    from caching import FeedCache, TTLCache
+    from compression import VariantCache
+    from search_index import SearchIndex
+    from stats import AnnouncementStats
+
+    monkeypatch.setattr(server, 'RATE_LIMIT_ENABLED', False)
+    monkeypatch.setattr(server, 'known_emails', TTLCache(ttl=300))
+    monkeypatch.setattr(server, 'user_cache', TTLCache(ttl=30))
+    monkeypatch.setattr(server, 'feed_cache', FeedCache())
+    monkeypatch.setattr(server, 'feed_variants', VariantCache())
+    monkeypatch.setattr(server, 'search_index', SearchIndex())
+    monkeypatch.setattr(server, 'announcement_stats', AnnouncementStats())
+    monkeypatch.setattr(server, 'warm_up_task', None)
+    monkeypatch.setattr(server, 'stats_build_task', None)
+    # asyncio locks belong to the loop they are first contended on; each test has its own
+    monkeypatch.setattr(server, 'stats_rebuild_lock', asyncio.Lock())
+    monkeypatch.setattr(server, 'search_index_lock', asyncio.Lock())
+    server.init_repositories(FlakyClient())
+    return server
+
+
+@pytest.fixture
+def store(server):
+    """The ``FlakyClient`` behind the repositories."""
+    return server.db.client
+
+
+@pytest.fixture
+async def client(server):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(server, store):
+    """Insert a user directly and return ``(id, auth headers)``."""
+    def make(email=None, role='user'):
+        user_id = str(uuid.uuid4())
+        email = email or f'{user_id}@example.com'
+        now = datetime.utcnow().isoformat()
+        store.tables['users'].append({
+            'id': user_id, 'email': email, 'password_hash': 'x',
+            'role': role, 'created_at': now, 'updated_at': now,
+        })
+        token = server.create_jwt_token({'id': user_id, 'email': email, 'role': role})
+        return user_id, {'Authorization': f'Bearer {token}'}
+    return make
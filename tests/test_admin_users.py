@@ -0,0 +1,78 @@
+"""
+Admin user directory: role and email-prefix filters, counts and cursor paging.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user(email="root@example.com", role="admin")[1]
+
+
+async def users(client, admin, **params):
+    response = await client.get("/api/admin/users", params=params, headers=admin)
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_role_filter(client, make_user, admin):
+    for i in range(3):
+        make_user(email=f"member{i}@example.com")
+    make_user(email="boss@example.com", role="admin")
+
+    assert sorted(user["email"] for user in (await users(client, admin, role="admin"))["items"]) == [
+        "boss@example.com", "root@example.com"]
+    members = (await users(client, admin, role="user"))["items"]
+    assert len(members) == 3 and {user["role"] for user in members} == {"user"}
+
+
+async def test_email_prefix_wildcards_are_literal(client, make_user, admin):
+    for email in ("a_b@example.com", "axb@example.com", "a%b@example.com", "abc@example.com"):
+        make_user(email=email)
+
+    for prefix, expected in (("a_", ["a_b@example.com"]), ("a%", ["a%b@example.com"]),
+                             ("ab", ["abc@example.com"])):
+        page = await users(client, admin, email_prefix=prefix)
+        assert [user["email"] for user in page["items"]] == expected
+
+
+async def test_star_in_email_prefix_is_rejected(client, admin):
+    response = await client.get("/api/admin/users", params={"email_prefix": "a*"}, headers=admin)
+    assert response.status_code == 422
+
+
+async def test_total_only_when_counted(client, make_user, admin):
+    for i in range(4):
+        make_user(email=f"member{i}@example.com")
+
+    assert (await users(client, admin, limit=1))["total"] is None
+    page = await users(client, admin, limit=1, count="exact")
+    assert len(page["items"]) == 1 and page["total"] == 5
+    assert (await users(client, admin, limit=1, role="user", count="estimated"))["total"] == 4
+    assert (await users(client, admin, email_prefix="member1", count="exact"))["total"] == 1
+
+
+async def test_paging_reaches_the_end(client, make_user, admin):
+    expected = {"root@example.com"} | {f"member{i}@example.com" for i in range(7)}
+    for email in sorted(expected - {"root@example.com"}):
+        make_user(email=email)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await users(client, admin, limit=3, **({"cursor": cursor} if cursor else {}))
+        seen += [user["email"] for user in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 8
+    assert set(seen) == expected
+
+
+async def test_bad_cursor_is_400(client, admin):
+    response = await client.get("/api/admin/users", params={"cursor": "garbage"}, headers=admin)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
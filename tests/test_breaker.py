@@ -0,0 +1,96 @@
+"""
+Circuit breaker: while Supabase fails, the feed is served from its last good
+copy; once the breaker opens, calls fail fast with 503 and ``Retry-After``.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def outage(server, client, store, make_user):
+    """A feed that was served once, then a Supabase returning 503 to every select."""
+    _, headers = make_user()
+    (await client.post("/api/announcements", headers=headers,
+                       json={"title": "Cached", "content": "Body"})).raise_for_status()
+    good = await client.get("/api/announcements")
+    assert good.status_code == 200
+    store.fail('announcements', 'select', code='503')
+    # A write elsewhere: the next read has to go to the database
+    server.feed_cache.invalidate()
+    return good
+
+
+async def test_failing_upstream_serves_the_last_good_feed(client, outage):
+    response = await client.get("/api/announcements")
+    assert response.status_code == 200
+    assert response.content == outage.content
+    assert response.headers["etag"] == outage.headers["etag"]
+    assert response.headers["warning"] == '110 - "Response is Stale"'
+    assert "age" in response.headers
+
+
+async def test_open_breaker_fails_fast(server, client, store, outage):
+    while server.db.breaker.state != "open":
+        assert (await client.get("/api/announcements")).status_code == 200
+    calls = store.calls
+
+    # Nothing cached for this page: 503 without calling Supabase
+    response = await client.get("/api/announcements", params={"limit": 5})
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    stale = await client.get("/api/announcements")
+    assert stale.status_code == 200 and "warning" in stale.headers
+    assert store.calls == calls
+
+
+async def test_breaker_closes_after_a_successful_trial(server, client, store, outage):
+    while server.db.breaker.state != "open":
+        await client.get("/api/announcements")
+    store.heal()
+    server.db.breaker.reset_timeout = 0
+
+    response = await client.get("/api/announcements", params={"limit": 5})
+    assert response.status_code == 200
+    assert "warning" not in response.headers
+    assert server.db.breaker.state == "closed"
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "coalesced"])
+async def open_breaker(request, server, client, store, make_user, monkeypatch):
+    """Inserts failing until the breaker opens, with the caller's and an admin's
+    user records already cached. Returns ``(user headers, admin headers)``."""
+    if request.param:
+        monkeypatch.setattr(server, 'WRITE_COALESCING_ENABLED', True)
+        server.init_repositories(store)
+    _, headers = make_user(email="member@example.com")
+    _, admin = make_user(role="admin")
+    for auth in (headers, admin):
+        (await client.get("/api/auth/user", headers=auth)).raise_for_status()
+    store.fail('announcements', 'insert', code='503')
+    while server.db.breaker.state != "open":
+        response = await client.post("/api/announcements", headers=headers, json={"title": "Lost", "content": "Body"})
+        assert response.status_code == 500
+    yield headers, admin
+    if server.announcement_writer is not None:
+        await server.announcement_writer.close()
+
+
+@pytest.mark.parametrize("call", ["create", "update", "delete", "bulk", "signin", "admin users"])
+async def test_open_breaker_is_503_on_every_endpoint(server, client, store, open_breaker, call):
+    headers, admin = open_breaker
+    calls = store.calls
+    missing = "00000000-0000-0000-0000-000000000000"
+    response = await {
+        "create": lambda: client.post("/api/announcements", headers=headers, json={"title": "T", "content": "B"}),
+        "update": lambda: client.put(f"/api/announcements/{missing}", headers=headers, json={"title": "T", "content": "B"}),
+        "delete": lambda: client.delete(f"/api/announcements/{missing}", headers=headers),
+        "bulk": lambda: client.post("/api/announcements/bulk", headers=headers,
+                                    json={"items": [{"title": "T", "content": "B"}]}),
+        "signin": lambda: client.post("/api/auth/signin", json={"email": "member@example.com", "password": "secret123"}),
+        "admin users": lambda: client.get("/api/admin/users", headers=admin),
+    }[call]()
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    assert store.calls == calls
@@ -0,0 +1,115 @@
+"""
+Bulk endpoints when some chunks of the write fail.
+
+Chunks commit independently, so a failure part way through must still report
+each item's status, and everything derived from the rows that were written
+(feed cache, search index, stats, streams, the user cache) must follow them.
+"""
+
+import pytest
+
+import repository
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Chunks run concurrently in no fixed order; 30 items make three equal ones
+    monkeypatch.setattr(repository, 'INSERT_CHUNK', 10)
+    monkeypatch.setattr(repository, 'IN_FILTER_CHUNK', 10)
+
+
+async def feed_ids(client):
+    response = await client.get("/api/announcements", params={"limit": 100})
+    response.raise_for_status()
+    return {item["id"] for item in response.json()["items"]}
+
+
+async def bulk_create(client, headers, count):
+    return await client.post("/api/announcements/bulk", headers=headers,
+                             json={"items": [{"title": f"Zeppelin {i}", "content": "Body"} for i in range(count)]})
+
+
+async def test_partly_failed_bulk_create_reports_and_publishes_what_was_written(server, client, store, make_user):
+    _, headers = make_user()
+    assert await feed_ids(client) == set()
+    subscriber = server.broadcaster.subscribe()
+    store.fail('announcements', 'insert', calls=[2])
+
+    response = await bulk_create(client, headers, 30)
+    assert response.status_code == 200
+    body = response.json()
+    assert not body["success"]
+    assert body["created"] == 20
+    created = {result["id"] for result in body["results"] if result["status"] == "created"}
+    failed = {result["id"] for result in body["results"] if result["status"] == "failed"}
+    assert len(created) == 20 and len(failed) == 10
+
+    assert {row["id"] for row in store.tables["announcements"]} == created
+    assert await feed_ids(client) == created
+    assert {hit["id"] for hit in server.search_index.search("zeppelin", 100)} == created
+    assert len(server.announcement_stats) == 20
+    frame = subscriber.queue.get_nowait().replace(b" ", b"")
+    assert b"\nevent:bulk\n" in frame and b'{"action":"created","count":20}' in frame
+    server.broadcaster.unsubscribe(subscriber)
+
+
+async def test_bulk_create_that_writes_nothing_fails(client, store, make_user):
+    _, headers = make_user()
+    store.fail('announcements', 'insert')
+    assert (await bulk_create(client, headers, 25)).status_code == 500
+    assert store.tables["announcements"] == []
+
+
+async def test_partly_failed_bulk_delete_reports_and_publishes_what_was_deleted(server, client, store, make_user):
+    _, headers = make_user()
+    ids = [result["id"] for result in (await bulk_create(client, headers, 30)).json()["results"]]
+    assert len(await feed_ids(client)) == 30
+    store.fail('announcements', 'delete', calls=[1])
+
+    response = await client.post("/api/announcements/bulk-delete", headers=headers, json={"ids": ids})
+    assert response.status_code == 200
+    body = response.json()
+    assert not body["success"]
+    assert body["deleted"] == 20
+    statuses = {result["id"]: result["status"] for result in body["results"]}
+    kept = {announcement_id for announcement_id, status in statuses.items() if status == "failed"}
+    assert len(kept) == 10
+    assert set(statuses.values()) == {"deleted", "failed"}
+
+    assert {row["id"] for row in store.tables["announcements"]} == kept
+    assert await feed_ids(client) == kept
+    assert {hit["id"] for hit in server.search_index.search("zeppelin", 100)} == kept
+    assert len(server.announcement_stats) == 10
+
+
+async def test_partly_failed_role_update_evicts_every_updated_user(client, store, make_user):
+    _, admin_headers = make_user(role="admin")
+    users = dict(make_user() for _ in range(30))
+    for headers in users.values():
+        # Cache every user with the role "user"
+        assert (await client.get("/api/auth/user", headers=headers)).json()["user"]["role"] == "user"
+    store.fail('users', 'update', calls=[3])
+
+    response = await client.put("/api/admin/users/roles", headers=admin_headers,
+                                json={"updates": [{"user_id": user_id, "role": "admin"} for user_id in users]})
+    assert response.status_code == 200
+    body = response.json()
+    assert not body["success"]
+    assert body["updated"] == 20
+    statuses = {result["user_id"]: result["status"] for result in body["results"]}
+    assert sorted(statuses.values()).count("failed") == 10
+
+    for user_id, headers in users.items():
+        role = (await client.get("/api/auth/user", headers=headers)).json()["user"]["role"]
+        assert role == ("admin" if statuses[user_id] == "updated" else "user")
+
+
+async def test_role_update_that_writes_nothing_fails(client, store, make_user):
+    _, admin_headers = make_user(role="admin")
+    user_id, _ = make_user()
+    store.fail('users', 'update')
+    response = await client.put("/api/admin/users/roles", headers=admin_headers,
+                                json={"updates": [{"user_id": user_id, "role": "admin"}]})
+    assert response.status_code == 500
@@ -0,0 +1,73 @@
+"""
+Write coalescing: concurrent creates share one bulk insert, each caller gets
+its own row or its own error, and an outage reaches everyone waiting.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+
+from memory_backend import InMemoryAPIError
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def writer(server, store, monkeypatch):
+    monkeypatch.setattr(server, 'WRITE_COALESCING_ENABLED', True)
+    # Long enough for every concurrent request below to join the batch
+    monkeypatch.setattr(server, 'WRITE_COALESCING_MAX_DELAY_MS', 50)
+    server.init_repositories(store)
+    yield server.announcement_writer
+    await server.announcement_writer.close()
+
+
+def announcement(title, announcement_id=None):
+    now = datetime.utcnow().isoformat()
+    return {'id': announcement_id or str(uuid.uuid4()), 'title': title, 'content': 'Body',
+            'author_id': 'a', 'author_email': 'a@example.com', 'created_at': now, 'updated_at': now}
+
+
+async def test_concurrent_creates_share_one_insert(client, store, make_user, writer):
+    _, headers = make_user()
+    responses = await asyncio.gather(*(
+        client.post("/api/announcements", headers=headers, json={"title": f"Post {i}", "content": "Body"})
+        for i in range(8)))
+
+    assert [response.status_code for response in responses] == [200] * 8
+    # Each caller got back its own row
+    assert [response.json()["title"] for response in responses] == [f"Post {i}" for i in range(8)]
+    assert len({response.json()["id"] for response in responses}) == 8
+    assert (writer.batches, writer.rows) == (1, 8)
+    assert store.attempts("announcements", "insert") == 1
+    assert len(store.tables["announcements"]) == 8
+
+
+async def test_bad_row_is_split_out_of_its_batch(store, writer):
+    taken = str(uuid.uuid4())
+    store.tables["announcements"].append(announcement("Existing", taken))
+
+    results = await asyncio.gather(*(writer.submit(row) for row in (
+        announcement("First"), announcement("Duplicate", taken), announcement("Last"))), return_exceptions=True)
+
+    first, duplicate, last = results
+    assert (first["title"], last["title"]) == ("First", "Last")
+    assert isinstance(duplicate, InMemoryAPIError) and duplicate.code == '23505'
+    assert writer.split_batches == 1
+    assert sorted(row["title"] for row in store.tables["announcements"]) == ["Existing", "First", "Last"]
+
+
+async def test_outage_reaches_every_waiting_caller(store, writer):
+    store.fail('announcements', 'insert', code='503')
+
+    results = await asyncio.gather(*(writer.submit(announcement(f"Post {i}")) for i in range(5)),
+                                   return_exceptions=True)
+
+    assert all(isinstance(result, InMemoryAPIError) and result.code == '503' for result in results)
+    assert len({id(result) for result in results}) == 1
+    # Not retried row by row: that would only add load to a failing database
+    assert writer.split_batches == 0
+    assert store.attempts("announcements", "insert") == 1
+    assert store.tables["announcements"] == []
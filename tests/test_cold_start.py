@@ -0,0 +1,112 @@
+"""
+Cold start regressions: what ``import server`` loads, how long it takes, and
+how soon a fresh process serves its first Supabase-backed request.
+
+Budgets are deliberately loose so that they only catch real regressions (such
+as the Supabase client being built at import time again); override them with
+COLD_START_MAX_IMPORT_MS and COLD_START_MAX_FIRST_REQUEST_MS on slow machines.
+``benchmarks/cold_start.py`` prints the detailed report.
+"""
+
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+MAX_IMPORT_MS = float(os.environ.get('COLD_START_MAX_IMPORT_MS', '1500'))
+MAX_FIRST_REQUEST_MS = float(os.environ.get('COLD_START_MAX_FIRST_REQUEST_MS', '5000'))
+HEAVY_PACKAGES = {"supabase", "supabase_auth", "realtime", "storage3", "postgrest", "httpx",
+                  "pandas", "numpy", "boto3", "pymongo", "motor"}
+
+
+def environment(**extra):
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR), WORKER_SYNC_DIR="", **extra)
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_ANON_KEY", "cold-start")
+    env.setdefault("JWT_SECRET", "cold-start")
+    return env
+
+
+def run_python(code, *flags):
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=BACKEND_DIR, env=environment(),
+                          capture_output=True, text=True, check=True)
+
+
+class EmptyTables(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Range", "*/0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EmptyTables)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def test_import_leaves_supabase_client_unbuilt():
+    code = ("import json, sys, server; print(json.dumps({'modules': sorted(sys.modules), "
+            "'connected': server.supabase.connected, 'http_client': server.http_client is not None}))")
+    report = json.loads(run_python(code).stdout.splitlines()[-1])
+    assert not report["connected"]
+    assert not report["http_client"]
+    assert HEAVY_PACKAGES.isdisjoint(report["modules"])
+
+
+def test_import_time_budget():
+    stderr = run_python("import server", "-X", "importtime").stderr
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| server$", stderr, re.MULTILINE)
+    assert int(match.group(1)) / 1000 < MAX_IMPORT_MS
+
+
+def test_first_request_budget(upstream):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=environment(SUPABASE_URL=f"http://127.0.0.1:{upstream.server_address[1]}"),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            while True:
+                try:
+                    response = client.get("/api/announcements")
+                    break
+                except httpx.TransportError:
+                    assert time.perf_counter() - started < 60, "server did not start"
+                    time.sleep(0.005)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    assert upstream.requests > 0
+    assert elapsed_ms < MAX_FIRST_REQUEST_MS
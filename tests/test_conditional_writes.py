@@ -0,0 +1,55 @@
+"""
+Announcement update/delete with ownership folded into the write filter: one
+round trip when allowed, and 403 versus 404 when the write matches nothing.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def announcement(client, make_user):
+    owner_id, owner = make_user()
+    response = await client.post("/api/announcements", headers=owner, json={"title": "Mine", "content": "Body"})
+    response.raise_for_status()
+    return response.json(), owner
+
+
+async def write(client, method, announcement_id, headers):
+    if method == "put":
+        return await client.put(f"/api/announcements/{announcement_id}", headers=headers,
+                                json={"title": "Edited", "content": "Body"})
+    return await client.delete(f"/api/announcements/{announcement_id}", headers=headers)
+
+
+@pytest.mark.parametrize("method", ["put", "delete"])
+async def test_owner_writes_in_one_round_trip(client, store, announcement, method):
+    row, owner = announcement
+    calls = store.calls
+    assert (await write(client, method, row["id"], owner)).status_code == 200
+    assert store.calls == calls + 1
+
+
+@pytest.mark.parametrize("method", ["put", "delete"])
+async def test_admin_may_write_any_announcement(client, make_user, announcement, method):
+    row, _ = announcement
+    _, admin = make_user(role="admin")
+    assert (await write(client, method, row["id"], admin)).status_code == 200
+
+
+@pytest.mark.parametrize("method", ["put", "delete"])
+async def test_other_user_gets_403_and_nothing_changes(client, store, make_user, announcement, method):
+    row, _ = announcement
+    _, other = make_user()
+    response = await write(client, method, row["id"], other)
+    assert response.status_code == 403
+    assert [stored["title"] for stored in store.tables["announcements"]] == ["Mine"]
+
+
+@pytest.mark.parametrize("role", ["user", "admin"])
+@pytest.mark.parametrize("method", ["put", "delete"])
+async def test_missing_announcement_is_404(client, make_user, method, role):
+    _, headers = make_user(role=role)
+    response = await write(client, method, "00000000-0000-0000-0000-000000000000", headers)
+    assert response.status_code == 404
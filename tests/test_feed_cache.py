@@ -0,0 +1,92 @@
+"""
+Announcement feed cache: ETag / 304 revalidation, and invalidation by writes.
+"""
+
+import pytest
+
+from caching import FeedCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def create(client, headers, title="Post"):
+    response = await client.post("/api/announcements", headers=headers, json={"title": title, "content": "Body"})
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_repeat_request_is_served_from_cache_and_revalidates(client, store, make_user):
+    _, headers = make_user()
+    await create(client, headers)
+
+    first = await client.get("/api/announcements")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    calls = store.calls
+
+    again = await client.get("/api/announcements")
+    assert again.content == first.content
+    assert again.headers["etag"] == etag
+
+    revalidated = await client.get("/api/announcements", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert store.calls == calls
+
+
+@pytest.mark.parametrize("write", ["create", "update", "delete"])
+async def test_write_invalidates_the_feed(client, make_user, write):
+    _, headers = make_user()
+    existing = await create(client, headers, "Original")
+    etag = (await client.get("/api/announcements")).headers["etag"]
+
+    if write == "create":
+        await create(client, headers, "Newer")
+    elif write == "update":
+        response = await client.put(f"/api/announcements/{existing['id']}", headers=headers,
+                                    json={"title": "Edited", "content": "Body"})
+        response.raise_for_status()
+    else:
+        (await client.delete(f"/api/announcements/{existing['id']}", headers=headers)).raise_for_status()
+
+    response = await client.get("/api/announcements", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    titles = [item["title"] for item in response.json()["items"]]
+    assert titles == {"create": ["Newer", "Original"], "update": ["Edited"], "delete": []}[write]
+
+
+def test_body_read_before_an_invalidation_is_not_cached():
+    cache = FeedCache()
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("feed", b"[]", generation)
+    assert cache.get("feed") is None
+
+    cache.put("feed", b"[1]", cache.generation)
+    assert cache.get("feed")[0] == b"[1]"
+
+
+async def test_each_content_coding_has_its_own_etag(client, make_user):
+    _, headers = make_user()
+    for i in range(20):
+        await create(client, headers, f"Post {i}")
+
+    etags = {}
+    for encoding in ("identity", "gzip", "br"):
+        response = await client.get("/api/announcements", headers={"Accept-Encoding": encoding})
+        assert response.headers.get("content-encoding", "identity") == encoding
+        etags[encoding] = response.headers["etag"]
+    assert etags["gzip"] == etags["identity"][:-1] + '-gzip"'
+    assert etags["br"] == etags["identity"][:-1] + '-br"'
+
+    # Revalidating with one coding's ETag holds for the others while the content is unchanged
+    response = await client.get("/api/announcements", headers={"Accept-Encoding": "gzip", "If-None-Match": etags["br"]})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etags["gzip"]
+
+    await create(client, headers, "Newer")
+    response = await client.get("/api/announcements", headers={"Accept-Encoding": "br", "If-None-Match": etags["br"]})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etags["br"]
@@ -0,0 +1,64 @@
+"""
+Sparse fieldsets (`fields=`) and previews on the announcement reads.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def posts(server, client, make_user, monkeypatch):
+    monkeypatch.setattr(server, 'PREVIEW_LENGTH', 10)
+    _, headers = make_user()
+    created = []
+    for content in ("Short", "A good deal longer than ten characters"):
+        response = await client.post("/api/announcements", headers=headers, json={"title": "Post", "content": content})
+        response.raise_for_status()
+        created.append(response.json())
+    return created
+
+
+@pytest.mark.parametrize("path", ["/api/announcements", "/api/announcements/{id}"])
+@pytest.mark.parametrize("fields, detail", [
+    ("title,password_hash", "Unknown fields: password_hash"),
+    ("", "fields must name at least one field"),
+    (" , ,", "fields must name at least one field"),
+])
+async def test_bad_fields_are_400(client, posts, path, fields, detail):
+    response = await client.get(path.format(id=posts[0]["id"]), params={"fields": fields})
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+async def test_projection_keeps_the_requested_order(client, posts):
+    page = (await client.get("/api/announcements", params={"fields": "title,id,title"})).json()
+    assert [list(item) for item in page["items"]] == [["title", "id"]] * 2
+    # The cursor still works though created_at was not asked for
+    page = (await client.get("/api/announcements", params={"fields": "title", "limit": 1})).json()
+    assert page["next_cursor"]
+    rest = (await client.get("/api/announcements", params={"fields": "title", "cursor": page["next_cursor"]})).json()
+    assert len(rest["items"]) == 1 and rest["next_cursor"] is None
+
+
+async def test_preview_truncates_and_flags(client, posts):
+    items = (await client.get("/api/announcements", params={"preview": "true"})).json()["items"]
+    by_id = {item["id"]: item for item in items}
+    assert (by_id[posts[0]["id"]]["content"], by_id[posts[0]["id"]]["truncated"]) == ("Short", False)
+    assert (by_id[posts[1]["id"]]["content"], by_id[posts[1]["id"]]["truncated"]) == ("A good dea", True)
+
+    # Without content there is nothing to truncate
+    items = (await client.get("/api/announcements", params={"preview": "true", "fields": "id"})).json()["items"]
+    assert all(list(item) == ["id"] for item in items)
+
+
+async def test_single_read_returns_full_content(client, posts):
+    long_post = posts[1]
+    full = (await client.get(f"/api/announcements/{long_post['id']}")).json()
+    assert full == long_post
+
+    sparse = (await client.get(f"/api/announcements/{long_post['id']}", params={"fields": "content,id"})).json()
+    assert list(sparse.items()) == [("content", long_post["content"]), ("id", long_post["id"])]
+
+    missing = await client.get("/api/announcements/00000000-0000-0000-0000-000000000000", params={"fields": "id"})
+    assert missing.status_code == 404
@@ -0,0 +1,117 @@
+"""
+Schema migrations and index usage.
+
+Every test runs against a throwaway SQLite database. With TEST_DATABASE_URL
+set to a Postgres server (and psycopg installed) they also run against a
+scratch database created on that server and dropped afterwards.
+
+The EXPLAIN tests check that each query in ``migrate.HOT_QUERIES`` goes
+through its index and doesn't sort to satisfy its ORDER BY, and that the
+check notices when the indexes are missing.
+"""
+
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import migrate  # noqa: E402
+
+POSTGRES_URL = os.environ.get('TEST_DATABASE_URL')
+LATEST = max(m.version for m in migrate.discover())
+
+
+def sqlite_database(tmp_path):
+    db = migrate.connect(f"sqlite:///{tmp_path / 'teamhub.db'}")
+    yield db
+    db.close()
+
+
+def postgres_database():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    psycopg = pytest.importorskip("psycopg")
+    name = f"teamhub_migrations_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(POSTGRES_URL, autocommit=True) as admin:
+        admin.execute(f'CREATE DATABASE "{name}"')
+    db = migrate.PostgresDatabase(psycopg.conninfo.make_conninfo(POSTGRES_URL, dbname=name))
+    try:
+        yield db
+    finally:
+        db.close()
+        with psycopg.connect(POSTGRES_URL, autocommit=True) as admin:
+            admin.execute(f'DROP DATABASE "{name}"')
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def database(request, tmp_path):
+    if request.param == 'sqlite':
+        yield from sqlite_database(tmp_path)
+    else:
+        yield from postgres_database()
+
+
+def seed(db, users=300, announcements=2000):
+    for i in range(users):
+        db.query("INSERT INTO users (id, email, password_hash, role, created_at) VALUES (?, ?, ?, ?, ?)",
+                 (f'00000000-0000-0000-0000-{i:012d}', f'user{i}@example.com', 'x',
+                  'admin' if i % 20 == 0 else 'user', f'2024-01-01T00:00:00.{i:06d}+00:00'))
+    for i in range(announcements):
+        db.query("INSERT INTO announcements (id, title, content, author_id, author_email, created_at) "
+                 "VALUES (?, ?, ?, ?, ?, ?)",
+                 (f'10000000-0000-0000-0000-{i:012d}', f'Announcement {i}', 'Body',
+                  f'00000000-0000-0000-0000-{i % users:012d}', f'user{i % users}@example.com',
+                  f'2024-02-01T00:00:00.{i:06d}+00:00'))
+    db.query("ANALYZE")
+
+
+def test_applies_every_migration_once(database):
+    applied = migrate.migrate(database)
+    assert [m.version for m in applied] == list(range(1, LATEST + 1))
+    assert migrate.applied_versions(database) == list(range(1, LATEST + 1))
+    assert migrate.migrate(database) == []
+    assert migrate.pending(database) == []
+
+
+def test_target_applies_a_prefix(database):
+    assert [m.version for m in migrate.migrate(database, target=1)] == [1]
+    assert [m.version for m in migrate.pending(database)] == list(range(2, LATEST + 1))
+    assert [m.version for m in migrate.migrate(database)] == list(range(2, LATEST + 1))
+
+
+def test_failed_migration_leaves_nothing_behind(database, tmp_path):
+    directory = tmp_path / 'migrations'
+    directory.mkdir()
+    (directory / '0001_create_widgets.sql').write_text("CREATE TABLE widgets (id INTEGER PRIMARY KEY);")
+    (directory / '0002_broken.sql').write_text(
+        "CREATE TABLE gadgets (id INTEGER PRIMARY KEY);\nINSERT INTO no_such_table VALUES (1);")
+    migrations = migrate.discover(directory)
+
+    with pytest.raises(migrate.MigrationError, match='0002_broken'):
+        migrate.migrate(database, migrations=migrations)
+    assert migrate.applied_versions(database) == [1]
+    database.query("SELECT * FROM widgets")
+    with pytest.raises(Exception):
+        database.query("SELECT * FROM gadgets")
+
+
+def test_hot_queries_use_their_indexes(database):
+    migrate.migrate(database)
+    seed(database)
+    report = migrate.explain_hot_queries(database)
+    assert report
+    for name, result in report.items():
+        assert result['uses_index'], f"{name} does not use {result['index']}:\n{result['plan']}"
+        if result['ordered']:
+            assert not result['sorts'], f"{name} sorts instead of reading {result['index']} in order:\n{result['plan']}"
+
+
+def test_check_notices_missing_indexes(database):
+    migrate.migrate(database, target=1)
+    seed(database)
+    for name, result in migrate.explain_hot_queries(database).items():
+        assert not result['uses_index'], f"{name} uses {result['index']} before it exists"
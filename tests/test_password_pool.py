@@ -0,0 +1,82 @@
+"""
+bcrypt pool back-pressure: sign-up and sign-in shed load with 503 and
+``Retry-After`` when the pool is full or a job overruns its timeout.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import passwords
+from passwords import PasswordPool
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """bcrypt calls block until the event is set."""
+    release = threading.Event()
+
+    def blocked(result):
+        def run(*args):
+            release.wait(5)
+            return result
+        return run
+
+    monkeypatch.setattr(passwords, '_hash', blocked('hashed'))
+    monkeypatch.setattr(passwords, '_check', blocked(True))
+    yield release
+    release.set()
+
+
+@pytest.fixture
+def pool(server, monkeypatch):
+    pools = []
+
+    def make(timeout=5.0):
+        # One worker and no queue: a single job in flight saturates it
+        pool = PasswordPool(workers=1, max_queue=0, timeout=timeout)
+        monkeypatch.setattr(server, 'password_pool', pool)
+        pools.append(pool)
+        return pool
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def signup(client, email):
+    return client.post("/api/auth/signup", json={"email": email, "password": "secret123"})
+
+
+def signin(client, email):
+    return client.post("/api/auth/signin", json={"email": email, "password": "secret123"})
+
+
+def assert_busy(response):
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+async def test_saturated_pool_is_503(client, make_user, gate, pool):
+    pool = pool()
+    make_user(email="member@example.com")
+    first = asyncio.ensure_future(signup(client, "first@example.com"))
+    while pool.pending < 1:
+        await asyncio.sleep(0.001)
+
+    assert_busy(await signup(client, "second@example.com"))
+    assert_busy(await signin(client, "member@example.com"))
+    assert pool.rejected == 2
+
+    gate.set()
+    assert (await first).status_code == 200
+
+
+@pytest.mark.parametrize("call", [signup, signin])
+async def test_job_over_its_timeout_is_503(client, make_user, gate, pool, call):
+    pool = pool(timeout=0.05)
+    make_user(email="member@example.com")
+    assert_busy(await call(client, "member@example.com" if call is signin else "new@example.com"))
+    assert pool.rejected == 1
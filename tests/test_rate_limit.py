@@ -0,0 +1,47 @@
+"""
+Auth rate limiting: per client IP and per target email, answered with 429 and
+``Retry-After`` before any password hashing or database work.
+"""
+
+import pytest
+
+from ratelimit import TokenBucketLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def limits(server, monkeypatch):
+    monkeypatch.setattr(server, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(server, 'rate_limiters', {
+        ('signin', 'ip'): TokenBucketLimiter(5, 5 / 60),
+        ('signin', 'email'): TokenBucketLimiter(3, 3 / 60),
+        ('signup', 'ip'): TokenBucketLimiter(5, 5 / 60),
+        ('signup', 'email'): TokenBucketLimiter(3, 3 / 60),
+    })
+
+
+async def signin(client, email):
+    return await client.post("/api/auth/signin", json={"email": email, "password": "wrong"})
+
+
+async def test_repeated_signins_for_one_email_get_429(client, store, limits):
+    assert [(await signin(client, "victim@example.com")).status_code for _ in range(3)] == [401] * 3
+    calls = store.calls
+
+    response = await signin(client, "Victim@Example.com ")
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["retry-after"]) <= 20
+    assert store.calls == calls
+
+
+async def test_one_client_spraying_emails_gets_429(client, limits):
+    statuses = [(await signin(client, f"user{i}@example.com")).status_code for i in range(7)]
+    assert statuses == [401] * 5 + [429] * 2
+
+
+async def test_signup_is_limited_separately(client, limits):
+    for i in range(5):
+        assert (await signin(client, f"user{i}@example.com")).status_code == 401
+    response = await client.post("/api/auth/signup", json={"email": "new@example.com", "password": "pw"})
+    assert response.status_code == 200
@@ -0,0 +1,80 @@
+"""
+Search index: built from the whole table at startup, kept current by writes,
+and rebuilt to recover from a failed build or missed changes.
+"""
+
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def seed(store, rows):
+    for i in range(rows):
+        store.tables['announcements'].append({
+            'id': f'10000000-0000-0000-0000-{i:012d}', 'title': f'Announcement {i}',
+            'content': 'weekly' if i else 'zeppelin', 'author_id': 'a', 'author_email': 'a@example.com',
+            'created_at': f'2024-01-01T00:00:00.{i:06d}', 'updated_at': f'2024-01-01T00:00:00.{i:06d}',
+        })
+
+
+async def test_build_reads_past_the_upstream_row_cap(server, store):
+    # PostgREST answers any select with at most max-rows rows
+    store.max_rows = 1000
+    seed(store, 2500)
+    await server.build_search_index()
+    assert len(server.search_index) == 2500
+    # The oldest announcement is the last one a capped select would have dropped
+    assert [hit['id'] for hit in server.search_index.search('zeppelin')] == ['10000000-0000-0000-0000-000000000000']
+
+
+async def test_writes_update_the_index(client, make_user):
+    _, headers = make_user()
+    created = (await client.post("/api/announcements", headers=headers,
+                                 json={"title": "Hangar inspection", "content": "Thursday"})).json()
+    hits = (await client.get("/api/announcements/search", params={"q": "hangar"})).json()
+    assert [hit["id"] for hit in hits] == [created["id"]]
+
+    (await client.put(f"/api/announcements/{created['id']}", headers=headers,
+                      json={"title": "Runway inspection", "content": "Thursday"})).raise_for_status()
+    assert (await client.get("/api/announcements/search", params={"q": "hangar"})).json() == []
+
+    (await client.delete(f"/api/announcements/{created['id']}", headers=headers)).raise_for_status()
+    assert (await client.get("/api/announcements/search", params={"q": "runway"})).json() == []
+
+
+async def wait_for_hits(client, query, timeout=5):
+    async def poll():
+        while True:
+            hits = (await client.get("/api/announcements/search", params={"q": query})).json()
+            if hits:
+                return hits
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(poll(), timeout)
+
+
+async def test_failed_build_is_retried(server, client, store, monkeypatch):
+    seed(store, 1)
+    store.fail('announcements', 'select', calls=[1])
+    await server.build_search_index()
+    assert not server.search_index.built
+    assert (await client.get("/api/announcements/search", params={"q": "zeppelin"})).json() == []
+
+    monkeypatch.setattr(server, 'HEALTH_PROBE_INTERVAL', 0)
+    monkeypatch.setattr(server, 'SEARCH_INDEX_REBUILD_INTERVAL', 0)
+    # With no periodic rebuilds the task ends once a build succeeds
+    await asyncio.wait_for(server.run_search_index_rebuilds(), 5)
+    assert [hit["title"] for hit in await wait_for_hits(client, "zeppelin")] == ["Announcement 0"]
+
+
+async def test_periodic_rebuild_picks_up_missed_changes(server, client, store, monkeypatch):
+    await server.build_search_index()
+    # Written behind this worker's back, e.g. its bus datagram was dropped
+    seed(store, 1)
+    monkeypatch.setattr(server, 'SEARCH_INDEX_REBUILD_INTERVAL', 0.01)
+    task = asyncio.ensure_future(server.run_search_index_rebuilds())
+    try:
+        assert len(await wait_for_hits(client, "zeppelin")) == 1
+    finally:
+        task.cancel()
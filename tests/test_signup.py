@@ -0,0 +1,38 @@
+"""
+Sign-up is a single insert; the unique email constraint turns a duplicate
+into 400 rather than a 500 or a second account.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def signup(client, email):
+    return await client.post("/api/auth/signup", json={"email": email, "password": "pw"})
+
+
+async def test_new_signup_is_one_insert(client, store):
+    calls = store.calls
+    response = await signup(client, "new@example.com")
+    assert response.status_code == 200
+    assert response.json()["user"]["email"] == "new@example.com"
+    assert store.calls == calls + 1
+
+
+async def test_duplicate_signup_hits_the_unique_constraint(client, store, make_user):
+    # Created behind the API's back, so only the database knows the email is taken
+    make_user("taken@example.com")
+    response = await signup(client, "taken@example.com")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User already exists"
+    assert [user["email"] for user in store.tables["users"]] == ["taken@example.com"]
+
+
+async def test_repeat_signup_is_answered_without_the_database(client, store):
+    assert (await signup(client, "twice@example.com")).status_code == 200
+    calls = store.calls
+    response = await signup(client, "twice@example.com")
+    assert response.status_code == 400
+    assert store.calls == calls
+    assert len(store.tables["users"]) == 1
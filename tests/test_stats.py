@@ -0,0 +1,118 @@
+"""
+Announcement stats: counters kept current by the write path, corrected by a
+reconcile, and rebuilds that never overlap.
+"""
+
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def seed(store, i, author='a'):
+    store.tables['announcements'].append({
+        'id': f'10000000-0000-0000-0000-{i:012d}', 'title': f'Announcement {i}', 'content': 'Body',
+        'author_id': author, 'author_email': f'{author}@example.com',
+        'created_at': f'2024-01-01T00:00:00.{i:06d}', 'updated_at': f'2024-01-01T00:00:00.{i:06d}',
+    })
+
+
+async def stats(client, headers):
+    response = await client.get("/api/announcements/stats", headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def create(client, headers, title="Post"):
+    response = await client.post("/api/announcements", headers=headers, json={"title": title, "content": "Body"})
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_writes_update_the_counters(server, client, make_user):
+    author_id, headers = make_user()
+    await server.reconcile_announcement_stats()
+    assert (await stats(client, headers))["total"] == 0
+
+    first = await create(client, headers)
+    (await client.put(f"/api/announcements/{first['id']}", headers=headers,
+                      json={"title": "Edited", "content": "Body"})).raise_for_status()
+    (await client.post("/api/announcements/bulk", headers=headers,
+                       json={"items": [{"title": f"Bulk {i}", "content": "Body"} for i in range(3)]})).raise_for_status()
+    summary = await stats(client, headers)
+    assert summary["total"] == 4
+    assert [(entry["author_id"], entry["count"]) for entry in summary["by_author"]] == [(author_id, 4)]
+    assert summary["by_day"][0]["count"] == 4
+
+    (await client.delete(f"/api/announcements/{first['id']}", headers=headers)).raise_for_status()
+    assert (await stats(client, headers))["total"] == 3
+
+
+async def test_reconcile_corrects_drift(server, client, store, make_user):
+    _, headers = make_user()
+    await server.reconcile_announcement_stats()
+    # Written behind the API's back, so only a recount can see it
+    seed(store, 0)
+    assert (await stats(client, headers))["total"] == 0
+
+    await server.reconcile_announcement_stats()
+    assert (await stats(client, headers))["total"] == 1
+    assert server.announcement_stats.corrections == 1
+
+
+async def test_overlapping_reconciles_keep_changes_made_during_the_scan(server, client, store, make_user, monkeypatch):
+    _, headers = make_user()
+    seed(store, 0)
+    first_read, second_done = asyncio.Event(), asyncio.Event()
+    list_page = server.announcement_repo.list_page
+    calls = 0
+
+    async def slow_first_scan(*args):
+        nonlocal calls
+        calls += 1
+        rows = await list_page(*args)
+        if calls == 1:
+            first_read.set()
+            # Give a second reconcile every chance to run in the middle of this one
+            try:
+                await asyncio.wait_for(second_done.wait(), 0.2)
+            except asyncio.TimeoutError:
+                pass
+        return rows
+
+    monkeypatch.setattr(server.announcement_repo, 'list_page', slow_first_scan)
+    first = asyncio.ensure_future(server.reconcile_announcement_stats())
+    await first_read.wait()
+    # Written after the first scan read the table, so only its replay can count it
+    await create(client, headers)
+    await server.reconcile_announcement_stats()
+    second_done.set()
+    await first
+
+    assert (await stats(client, headers))["total"] == 2
+    assert server.announcement_stats.rebuilds == 2
+
+
+async def test_search_does_not_wait_for_the_first_count(server, client, make_user, monkeypatch):
+    _, headers = make_user()
+    await create(client, headers, "Zeppelin")
+    first_count = asyncio.get_running_loop().create_future()
+    monkeypatch.setattr(server, 'stats_build_task', first_count)
+
+    hits = (await asyncio.wait_for(client.get("/api/announcements/search", params={"q": "zeppelin"}), 5)).json()
+    assert [hit["title"] for hit in hits] == ["Zeppelin"]
+
+    pending = asyncio.ensure_future(stats(client, headers))
+    await asyncio.sleep(0.05)
+    assert not pending.done()
+    await server.reconcile_announcement_stats()
+    first_count.set_result(None)
+    assert (await pending)["total"] == 1
+
+
+async def test_stats_are_unavailable_until_counted(client, make_user):
+    _, headers = make_user()
+    response = await client.get("/api/announcements/stats", headers=headers)
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
@@ -0,0 +1,61 @@
+"""
+Authenticated-principal cache: ``get_current_user`` serves user records from
+``user_cache`` and a role change evicts them.
+"""
+
+import pytest
+
+from caching import TTLCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def role_seen(client, headers):
+    response = await client.get("/api/auth/user", headers=headers)
+    response.raise_for_status()
+    return response.json()["user"]["role"]
+
+
+async def test_user_record_is_cached(client, store, make_user):
+    user_id, headers = make_user()
+    assert await role_seen(client, headers) == "user"
+    calls = store.calls
+
+    assert await role_seen(client, headers) == "user"
+    assert store.calls == calls
+
+
+async def test_role_change_evicts_the_cached_user(client, store, make_user):
+    _, admin_headers = make_user(role="admin")
+    user_id, headers = make_user()
+    assert await role_seen(client, headers) == "user"
+    assert (await client.get("/api/admin/users", headers=headers)).status_code == 403
+
+    response = await client.put(f"/api/admin/users/{user_id}/role", headers=admin_headers, json={"role": "admin"})
+    response.raise_for_status()
+    assert await role_seen(client, headers) == "admin"
+    assert (await client.get("/api/admin/users", headers=headers)).status_code == 200
+
+
+async def test_bulk_role_change_evicts_the_cached_users(client, make_user):
+    _, admin_headers = make_user(role="admin")
+    users = [make_user() for _ in range(3)]
+    for _, headers in users:
+        assert await role_seen(client, headers) == "user"
+
+    response = await client.put("/api/admin/users/roles", headers=admin_headers,
+                                json={"updates": [{"user_id": user_id, "role": "admin"} for user_id, _ in users]})
+    response.raise_for_status()
+    for _, headers in users:
+        assert await role_seen(client, headers) == "admin"
+
+
+def test_load_racing_an_eviction_is_dropped():
+    cache = TTLCache()
+    generation = cache.generation("u1")
+    cache.pop("u1")
+    cache.set("u1", {"role": "user"}, generation)
+    assert cache.get("u1") is None
+
+    cache.set("u1", {"role": "admin"}, cache.generation("u1"))
+    assert cache.get("u1") == {"role": "admin"}
@@ -0,0 +1,212 @@
+"""
+Multi-worker coherency: two uvicorn processes sharing WORKER_SYNC_DIR.
+
+Both workers talk to one in-memory database hosted by a multiprocessing
+manager (standing in for Supabase), so every difference between them comes
+from their in-process state. Each test writes through one worker and reads
+through the other immediately afterwards.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+AUTHKEY = b'coherency-test'
+
+_store = None
+
+
+class Store:
+    """Runs recorded query-builder calls against one shared InMemoryClient."""
+
+    def __init__(self):
+        sys.path.insert(0, str(BACKEND_DIR))
+        from memory_backend import InMemoryClient
+        self.client = InMemoryClient()
+
+    def run(self, table, calls):
+        query = self.client.table(table)
+        for name, args, kwargs in calls:
+            query = getattr(query, name)(*args, **kwargs)
+        result = query.execute()
+        return result.data, result.count
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = Store()
+    return _store
+
+
+class StoreManager(BaseManager):
+    pass
+
+
+StoreManager.register('get_store', callable=get_store)
+
+
+class RemoteQuery:
+    def __init__(self, store, table):
+        self._store = store
+        self._table = table
+        self._calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def execute(self):
+        data, count = self._store.run(self._table, self._calls)
+        return SimpleNamespace(data=data, count=count)
+
+
+class RemoteClient:
+    def __init__(self, store):
+        self._store = store
+
+    def table(self, name):
+        return RemoteQuery(self._store, name)
+
+
+def serve(port, host, manager_port):
+    """Worker process entry point."""
+    import uvicorn
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+    manager = StoreManager(address=(host, manager_port), authkey=AUTHKEY)
+    manager.connect()
+    server.init_repositories(RemoteClient(manager.get_store()))
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(client, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if client.get("/api/").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("worker did not start")
+
+
+@pytest.fixture(scope="module")
+def workers(tmp_path_factory):
+    manager = StoreManager(address=("127.0.0.1", 0), authkey=AUTHKEY)
+    manager.start()
+    host, manager_port = manager.address
+    env = dict(os.environ, WORKER_SYNC_DIR=str(tmp_path_factory.mktemp("sync")), PYTHONPATH=str(BACKEND_DIR))
+    processes, clients = [], []
+    try:
+        for _ in range(2):
+            port = free_port()
+            processes.append(subprocess.Popen(
+                [sys.executable, __file__, str(port), host, str(manager_port)], env=env))
+            clients.append(httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0))
+        for client in clients:
+            wait_ready(client)
+        yield clients
+    finally:
+        for client in clients:
+            client.close()
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+        manager.shutdown()
+
+
+def signup(client, email, role="user"):
+    response = client.post("/api/auth/signup", json={"email": email, "password": "pw", "role": role})
+    response.raise_for_status()
+    body = response.json()
+    return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+
+@pytest.fixture(scope="module")
+def admin(workers):
+    return signup(workers[0], "admin@coherency.test", role="admin")
+
+
+def test_feed_is_never_stale_after_a_write(workers, admin):
+    _, headers = admin
+    etags = [None, None]
+    for i in range(20):
+        writer, reader = workers[i % 2], workers[(i + 1) % 2]
+        # Prime the reader's feed cache, then write through the other worker
+        primed = reader.get("/api/announcements")
+        etags[(i + 1) % 2] = primed.headers["etag"]
+        created = writer.post("/api/announcements", headers=headers,
+                              json={"title": f"Post {i}", "content": "coherency"}).json()
+
+        response = reader.get("/api/announcements", headers={"If-None-Match": etags[(i + 1) % 2]})
+        assert response.status_code == 200
+        assert response.json()["items"][0]["id"] == created["id"]
+
+
+def test_role_change_is_seen_by_the_other_worker(workers, admin):
+    _, admin_headers = admin
+    user_id, user_headers = signup(workers[0], "member@coherency.test")
+
+    # Cache the user (role "user") on worker 1
+    assert workers[1].get("/api/auth/user", headers=user_headers).json()["user"]["role"] == "user"
+    assert workers[1].get("/api/admin/users", headers=user_headers).status_code == 403
+
+    workers[0].put(f"/api/admin/users/{user_id}/role", headers=admin_headers,
+                   json={"role": "admin"}).raise_for_status()
+    assert workers[1].get("/api/admin/users", headers=user_headers).status_code == 200
+
+
+def test_search_index_follows_writes_on_other_worker(workers, admin):
+    _, headers = admin
+    created = workers[0].post("/api/announcements", headers=headers,
+                              json={"title": "Zeppelin hangar", "content": "inspection"}).json()
+    started = time.monotonic()
+    while time.monotonic() - started < 2:
+        hits = workers[1].get("/api/announcements/search", params={"q": "zeppelin"}).json()
+        if any(hit["id"] == created["id"] for hit in hits):
+            break
+        time.sleep(0.005)
+    else:
+        pytest.fail("search on the other worker never saw the new announcement")
+
+    workers[0].delete(f"/api/announcements/{created['id']}", headers=headers).raise_for_status()
+    started = time.monotonic()
+    while time.monotonic() - started < 2:
+        if not workers[1].get("/api/announcements/search", params={"q": "zeppelin"}).json():
+            break
+        time.sleep(0.005)
+    else:
+        pytest.fail("search on the other worker still returns the deleted announcement")
+
+
+def test_rate_limit_budget_is_shared(workers):
+    statuses = [
+        workers[i % 2].post("/api/auth/signin", json={"email": "victim@coherency.test", "password": "x"}).status_code
+        for i in range(10)
+    ]
+    # RATE_LIMIT_SIGNIN_EMAIL defaults to 5/60 across both workers together
+    assert statuses.count(401) == 5
+    assert statuses.count(429) == 5
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]), sys.argv[2], int(sys.argv[3]))